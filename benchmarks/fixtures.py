@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+from typing import List
+
+from py_env_doctor.core.model import (
+    AdviceItem,
+    FleetReport,
+    FleetSummary,
+    ImportsInfo,
+    InstalledInfo,
+    Issue,
+    PipBinary,
+    PipInfo,
+    PlatformInfo,
+    ProjectInfo,
+    ProjectReport,
+    PythonInfo,
+    Report,
+    TimingEntry,
+    Timings,
+)
+
+# Synthetic large environments for the benchmark suite. Everything is written
+# under one root directory; sizes are arguments so --scale can shrink them.
+
+_PY_VERSION = "3.12"
+_STDLIB_NAMES = ("random", "json", "typing", "logging", "email", "os", "re", "csv")
+
+
+def _touch(path: str, text: str = "") -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _make_executable(path: str, text: str) -> None:
+    _touch(path, text)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def make_venv(root: Path, pip_version: str = "24.0") -> str:
+    """A fake venv whose pip the static probe can read; returns its python path."""
+    bindir = root / "bin"
+    site = root / "lib" / f"python{_PY_VERSION}" / "site-packages" / f"pip-{pip_version}.dist-info"
+    bindir.mkdir(parents=True, exist_ok=True)
+    site.mkdir(parents=True, exist_ok=True)
+    _touch(str(root / "pyvenv.cfg"), f"home = /usr/bin\nversion = {_PY_VERSION}.1\n")
+    _touch(str(site / "METADATA"), f"Metadata-Version: 2.1\nName: pip\nVersion: {pip_version}\n\n")
+    python = str(bindir / "python")
+    _make_executable(python, "")
+    return python
+
+
+def make_path_env(root: Path, dirs: int = 300, other_files: int = 30) -> str:
+    """A PATH of ``dirs`` directories, each with pip scripts for its own fake venv and unrelated executables.
+
+    Returns the PATH string.
+    """
+    entries: List[str] = []
+    for i in range(dirs):
+        d = root / f"bin{i:04d}"
+        d.mkdir(parents=True, exist_ok=True)
+        python = make_venv(root / f"venv{i:04d}", pip_version=f"{20 + i % 5}.0")
+        for name in ("pip", "pip3", f"pip{_PY_VERSION}"):
+            _make_executable(str(d / name), f"#!{python}\nimport sys\n")
+        for j in range(other_files):
+            _make_executable(str(d / f"tool{j:03d}"), "#!/bin/sh\n")
+        entries.append(str(d))
+    return os.pathsep.join(entries)
+
+
+def make_site_packages(root: Path, dists: int = 3000) -> str:
+    """A site-packages directory with ``dists`` dist-info directories and their top-level modules."""
+    site = root / "site-packages"
+    site.mkdir(parents=True, exist_ok=True)
+    for i in range(dists):
+        name = f"pkg{i:05d}"
+        meta = site / f"{name}-1.{i % 10}.0.dist-info"
+        meta.mkdir(exist_ok=True)
+        _touch(str(meta / "METADATA"), f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.{i % 10}.0\n\n")
+        if i % 2:
+            _touch(str(meta / "top_level.txt"), f"{name}\n")
+        _touch(
+            str(meta / "RECORD"),
+            f"{name}/__init__.py,sha256=x,0\n{name}/core.py,sha256=x,0\n{meta.name}/METADATA,,\n",
+        )
+        pkg = site / name
+        pkg.mkdir(exist_ok=True)
+        _touch(str(pkg / "__init__.py"))
+    return str(site)
+
+
+def make_project_tree(root: Path, files: int = 100_000, sources: bool = False) -> Path:
+    """A project of about ``files`` files, shaped like a real monorepo.
+
+    Most files sit in packages, ``node_modules`` and a ``.gitignore``d output
+    directory; a handful of stdlib-named modules sit where they shadow. With
+    ``sources`` every module imports a few stdlib and sibling modules, for
+    the import-resolution pass.
+    """
+    project = root / "project"
+    project.mkdir(parents=True, exist_ok=True)
+    _touch(str(project / "pyproject.toml"), '[project]\nname = "demo"\nversion = "0.1"\n')
+    _touch(str(project / ".gitignore"), "generated/\n*.log\n")
+    for name in _STDLIB_NAMES[:3]:
+        (project / "scripts").mkdir(exist_ok=True)
+        _touch(str(project / "scripts" / f"{name}.py"))
+    body = "import os\nimport json\nfrom demo import util\ntry:\n    import optional_dep\nexcept ImportError:\n    pass\n"
+    per_dir = 50
+    buckets = ("src/demo", "node_modules", "generated", "tests")
+    made = 0
+    i = 0
+    while made < files:
+        bucket = buckets[i % len(buckets)]
+        d = project / bucket / f"d{i:05d}"
+        d.mkdir(parents=True, exist_ok=True)
+        if bucket == "src/demo":
+            _touch(str(d / "__init__.py"))
+        for j in range(per_dir):
+            ext = ".js" if bucket == "node_modules" else ".py"
+            _touch(str(d / f"m{j:03d}{ext}"), body if sources and ext == ".py" else "")
+        made += per_dir
+        i += 1
+    _touch(str(project / "src" / "demo" / "__init__.py"))
+    _touch(str(project / "src" / "demo" / "util.py"))
+    return project
+
+
+def _python_info() -> PythonInfo:
+    return PythonInfo(
+        executable="/opt/venv/bin/python",
+        version=f"{_PY_VERSION}.1",
+        implementation="CPython",
+        environment_type="venv",
+        is_venv=True,
+        is_conda=False,
+        is_pyenv=False,
+        pep668_externally_managed=False,
+        platform=PlatformInfo(system="Linux", release="6.1"),
+        prefix="/opt/venv",
+        base_prefix="/usr",
+        site_dirs=[f"/opt/venv/lib/python{_PY_VERSION}/site-packages"],
+    )
+
+
+def _pip_info(binaries: int) -> PipInfo:
+    return PipInfo(
+        binaries=[
+            PipBinary(name=f"pip{i}", path=f"/opt/bin{i}/pip", pip_version="24.0", python_version="3.11")
+            for i in range(binaries)
+        ],
+        mismatches=[f"pip{i} -> Python 3.11 (current {_PY_VERSION})" for i in range(binaries)],
+        path_shadowed=[f"pip{i}: /opt/bin{i}/pip shadows /usr/bin/pip" for i in range(binaries)],
+    )
+
+
+def _issues(n: int) -> List[Issue]:
+    return [Issue(code=f"CODE_{i % 12}", severity=("info", "warning", "error")[i % 3], details=f"detail {i}") for i in range(n)]
+
+
+def _project(path: str, shadowing: int) -> ProjectInfo:
+    return ProjectInfo(
+        path=path,
+        pyproject=True,
+        project_name="demo",
+        package_importable=True,
+        shadowing=[f"scripts/mod{i}" for i in range(shadowing)],
+        imports=ImportsInfo(files=1000, modules=200, unresolved=[f"missing{i} (a.py:1)" for i in range(shadowing)]),
+    )
+
+
+def make_report(issues: int = 500, binaries: int = 200, dists: int = 3000) -> Report:
+    """A single-project report sized like a badly broken, heavily populated environment."""
+    return Report(
+        type="py_env_doctor_report",
+        generated_at="2026-01-01T00:00:00+00:00",
+        python=_python_info(),
+        pip=_pip_info(binaries),
+        project=_project("/work/demo", 100),
+        issues=_issues(issues),
+        advice=[AdviceItem(title=f"advice {i}", steps=["step one", "step two"]) for i in range(20)],
+        installed=InstalledInfo(
+            site_dirs=_python_info().site_dirs,
+            distributions=dists,
+            conflicts=[f"pkg{i}: 1.0, 1.1" for i in range(50)],
+            shadowed=[f"pkg{i} in /a shadows /b" for i in range(50)],
+        ),
+        timings=Timings(total_ms=100.0, steps=[TimingEntry(name=f"step{i}", ms=1.0) for i in range(10)]),
+    )
+
+
+def make_fleet(projects: int = 2000, issues_per_project: int = 5) -> FleetReport:
+    summary = FleetSummary()
+    reports = []
+    for i in range(projects):
+        result = ProjectReport(project=_project(f"/work/p{i:05d}", 3), issues=_issues(issues_per_project))
+        summary.add(result)
+        reports.append(result)
+    summary.sort_counts()
+    return FleetReport(
+        type="py_env_doctor_fleet_report",
+        generated_at="2026-01-01T00:00:00+00:00",
+        python=_python_info(),
+        pip=_pip_info(10),
+        projects=reports,
+        summary=summary,
+    )
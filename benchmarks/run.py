@@ -0,0 +1,257 @@
+"""Benchmark the detectors and renderers against synthetic large environments.
+
+    python benchmarks/run.py                      # run and compare with benchmarks/baseline.json
+    python benchmarks/run.py --scale 0.1          # smaller fixtures, for a quick look
+    python benchmarks/run.py --only render        # benchmarks whose name contains "render"
+    python benchmarks/run.py --update-baseline    # store this machine's numbers as the baseline
+
+Exits with status 1 when a benchmark is slower or uses more memory than the
+baseline allows, and 2 when the baseline was recorded at another scale.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import fixtures  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+# full-scale fixture sizes; --scale multiplies them
+SIZES = {"path_dirs": 300, "dists": 3000, "tree_files": 100_000, "source_files": 5000, "fleet_projects": 2000}
+# differences below these are noise whatever the relative change
+MIN_DELTA_MS = 2.0
+MIN_DELTA_KB = 256.0
+
+
+@dataclass
+class Benchmark:
+    name: str
+    # receives the fixture paths and returns the zero-argument call to time
+    setup: Callable[[Dict[str, Any]], Callable[[], Any]]
+
+
+def _bench_path_index(fx: Dict[str, Any]) -> Callable[[], Any]:
+    from py_env_doctor.core.pathindex import build_path_index
+
+    return lambda: build_path_index(path_env=fx["path_env"])
+
+
+def _bench_pip_static(fx: Dict[str, Any]) -> Callable[[], Any]:
+    from py_env_doctor.core.detect_python import gather_pip_info, gather_python_info
+    from py_env_doctor.core.pathindex import build_path_index
+
+    py = gather_python_info()
+    index = build_path_index(path_env=fx["path_env"])
+    return lambda: gather_pip_info(py, mode="static", path_index=index)
+
+
+def _bench_pep668(fx: Dict[str, Any]) -> Callable[[], Any]:
+    from py_env_doctor.core.detect_pep668 import is_externally_managed
+
+    return is_externally_managed
+
+
+def _bench_installed(fx: Dict[str, Any]) -> Callable[[], Any]:
+    from py_env_doctor.core.installed import build_installed_index, summarize_installed
+
+    def run() -> Any:
+        index = build_installed_index([fx["site"]])
+        index.by_module  # noqa: B018 - reads top_level.txt/RECORD for every distribution
+        return summarize_installed(index)
+
+    return run
+
+
+def _bench_shadowing(fx: Dict[str, Any]) -> Callable[[], Any]:
+    from py_env_doctor.core.detect_shadowing import module_index, scan_shadowing
+    from py_env_doctor.core.installed import build_installed_index
+
+    known = module_index(build_installed_index([fx["site"]]))
+    return lambda: scan_shadowing(fx["tree"], "demo", known)
+
+
+def _bench_imports(fx: Dict[str, Any]) -> Callable[[], Any]:
+    from py_env_doctor.core.imports import interpreter_context, resolve_imports
+    from py_env_doctor.core.installed import build_installed_index
+
+    index = build_installed_index([fx["site"]])
+    context = interpreter_context()
+    context["sys_path"] = context["sys_path"] + [fx["site"]]
+    return lambda: resolve_imports(fx["sources"], "demo", installed=index, **context)
+
+
+def _bench_render(module: str, what: str, **kwargs: Any) -> Callable[[Dict[str, Any]], Callable[[], Any]]:
+    def setup(fx: Dict[str, Any]) -> Callable[[], Any]:
+        import importlib
+
+        mod = importlib.import_module(f"py_env_doctor.reports.{module}")
+        if what == "fleet":
+            obj, func = fx["fleet"], mod.render_fleet
+        else:
+            obj, func = fx["report"], mod.render
+        return lambda: func(obj, **kwargs)
+
+    return setup
+
+
+BENCHMARKS = [
+    Benchmark("detect.path_index", _bench_path_index),
+    Benchmark("detect.pip_static", _bench_pip_static),
+    Benchmark("detect.pep668", _bench_pep668),
+    Benchmark("detect.installed", _bench_installed),
+    Benchmark("detect.shadowing", _bench_shadowing),
+    Benchmark("detect.imports", _bench_imports),
+    Benchmark("render.text", _bench_render("text_report", "report")),
+    Benchmark("render.markdown", _bench_render("markdown_report", "report")),
+    Benchmark("render.json", _bench_render("json_report", "report")),
+    Benchmark("render.json_compact", _bench_render("json_report", "report", compact=True)),
+    Benchmark("render.jsonl", _bench_render("jsonl_report", "report")),
+    Benchmark("render.fleet_text", _bench_render("text_report", "fleet")),
+    Benchmark("render.fleet_json", _bench_render("json_report", "fleet")),
+    Benchmark("render.fleet_jsonl", _bench_render("jsonl_report", "fleet")),
+]
+
+
+def build_fixtures(workdir: Path, scale: float) -> Dict[str, Any]:
+    """Create (or reuse, when ``workdir`` holds a complete set at this scale) the synthetic environments."""
+    sizes = {k: max(1, int(v * scale)) for k, v in SIZES.items()}
+    base = workdir / f"scale-{scale:g}"
+    done = base / ".complete"
+    if not done.exists():
+        if base.exists():
+            shutil.rmtree(base)
+        started = time.perf_counter()
+        fixtures.make_path_env(base / "path", dirs=sizes["path_dirs"])
+        fixtures.make_site_packages(base, dists=sizes["dists"])
+        fixtures.make_project_tree(base / "tree", files=sizes["tree_files"])
+        fixtures.make_project_tree(base / "sources", files=sizes["source_files"], sources=True)
+        done.write_text(json.dumps(sizes))
+        print(f"fixtures built in {time.perf_counter() - started:.1f}s under {base}", file=sys.stderr)
+    path_dirs = sorted(str(p) for p in (base / "path").glob("bin*"))
+    return {
+        "sizes": sizes,
+        "path_env": os.pathsep.join(path_dirs),
+        "site": str(base / "site-packages"),
+        "tree": base / "tree" / "project",
+        "sources": base / "sources" / "project",
+        "report": fixtures.make_report(dists=sizes["dists"]),
+        "fleet": fixtures.make_fleet(projects=sizes["fleet_projects"]),
+    }
+
+
+def measure(call: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median and best wall time over ``repeat`` runs after one warm-up, then peak traced memory of one more run."""
+    call()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        call()
+        times.append((time.perf_counter_ns() - start) / 1_000_000)
+    # tracemalloc slows allocation down, so memory gets its own run
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of ``results`` against ``baseline``: slower or larger by more than ``tolerance``."""
+    problems = []
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        for key, floor, unit in (("median_ms", MIN_DELTA_MS, "ms"), ("peak_kb", MIN_DELTA_KB, "KiB")):
+            old, new = before[key], now[key]
+            if new > old * (1 + tolerance) and new - old > floor:
+                problems.append(f"{name}: {key} {old:g} -> {new:g} {unit} (+{(new / old - 1) * 100 if old else 100:.0f}%)")
+    return problems
+
+
+def _table(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Any]]) -> str:
+    rows = [f"{'benchmark':<22} {'median ms':>10} {'min ms':>10} {'peak KiB':>10} {'baseline ms':>12}"]
+    for name, r in results.items():
+        base = ((baseline or {}).get("results") or {}).get(name)
+        base_ms = f"{base['median_ms']:>12.3f}" if base else f"{'-':>12}"
+        rows.append(f"{name:<22} {r['median_ms']:>10.3f} {r['min_ms']:>10.3f} {r['peak_kb']:>10.1f} {base_ms}")
+    return "\n".join(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every fixture size by this factor.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (after one warm-up).")
+    parser.add_argument("--only", action="append", default=[], help="Run benchmarks whose name contains this text.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline file to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown or growth (0.5 = 50%%).")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to the baseline file.")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the results to this JSON file.")
+    parser.add_argument("--workdir", type=Path, default=None, help="Keep fixtures here and reuse them on later runs.")
+    args = parser.parse_args(argv)
+
+    selected = [b for b in BENCHMARKS if not args.only or any(o in b.name for o in args.only)]
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="py-env-doctor-bench-"))
+    try:
+        fx = build_fixtures(workdir, args.scale)
+        results = {b.name: measure(b.setup(fx), args.repeat) for b in selected}
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    print(_table(results, baseline))
+    output = {
+        "scale": args.scale,
+        "sizes": fx["sizes"],
+        "python": platform.python_version(),
+        "platform": f"{platform.system()} {platform.machine()}",
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+    if args.update_baseline:
+        if baseline is not None and args.only:
+            # keep the entries of benchmarks that were not run
+            output["results"] = {**baseline.get("results", {}), **results}
+        args.baseline.write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        return 0
+    if baseline.get("scale") != args.scale:
+        print(f"baseline was recorded at --scale {baseline.get('scale')}; not comparing", file=sys.stderr)
+        return 2
+    problems = compare(results, baseline, args.tolerance)
+    for p in problems:
+        print(f"REGRESSION {p}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,79 @@
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 
-from .core.model import Report, now_iso
 from . import __version__
-from .core import detect_python, detect_layout, detect_pep668, detect_shadowing, advice
-from .reports import json_report, text_report, markdown_report
+from .core import defaults
+from .runner import (
+    build_fleet_report,
+    gate_message,
+    render_with,
+    renderer,
+    run_check,
+    stream_fleet,
+    stream_interpreters,
+    stream_output,
+    write_output,
+)
+
+# Detectors and renderers are imported inside the commands (via runner) so that
+# e.g. `version` or a JSON check never loads modules it does not use.
 
 app = typer.Typer(add_completion=False, help="Diagnose Python environment issues and provide actionable fixes.")
+cache_app = typer.Typer(add_completion=False, help="Manage the on-disk probe cache.")
+app.add_typer(cache_app, name="cache")
+history_app = typer.Typer(add_completion=False, help="Query reports stored with `check --record`.")
+app.add_typer(history_app, name="history")
 
 
-def _build_report(project_path: Path, level: str, diagnostics_only: bool) -> Report:
-    py_info = detect_python.gather_python_info()
-    pip_info = detect_python.gather_pip_info(py_info)
+def _show_version(value: bool) -> None:
+    if value:
+        typer.echo(__version__)
+        raise typer.Exit()
 
-    proj_info = detect_layout.inspect_project(project_path)
-    shadow = detect_shadowing.detect_shadowing(project_path, proj_info.project_name)
-    proj_info.shadowing = shadow
 
-    issues = advice.evaluate_issues(py_info, pip_info, proj_info)
-    adv = [] if diagnostics_only else advice.make_advice(py_info, pip_info, proj_info, issues)
+@app.callback()
+def _root(
+    version: bool = typer.Option(
+        False, "--version", callback=_show_version, is_eager=True, help="Show py-env-doctor version and exit."
+    ),
+) -> None:
+    pass
 
-    return Report(
-        type="py_env_doctor_report",
-        generated_at=now_iso(),
-        python=py_info,
-        pip=pip_info,
-        project=proj_info,
-        issues=issues,
-        advice=adv,
-    )
+
+def _validate_pip_probe(mode: str) -> str:
+    mode = mode.lower()
+    if mode not in defaults.PIP_PROBE_MODES:
+        raise typer.BadParameter(f"must be one of: {', '.join(defaults.PIP_PROBE_MODES)}", param_hint="--pip-probe")
+    return mode
+
+
+def _validate_level(level: str) -> str:
+    level = level.lower()
+    if level not in defaults.LEVELS:
+        raise typer.BadParameter(f"must be one of: {', '.join(defaults.LEVELS)}", param_hint="--level")
+    return level
+
+
+def _validate_fail_on(value: Optional[str]) -> List[str]:
+    from .core.diff import parse_fail_on
+
+    try:
+        return parse_fail_on(value, defaults.SEVERITIES)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--fail-on")
+
+
+def _cache(no_cache: bool):
+    if no_cache:
+        return None
+    from .core.cache import default_cache
+
+    return default_cache()
 
 
 @app.command()
@@ -45,30 +85,407 @@ def check(
         "--output",
         "--fmt",
         case_sensitive=False,
-        help="Output format: text|json|md",
+        help="Output format: text|json|jsonl|md",
     ),
     out: Optional[Path] = typer.Option(None, "--out", help="Write report to the given file instead of stdout."),
-    level: str = typer.Option("basic", "--level", case_sensitive=False, help="Analysis level: basic|full"),
+    compact: bool = typer.Option(False, "--compact", help="Write JSON on one line without indentation."),
+    level: str = typer.Option(
+        "standard",
+        "--level",
+        case_sensitive=False,
+        help=(
+            "Analysis level: basic (no tree walks or subprocesses, bounded by a 0.25s budget), standard (adds tree walks "
+            "and pip subprocess probes), or full (also resolves every import, hashes RECORD files and times the "
+            "project import in startup subprocesses)."
+        ),
+    ),
     diagnostics_only: bool = typer.Option(False, "--diagnostics-only", help="Emit raw diagnostics without advice."),
     no_network: bool = typer.Option(True, "--no-network/--network", help="Avoid network calls (reserved for future use)."),
+    probe_timeout: float = typer.Option(
+        defaults.PIP_PROBE_TIMEOUT, "--probe-timeout", min=0.1, help="Seconds to wait for each pip --version probe."
+    ),
+    probe_workers: int = typer.Option(
+        defaults.PIP_PROBE_WORKERS, "--probe-workers", min=1, help="Maximum number of pip probes run concurrently."
+    ),
+    pip_probe: str = typer.Option(
+        "static",
+        "--pip-probe",
+        case_sensitive=False,
+        help="How to read pip versions: static (shebang + installed metadata, run pip only as fallback) or subprocess.",
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update the on-disk probe cache."),
+    python: Optional[str] = typer.Option(
+        None, "--python", help="Diagnose this interpreter instead of the one running py-env-doctor."
+    ),
+    detector_timeout: Optional[float] = typer.Option(
+        None, "--detector-timeout", min=0.1, help="Give up on any single detector after this many seconds."
+    ),
+    time_budget: Optional[float] = typer.Option(
+        None,
+        "--time-budget",
+        min=0.01,
+        help="Run the most valuable detectors whose estimated cost fits this many seconds; the rest are skipped.",
+    ),
+    deadline: Optional[float] = typer.Option(
+        None,
+        "--deadline",
+        min=0.01,
+        help="Stop after this many seconds and report what finished; unfinished detectors are marked timed out.",
+    ),
+    no_plugins: bool = typer.Option(False, "--no-plugins", help="Do not load detectors registered by installed packages."),
+    profile: Optional[Path] = typer.Option(None, "--profile", help="Write a cProfile/pstats dump of the run to this file and count subprocesses and file activity per step."),
+    incremental: bool = typer.Option(
+        False, "--incremental", help="Reuse results of detectors whose inputs are unchanged since the last run."
+    ),
+    state: Optional[Path] = typer.Option(
+        None, "--state", help="State file for --incremental (default: per-project file in the user cache directory)."
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None, "--baseline", help="Compare with this earlier JSON report and print the differences instead of the report."
+    ),
+    fail_on: Optional[str] = typer.Option(
+        None, "--fail-on", help="Exit with status 1 if an issue of these severities is new or gained an item (e.g. warning,error)."
+    ),
+    record: bool = typer.Option(False, "--record", help="Append the report to the local history database."),
+    history_db: Optional[Path] = typer.Option(
+        None, "--history-db", help="History database for --record (default: history.sqlite3 in the user data directory)."
+    ),
 ):
     """Run environment diagnostics and print a report."""
-    # level and no_network are placeholders for future behavior, included for CLI stability
-    report = _build_report(project_path, level, diagnostics_only)
-
-    fmt = output_format.lower()
-    if fmt == "json":
-        output = json_report.render(report)
-    elif fmt in ("md", "markdown"):
-        output = markdown_report.render(report)
-    else:
-        output = text_report.render(report)
-
-    if out:
-        out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(output, encoding="utf-8")
-    else:
-        typer.echo(output)
+    # no_network is a placeholder for future behavior, included for CLI stability
+    pip_probe = _validate_pip_probe(pip_probe)
+    level = _validate_level(level)
+    severities = _validate_fail_on(fail_on)
+    code = run_check(
+        project_path,
+        output_format,
+        out,
+        compact,
+        level,
+        diagnostics_only,
+        probe_timeout,
+        probe_workers,
+        pip_probe,
+        _cache(no_cache),
+        python,
+        detector_timeout=detector_timeout,
+        plugins=not no_plugins,
+        incremental=incremental,
+        state_path=state,
+        time_budget=time_budget,
+        deadline=deadline,
+        profile=profile,
+        baseline=baseline,
+        fail_on=severities,
+        record=record,
+        history_db=history_db,
+    )
+    if code:
+        raise typer.Exit(code=code)
+
+
+@app.command()
+def scan(
+    paths: Optional[List[Path]] = typer.Argument(None, help="Project directories to diagnose."),
+    patterns: List[str] = typer.Option([], "--glob", help="Glob pattern for project directories or pyproject.toml files (repeatable)."),
+    output_format: str = typer.Option("text", "--format", case_sensitive=False, help="Output format: text|json|jsonl|md"),
+    out: Optional[Path] = typer.Option(None, "--out", help="Write report to the given file instead of stdout."),
+    compact: bool = typer.Option(False, "--compact", help="Write JSON on one line without indentation."),
+    workers: Optional[int] = typer.Option(None, "--workers", min=1, help="Worker processes for per-project checks (default: CPU count)."),
+    diagnostics_only: bool = typer.Option(False, "--diagnostics-only", help="Emit raw diagnostics without advice."),
+    probe_timeout: float = typer.Option(
+        defaults.PIP_PROBE_TIMEOUT, "--probe-timeout", min=0.1, help="Seconds to wait for each pip --version probe."
+    ),
+    pip_probe: str = typer.Option("static", "--pip-probe", case_sensitive=False, help="How to read pip versions: static|subprocess."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update the on-disk probe cache."),
+    python: Optional[str] = typer.Option(
+        None, "--python", help="Diagnose this interpreter instead of the one running py-env-doctor."
+    ),
+):
+    """Diagnose many projects against one interpreter in a single run."""
+    from .core import fleet
+    from .core.probe import ProbeError
+
+    pip_probe = _validate_pip_probe(pip_probe)
+    project_paths = fleet.expand_project_paths([str(p) for p in paths or []], patterns)
+    if not project_paths:
+        raise typer.BadParameter("no project directories matched", param_hint="PATHS/--glob")
+
+    try:
+        if output_format.lower() == "jsonl":
+            # streamed: each project is written as it completes, nothing is accumulated
+            with stream_output(out) as stream:
+                stream_fleet(
+                    project_paths, stream, diagnostics_only, workers, probe_timeout, pip_probe, _cache(no_cache), python
+                )
+            return
+        report = build_fleet_report(
+            project_paths, diagnostics_only, workers, probe_timeout, pip_probe, _cache(no_cache), python
+        )
+    except ProbeError as exc:
+        typer.echo(f"Could not probe {python}: {exc}", err=True)
+        raise typer.Exit(code=2)
+
+    write_output(render_with(renderer(output_format).render_fleet, report, output_format, compact), out)
+
+
+@app.command()
+def interpreters(
+    roots: List[Path] = typer.Option([], "--root", help="Directory holding an environment or environments to include (repeatable)."),
+    include_path: bool = typer.Option(True, "--path/--no-path", help="Include interpreters found on PATH."),
+    output_format: str = typer.Option("text", "--format", case_sensitive=False, help="Output format: text|json|jsonl|md"),
+    out: Optional[Path] = typer.Option(None, "--out", help="Write report to the given file instead of stdout."),
+    compact: bool = typer.Option(False, "--compact", help="Write JSON on one line without indentation."),
+    timeout: float = typer.Option(defaults.PROBE_TIMEOUT, "--timeout", min=0.1, help="Seconds to wait for each interpreter probe."),
+    workers: int = typer.Option(defaults.INTERPRETER_WORKERS, "--workers", min=1, help="Interpreters probed concurrently."),
+):
+    """Discover every interpreter on the machine and diagnose them side by side."""
+    from .core import interpreters as interp_mod
+
+    if output_format.lower() == "jsonl":
+        with stream_output(out) as stream:
+            paths = interp_mod.discover_interpreters([str(r) for r in roots], include_path)
+            stream_interpreters(paths, stream, timeout, workers)
+        return
+    report = interp_mod.diagnose_interpreters([str(r) for r in roots], include_path, timeout, workers)
+    write_output(render_with(renderer(output_format).render_interpreters, report, output_format, compact), out)
+
+
+@app.command()
+def diff(
+    old: Path = typer.Argument(..., exists=True, dir_okay=False, help="Earlier report (check or scan, JSON or JSON Lines)."),
+    new: Path = typer.Argument(..., exists=True, dir_okay=False, help="Later report of the same kind."),
+    output_format: str = typer.Option("text", "--format", case_sensitive=False, help="Output format: text|json|jsonl|md"),
+    out: Optional[Path] = typer.Option(None, "--out", help="Write the diff to the given file instead of stdout."),
+    compact: bool = typer.Option(False, "--compact", help="Write JSON on one line without indentation."),
+    fail_on: Optional[str] = typer.Option(
+        None, "--fail-on", help="Exit with status 1 if an issue of these severities is new or gained an item (e.g. warning,error)."
+    ),
+):
+    """Show new and resolved issues and changed versions between two reports."""
+    from .core import diff as diff_mod
+
+    severities = _validate_fail_on(fail_on)
+    try:
+        delta = diff_mod.diff_reports(diff_mod.load(old), diff_mod.load(new))
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        typer.echo(f"Could not compare reports: {exc}", err=True)
+        raise typer.Exit(code=2)
+    write_output(render_with(renderer(output_format).render_diff, delta, output_format, compact), out)
+    failing = delta.introduces(severities)
+    if failing:
+        typer.echo(gate_message(failing), err=True)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def watch(
+    project_path: Path = typer.Option(Path("."), "--project-path", help="Path to the project (defaults to current directory)."),
+    output_format: str = typer.Option("text", "--format", case_sensitive=False, help="Output format: text|json|jsonl|md"),
+    emit: str = typer.Option("report", "--emit", case_sensitive=False, help="On change print the full report or only a diff: report|diff"),
+    interval: float = typer.Option(1.0, "--interval", min=0.05, help="Seconds between stat polls."),
+    socket_path: Optional[Path] = typer.Option(None, "--socket", help="Answer ping/status/issues/report queries on this Unix socket."),
+    cycles: Optional[int] = typer.Option(None, "--cycles", min=0, help="Stop after this many polls (default: run until interrupted)."),
+    diagnostics_only: bool = typer.Option(False, "--diagnostics-only", help="Emit raw diagnostics without advice."),
+    pip_probe: str = typer.Option("static", "--pip-probe", case_sensitive=False, help="How to read pip versions: static|subprocess."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update the on-disk probe cache."),
+    python: Optional[str] = typer.Option(
+        None, "--python", help="Diagnose this interpreter instead of the one running py-env-doctor."
+    ),
+    detector_timeout: Optional[float] = typer.Option(
+        None, "--detector-timeout", min=0.1, help="Give up on any single detector after this many seconds."
+    ),
+    no_plugins: bool = typer.Option(False, "--no-plugins", help="Do not load detectors registered by installed packages."),
+):
+    """Keep the environment model resident and re-check only what changed."""
+    from .core.probe import ProbeError
+    from .core.watch import remove_socket, run_watch, serve_queries
+    from .runner import build_watcher
+
+    emit = emit.lower()
+    if emit not in ("report", "diff"):
+        raise typer.BadParameter("must be one of: report, diff", param_hint="--emit")
+    watcher = build_watcher(
+        project_path,
+        diagnostics_only,
+        pip_probe=_validate_pip_probe(pip_probe),
+        cache=_cache(no_cache),
+        target_python=python,
+        detector_timeout=detector_timeout,
+        plugins=not no_plugins,
+    )
+    mod = renderer(output_format)
+    as_json = output_format.lower() == "json"
+
+    def show(update) -> None:
+        if update is not None:
+            write_output(mod.render_watch_update(update), None)
+            if emit == "diff" or update.error:
+                return
+        # JSON reports go out as one line each so the stream stays line-delimited
+        write_output(mod.render(watcher.report, compact=True) if as_json else mod.render(watcher.report), None)
+
+    server = None
+    try:
+        watcher.start()
+        if socket_path:
+            try:
+                server = serve_queries(watcher, str(socket_path))
+            except OSError as exc:
+                typer.echo(f"Could not listen on {socket_path}: {exc}", err=True)
+                raise typer.Exit(code=2)
+        show(None)
+        run_watch(watcher, show, interval, cycles, started=True)
+    except ProbeError as exc:
+        typer.echo(f"Could not probe {python or sys.executable}: {exc}", err=True)
+        raise typer.Exit(code=2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            remove_socket(str(socket_path))
+
+
+@cache_app.command("clear")
+def cache_clear():
+    """Delete all cached interpreter and pip probe results."""
+    from .core.cache import default_cache
+
+    cache = default_cache()
+    removed = cache.clear()
+    typer.echo(f"Removed {removed} cache entries from {cache.directory}")
+
+
+_DB_OPTION = typer.Option(None, "--db", help="History database (default: history.sqlite3 in the user data directory).")
+_SINCE_OPTION = typer.Option("7d", "--since", help="Only reports recorded within this window, e.g. 12h, 7d, 2w.")
+_HOST_OPTION = typer.Option(None, "--host", help="Only reports from this host.")
+_HISTORY_FORMAT_OPTION = typer.Option("text", "--format", case_sensitive=False, help="Output format: text|json")
+
+
+def _history(db: Optional[Path]):
+    import sqlite3
+
+    from .core import history
+
+    try:
+        return history.connect(db)
+    except (OSError, sqlite3.Error) as exc:
+        typer.echo(f"Could not open history database: {exc}", err=True)
+        raise typer.Exit(code=2)
+
+
+def _since(value: str) -> float:
+    from .core.history import parse_since
+
+    try:
+        return parse_since(value)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--since")
+
+
+def _print_rows(rows: List[dict], output_format: str) -> None:
+    import json
+
+    if output_format.lower() == "json":
+        write_output(json.dumps(rows, indent=2), None)
+        return
+    if not rows:
+        write_output("(no matching reports)", None)
+        return
+    from datetime import datetime, timezone
+
+    def cell(key: str, value) -> str:
+        if value is None:
+            return "-"
+        if key in ("recorded_at", "first_seen", "last_seen"):
+            return datetime.fromtimestamp(value, timezone.utc).replace(microsecond=0).isoformat()
+        if isinstance(value, float):
+            return f"{value:.1f}"
+        return str(value)
+
+    keys = list(rows[0])
+    table = [keys] + [[cell(k, r[k]) for k in keys] for r in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(keys))]
+    write_output("\n".join("  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip() for row in table), None)
+
+
+@history_app.command("issues")
+def history_issues(
+    code: str = typer.Argument(..., help="Issue code, e.g. PIP_PYTHON_MISMATCH."),
+    since: str = _SINCE_OPTION,
+    host: Optional[str] = _HOST_OPTION,
+    db: Optional[Path] = _DB_OPTION,
+    output_format: str = _HISTORY_FORMAT_OPTION,
+):
+    """Hosts where an issue was reported, with counts and first/last seen."""
+    from .core import history
+
+    conn = _history(db)
+    try:
+        rows = history.issue_hosts(conn, code.upper(), _since(since), host)
+    finally:
+        conn.close()
+    _print_rows(rows, output_format)
+
+
+@history_app.command("durations")
+def history_durations(
+    step: Optional[str] = typer.Option(None, "--step", help="A timing step (detector name) instead of the whole check."),
+    since: str = _SINCE_OPTION,
+    host: Optional[str] = _HOST_OPTION,
+    db: Optional[Path] = _DB_OPTION,
+    output_format: str = _HISTORY_FORMAT_OPTION,
+):
+    """p50/p95/max check duration per host."""
+    from .core import history
+
+    conn = _history(db)
+    try:
+        rows = history.durations(conn, _since(since), host, step)
+    finally:
+        conn.close()
+    _print_rows(rows, output_format)
+
+
+@history_app.command("list")
+def history_list(
+    since: str = _SINCE_OPTION,
+    host: Optional[str] = _HOST_OPTION,
+    limit: int = typer.Option(20, "--limit", min=1, help="Maximum number of reports."),
+    db: Optional[Path] = _DB_OPTION,
+    output_format: str = _HISTORY_FORMAT_OPTION,
+):
+    """Most recently recorded reports."""
+    from .core import history
+
+    conn = _history(db)
+    try:
+        rows = history.recent(conn, _since(since), host, limit)
+    finally:
+        conn.close()
+    _print_rows(rows, output_format)
+
+
+@history_app.command("show")
+def history_show(
+    report_id: int = typer.Argument(..., help="Report id as printed by `history list`."),
+    db: Optional[Path] = _DB_OPTION,
+    output_format: str = typer.Option("text", "--format", case_sensitive=False, help="Output format: text|json|jsonl|md"),
+):
+    """Re-render a stored report."""
+    from .core import history
+
+    conn = _history(db)
+    try:
+        report = history.load_report(conn, report_id)
+    finally:
+        conn.close()
+    if report is None:
+        typer.echo(f"No report with id {report_id}", err=True)
+        raise typer.Exit(code=1)
+    write_output(renderer(output_format).render(report), None)
 
 
 @app.command()
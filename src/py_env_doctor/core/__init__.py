@@ -1 +1,11 @@
-from . import detect_python, detect_pep668, detect_shadowing, detect_layout, advice  # noqa: F401
+import importlib
+
+# Submodules load on first attribute access (PEP 562) so that importing one
+# detector does not pull in all of them.
+_SUBMODULES = {"detect_python", "detect_pep668", "detect_shadowing", "detect_layout", "advice"}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
-from .model import PythonInfo, PipInfo, ProjectInfo, Issue, AdviceItem
+from .defaults import SLOW_STARTUP_MS
+from .model import PythonInfo, PipInfo, ProjectInfo, Issue, AdviceItem, InstalledInfo, StartupInfo
 
 
 def _is_windows_store(executable: str) -> bool:
     return "WindowsApps" in executable or "Microsoft" in executable
 
 
-def evaluate_issues(py: PythonInfo, pip: PipInfo, proj: ProjectInfo) -> List[Issue]:
+def evaluate_issues(
+    py: PythonInfo,
+    pip: PipInfo,
+    proj: ProjectInfo,
+    installed: Optional[InstalledInfo] = None,
+    startup: Optional[StartupInfo] = None,
+) -> List[Issue]:
     issues: List[Issue] = []
     if pip.mismatches:
         issues.append(
@@ -20,10 +27,24 @@ def evaluate_issues(py: PythonInfo, pip: PipInfo, proj: ProjectInfo) -> List[Iss
             )
         )
 
+    timed_out = [b for b in pip.binaries if b.timed_out]
+    if timed_out:
+        issues.append(
+            Issue(
+                code="PIP_PROBE_TIMEOUT",
+                severity="warning",
+                details=", ".join(b.path for b in timed_out),
+            )
+        )
+
+    if pip.path_shadowed:
+        issues.append(Issue(code="PATH_SHADOWED_EXECUTABLE", severity="info", details="; ".join(pip.path_shadowed)))
+
     if py.pep668_externally_managed and py.environment_type == "system":
         issues.append(Issue(code="PEP668_SYSTEM_PYTHON", severity="warning"))
 
-    if proj.pyproject and not (py.is_venv or py.is_conda):
+    # an empty version: the interpreter was never probed (deadline), so its environment is unknown
+    if proj.pyproject and py.version and not (py.is_venv or py.is_conda):
         issues.append(Issue(code="NO_VENV_FOR_PROJECT", severity="warning"))
 
     if proj.project_name and proj.package_importable is False:
@@ -38,9 +59,59 @@ def evaluate_issues(py: PythonInfo, pip: PipInfo, proj: ProjectInfo) -> List[Iss
             )
         )
 
+    imports = proj.imports
+    if imports and imports.unresolved:
+        issues.append(Issue(code="IMPORT_UNRESOLVED", severity="warning", details="; ".join(imports.unresolved)))
+    if imports and imports.shadowed:
+        issues.append(Issue(code="IMPORT_SHADOWED", severity="warning", details="; ".join(imports.shadowed)))
+
     if py.platform.system == "Windows" and _is_windows_store(py.executable):
         issues.append(Issue(code="WINDOWS_STORE_PYTHON", severity="warning"))
 
+    deps = proj.dependencies
+    if deps and deps.missing:
+        issues.append(Issue(code="DEPENDENCY_MISSING", severity="error", details=", ".join(deps.missing)))
+    if deps and deps.mismatched:
+        issues.append(
+            Issue(code="DEPENDENCY_VERSION_MISMATCH", severity="error", details=", ".join(deps.mismatched))
+        )
+    if deps and deps.missing_optional:
+        issues.append(
+            Issue(code="OPTIONAL_DEPENDENCY_MISSING", severity="info", details=", ".join(deps.missing_optional))
+        )
+    if deps and deps.skipped:
+        issues.append(Issue(code="DEPENDENCY_MARKER_SKIPPED", severity="info", details=", ".join(deps.skipped)))
+
+    if installed and installed.conflicts:
+        issues.append(
+            Issue(code="DUPLICATE_DIST_INFO", severity="warning", details="; ".join(installed.conflicts))
+        )
+
+    verify = installed.verify if installed else None
+    if verify and verify.missing:
+        issues.append(Issue(code="RECORD_FILE_MISSING", severity="warning", details="; ".join(verify.missing)))
+    if verify and verify.modified:
+        issues.append(Issue(code="RECORD_FILE_MODIFIED", severity="warning", details="; ".join(verify.modified)))
+    if verify and verify.extra:
+        issues.append(Issue(code="RECORD_FILE_EXTRA", severity="info", details="; ".join(verify.extra)))
+
+    if installed and installed.shadowed:
+        issues.append(
+            Issue(code="SHADOWED_DISTRIBUTION", severity="info", details="; ".join(installed.shadowed))
+        )
+
+    if startup and startup.pth_exec:
+        issues.append(Issue(code="PTH_EXECUTES_CODE", severity="info", details="; ".join(startup.pth_exec)))
+    # a project that cannot be found is already PROJECT_NOT_IMPORTABLE
+    if startup and startup.error and proj.package_importable is not False:
+        issues.append(
+            Issue(code="PROJECT_IMPORT_FAILED", severity="error", details=f"import {startup.import_name}: {startup.error}")
+        )
+    elif startup and startup.overhead_ms > SLOW_STARTUP_MS:
+        what = f"import {startup.import_name}" if startup.import_name else "interpreter start"
+        details = f"{what} takes {startup.overhead_ms:.0f} ms over a bare start; slowest: {', '.join(startup.slowest)}"
+        issues.append(Issue(code="SLOW_STARTUP", severity="warning", details=details))
+
     return issues
 
 
@@ -73,6 +144,13 @@ def _pip_mismatch_steps() -> List[str]:
     ]
 
 
+def _pip_timeout_steps() -> List[str]:
+    return [
+        "Run the listed pip binary with --version manually to see where it hangs.",
+        "Remove or repair stale pip shims that come earlier on PATH.",
+    ]
+
+
 def _pep668_steps(system: str) -> List[str]:
     return _venv_steps(system) + [
         "Install packages inside the virtual environment only.",
@@ -81,11 +159,25 @@ def _pep668_steps(system: str) -> List[str]:
 
 def _shadowing_steps() -> List[str]:
     return [
-        "Rename or remove local files/folders that shadow installed packages (e.g., requests.py).",
+        "Rename or remove local modules that shadow the standard library or installed packages (e.g., random.py, requests.py).",
         "Avoid naming project modules after popular packages.",
     ]
 
 
+def _unresolved_import_steps() -> List[str]:
+    return [
+        "Install the distributions that provide the listed modules: python -m pip install <name>",
+        "If an import is optional, guard it with try/except ImportError.",
+    ]
+
+
+def _import_shadowed_steps() -> List[str]:
+    return [
+        "Rename the local module or directory the import resolves to.",
+        "Check PYTHONPATH and .pth files for entries that come before site-packages.",
+    ]
+
+
 def _win_store_steps() -> List[str]:
     return [
         "Use the Python Launcher: py -3 -m venv .venv",
@@ -93,6 +185,35 @@ def _win_store_steps() -> List[str]:
     ]
 
 
+def _dependency_steps() -> List[str]:
+    return [
+        "Install the project with its dependencies: python -m pip install -e .",
+        "Or sync only the dependencies: python -m pip install <requirement> for each listed entry",
+    ]
+
+
+def _duplicate_dist_steps() -> List[str]:
+    return [
+        "Reinstall the affected distribution: python -m pip install --force-reinstall <name>",
+        "If a stale <name>-<version>.dist-info directory remains, delete it from site-packages.",
+    ]
+
+
+def _reinstall_steps() -> List[str]:
+    return [
+        "Reinstall the listed distributions: python -m pip install --force-reinstall --no-deps <name>",
+        "Install and uninstall with one tool per environment; mixing pip with conda or OS packages overwrites files.",
+    ]
+
+
+def _slow_startup_steps() -> List[str]:
+    return [
+        "See where the time goes: python -X importtime -c \"import <package>\" 2> importtime.log",
+        "Import heavy dependencies inside the functions that use them instead of at module level.",
+        "Check the listed .pth files; code in them runs on every interpreter start.",
+    ]
+
+
 def make_advice(py: PythonInfo, pip: PipInfo, proj: ProjectInfo, issues: List[Issue]) -> List[AdviceItem]:
     system = py.platform.system
     items: List[AdviceItem] = []
@@ -104,6 +225,9 @@ def make_advice(py: PythonInfo, pip: PipInfo, proj: ProjectInfo, issues: List[Is
             AdviceItem(title="Use python -m pip consistently", steps=_pip_mismatch_steps())
         )
 
+    if "PIP_PROBE_TIMEOUT" in codes:
+        items.append(AdviceItem(title="Investigate unresponsive pip binaries", steps=_pip_timeout_steps()))
+
     if "PEP668_SYSTEM_PYTHON" in codes:
         items.append(
             AdviceItem(title="Create and use a virtual environment", steps=_pep668_steps(system))
@@ -121,7 +245,25 @@ def make_advice(py: PythonInfo, pip: PipInfo, proj: ProjectInfo, issues: List[Is
     if "PATH_SHADOWING_PACKAGE" in codes:
         items.append(AdviceItem(title="Resolve module shadowing in project directory", steps=_shadowing_steps()))
 
+    if "IMPORT_UNRESOLVED" in codes:
+        items.append(AdviceItem(title="Install the modules your code imports", steps=_unresolved_import_steps()))
+
+    if "IMPORT_SHADOWED" in codes:
+        items.append(AdviceItem(title="Fix imports that load the wrong module", steps=_import_shadowed_steps()))
+
     if "WINDOWS_STORE_PYTHON" in codes:
         items.append(AdviceItem(title="Avoid Microsoft Store Python for development", steps=_win_store_steps()))
 
+    if "DEPENDENCY_MISSING" in codes or "DEPENDENCY_VERSION_MISMATCH" in codes:
+        items.append(AdviceItem(title="Install the project's declared dependencies", steps=_dependency_steps()))
+
+    if "DUPLICATE_DIST_INFO" in codes:
+        items.append(AdviceItem(title="Repair distributions with duplicate metadata", steps=_duplicate_dist_steps()))
+
+    if "RECORD_FILE_MISSING" in codes or "RECORD_FILE_MODIFIED" in codes:
+        items.append(AdviceItem(title="Reinstall distributions whose files changed", steps=_reinstall_steps()))
+
+    if "SLOW_STARTUP" in codes:
+        items.append(AdviceItem(title="Reduce interpreter and import startup time", steps=_slow_startup_steps()))
+
     return items
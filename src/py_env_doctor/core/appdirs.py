@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+_APP_NAME = "py-env-doctor"
+
+
+def user_cache_dir() -> Path:
+    """Per-user cache directory, overridable with ``PY_ENV_DOCTOR_CACHE_DIR``."""
+    override = os.environ.get("PY_ENV_DOCTOR_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return Path(base) / _APP_NAME / "Cache"
+    if sys.platform == "darwin":
+        return Path("~/Library/Caches").expanduser() / _APP_NAME
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / _APP_NAME
+
+
+def user_data_dir() -> Path:
+    """Per-user data directory, overridable with ``PY_ENV_DOCTOR_DATA_DIR``."""
+    override = os.environ.get("PY_ENV_DOCTOR_DATA_DIR")
+    if override:
+        return Path(override).expanduser()
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return Path(base) / _APP_NAME / "Data"
+    if sys.platform == "darwin":
+        return Path("~/Library/Application Support").expanduser() / _APP_NAME
+    base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return Path(base) / _APP_NAME
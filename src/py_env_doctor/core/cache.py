@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+from .appdirs import user_cache_dir
+
+# Bump when the shape of cached values changes so stale entries are ignored.
+CACHE_FORMAT = 2
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def file_identity(path: Optional[str]) -> List[Any]:
+    """(path, inode, size, mtime) of a file or directory; missing paths still yield a stable key."""
+    if not path:
+        return [None, None, None, None]
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [path, None, None, None]
+    return [path, st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+class DiskCache:
+    """Small JSON-file cache with size-bounded LRU eviction.
+
+    Each entry lives in its own file and is written via a temp file plus
+    ``os.replace``, so concurrent processes only ever see complete entries.
+    Reads touch the entry's mtime, which eviction uses as the LRU clock.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else user_cache_dir() / "probes"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, key: Sequence[Any]) -> Path:
+        digest = hashlib.sha256(json.dumps([CACHE_FORMAT, list(key)], sort_keys=True).encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: Sequence[Any]) -> Optional[Any]:
+        path = self._entry_path(key)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != json.loads(json.dumps(list(key))):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key: Sequence[Any], value: Any) -> None:
+        path = self._entry_path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.directory), prefix=".tmp-", suffix=".json")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"key": list(key), "value": value}, f)
+                os.replace(tmp, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except (OSError, TypeError, ValueError):
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if not e.name.endswith(".json") or e.name.startswith(".tmp-"):
+                        continue
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, e.path))
+                    total += st.st_size
+        except OSError:
+            return
+        if len(entries) <= self.max_entries and total <= self.max_bytes:
+            return
+        entries.sort()
+        count = len(entries)
+        for _, size, p in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                os.unlink(p)
+            except OSError:
+                pass  # another process got there first
+            count -= 1
+            total -= size
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many were removed."""
+        removed = 0
+        try:
+            with os.scandir(self.directory) as it:
+                names = [e.path for e in it if e.name.endswith(".json")]
+        except OSError:
+            return 0
+        for p in names:
+            try:
+                os.unlink(p)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+def default_cache() -> DiskCache:
+    return DiskCache()
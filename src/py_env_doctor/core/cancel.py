@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+# Cooperative cancellation for code running under a deadline. The scheduler
+# sets a control in each detector's context; helpers that loop or start
+# subprocesses ask it how long they may take, without knowing who set it.
+
+
+class Cancelled(Exception):
+    """Raised inside a detector the scheduler has given up on (timeout or deadline)."""
+
+
+@dataclass
+class _Control:
+    cancelled: threading.Event
+    deadline: float  # time.monotonic() value; inf without one
+
+
+# set in each detector thread; copied into the threads a detector starts with contextvars.copy_context()
+_CONTROL: ContextVar[Optional[_Control]] = ContextVar("py_env_doctor_control", default=None)
+
+
+def check_cancelled() -> None:
+    """Raise ``Cancelled`` once the calling detector has been abandoned; long loops call this."""
+    ctl = _CONTROL.get()
+    if ctl is not None and ctl.cancelled.is_set():
+        raise Cancelled()
+
+
+def time_left(timeout: Optional[float]) -> Optional[float]:
+    """``timeout`` capped at the time the calling detector has left, for subprocess timeouts.
+
+    Outside a detector (or without a deadline) returns ``timeout`` unchanged;
+    raises ``Cancelled`` when no time is left.
+    """
+    ctl = _CONTROL.get()
+    if ctl is None:
+        return timeout
+    check_cancelled()
+    if ctl.deadline == float("inf"):
+        return timeout
+    left = ctl.deadline - time.monotonic()
+    if left <= 0:
+        raise Cancelled()
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+# Tunables shared by the detectors and the CLI. Kept in a dependency-free module
+# so the CLI can show defaults in --help without importing any detector.
+
+# pip --version probes; a hung shim must not stall a run
+PIP_PROBE_TIMEOUT = 10.0
+PIP_PROBE_WORKERS = 4
+# "static" reads shebang + installed metadata and only falls back to running pip;
+# "subprocess" always runs `pip --version`
+PIP_PROBE_MODES = ("static", "subprocess")
+
+# probe script run inside other interpreters
+PROBE_TIMEOUT = 15.0
+INTERPRETER_WORKERS = 16
+
+# check --level: basic skips tree walks and subprocesses and fits BASIC_TIME_BUDGET
+# (seconds); standard adds them; full also resolves every import in the project
+LEVELS = ("basic", "standard", "full")
+BASIC_TIME_BUDGET = 0.25
+
+# startup detector: importing the project this much slower than a bare start is an issue (ms)
+SLOW_STARTUP_MS = 500.0
+
+OUTPUT_FORMATS = ("text", "json", "jsonl", "md", "markdown")
+
+# issue severities, mildest first; `--fail-on` accepts any of them
+SEVERITIES = ("info", "warning", "error")
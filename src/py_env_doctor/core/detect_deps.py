@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.version import InvalidVersion, Version
+
+from .detect_layout import _read_pyproject
+from .installed import canonicalize_name
+from .model import DependencyInfo
+
+
+def read_requirements(project_path: Path) -> List[Tuple[Optional[str], str]]:
+    """``(extra, requirement)`` pairs from ``[project]``; ``extra`` is None for required dependencies."""
+    data = _read_pyproject(Path(project_path).resolve() / "pyproject.toml")
+    proj = data.get("project") if isinstance(data, dict) else None
+    if not isinstance(proj, dict):
+        return []
+    out: List[Tuple[Optional[str], str]] = []
+    deps = proj.get("dependencies")
+    if isinstance(deps, list):
+        out.extend((None, d) for d in deps if isinstance(d, str))
+    optional = proj.get("optional-dependencies")
+    if isinstance(optional, dict):
+        for extra, reqs in optional.items():
+            if isinstance(reqs, list):
+                out.extend((str(extra), d) for d in reqs if isinstance(d, str))
+    return out
+
+
+def _label(req: Requirement, extra: Optional[str]) -> str:
+    return f"{req} [{extra}]" if extra else str(req)
+
+
+def check_requirements(
+    requirements: List[Tuple[Optional[str], str]],
+    versions: Dict[str, Optional[str]],
+    environment: Optional[Dict[str, str]] = None,
+) -> DependencyInfo:
+    """Evaluate requirements against a canonical-name -> version map of installed distributions.
+
+    ``environment`` overrides PEP 508 marker variables, e.g. with the values a
+    target interpreter reported; it defaults to the running interpreter.
+    """
+    info = DependencyInfo(checked=len(requirements))
+    for extra, raw in requirements:
+        try:
+            req = Requirement(raw)
+        except InvalidRequirement:
+            info.invalid.append(raw)
+            continue
+        if req.marker is not None:
+            env = dict(environment or {})
+            env["extra"] = extra or ""
+            try:
+                applies = req.marker.evaluate(env)
+            except Exception:
+                applies = True
+            if not applies:
+                info.skipped.append(_label(req, extra))
+                continue
+        key = canonicalize_name(req.name)
+        if key not in versions:
+            (info.missing_optional if extra else info.missing).append(_label(req, extra))
+            continue
+        installed = versions[key]
+        if not req.specifier or installed is None:
+            continue
+        try:
+            ok = req.specifier.contains(Version(installed), prereleases=True)
+        except InvalidVersion:
+            continue
+        if not ok:
+            info.mismatched.append(f"{_label(req, extra)} (installed {installed})")
+    return info
+
+
+def detect_dependencies(
+    project_path: Path,
+    versions: Dict[str, Optional[str]],
+    environment: Optional[Dict[str, str]] = None,
+) -> Optional[DependencyInfo]:
+    requirements = read_requirements(project_path)
+    if not requirements:
+        return None
+    return check_requirements(requirements, versions, environment)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import importlib.util
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 try:  # Python 3.11+
     import tomllib  # type: ignore
@@ -39,21 +39,36 @@ def _is_importable(mod_name: str) -> Optional[bool]:
         return False
 
 
-def inspect_project(project_path: Path) -> ProjectInfo:
-    project_path = project_path.resolve()
-    pyproject_file = project_path / "pyproject.toml"
-    data = _read_pyproject(pyproject_file)
-    project_name: Optional[str] = None
-    package_importable: Optional[bool] = None
-
+def _project_name(data: Optional[dict]) -> Optional[str]:
     if data and isinstance(data, dict):
         proj = data.get("project")
         if isinstance(proj, dict):
             name = proj.get("name")
             if isinstance(name, str) and name.strip():
-                project_name = name.strip()
-                import_name = _normalize_import_name(project_name)
-                package_importable = _is_importable(import_name)
+                return name.strip()
+    return None
+
+
+def project_import_name(project_path: Path) -> Optional[str]:
+    """Import name of the project declared in ``pyproject.toml``, if any."""
+    name = _project_name(_read_pyproject(Path(project_path).resolve() / "pyproject.toml"))
+    return _normalize_import_name(name) if name else None
+
+
+def inspect_project(project_path: Path, find_spec: Optional[Dict[str, bool]] = None) -> ProjectInfo:
+    """Describe the project; ``find_spec`` holds importability answers from a target interpreter probe."""
+    project_path = project_path.resolve()
+    pyproject_file = project_path / "pyproject.toml"
+    data = _read_pyproject(pyproject_file)
+    project_name = _project_name(data)
+    package_importable: Optional[bool] = None
+
+    if project_name:
+        import_name = _normalize_import_name(project_name)
+        if find_spec is not None:
+            package_importable = find_spec.get(import_name)
+        else:
+            package_importable = _is_importable(import_name)
 
     return ProjectInfo(
         path=str(project_path),
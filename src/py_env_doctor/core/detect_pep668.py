@@ -8,26 +8,29 @@ from typing import List
 
 
 def _candidate_site_dirs() -> List[str]:
+    """Site directories in sys.path order: the user site (when enabled), then site-packages."""
     paths: List[str] = []
-    # sysconfig paths
-    try:
-        sc = sysconfig.get_paths()
-        for key in ("purelib", "platlib"):
-            p = sc.get(key)
-            if p:
-                paths.append(p)
-    except Exception:
-        pass
+    # site.main() adds the user site ahead of site-packages, and only when enabled
+    if site.ENABLE_USER_SITE:
+        try:
+            up = site.getusersitepackages()
+            if up:
+                paths.append(up)
+        except Exception:
+            pass
     # site module paths
     try:
         for p in site.getsitepackages():
             paths.append(p)
     except Exception:
         pass
+    # sysconfig paths
     try:
-        up = site.getusersitepackages()
-        if up:
-            paths.append(up)
+        sc = sysconfig.get_paths()
+        for key in ("purelib", "platlib"):
+            p = sc.get(key)
+            if p:
+                paths.append(p)
     except Exception:
         pass
     # de-duplicate preserving order
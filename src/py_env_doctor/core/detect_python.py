@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import contextvars
 import os
 import platform
 import re
-import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from pathlib import Path
 from typing import List, Optional
 
-from .model import PythonInfo, PlatformInfo, PipInfo, PipBinary
-from .detect_pep668 import is_externally_managed
+from .model import PythonInfo, PlatformInfo, PipInfo, PipBinary, to_plain
+from .cache import DiskCache, file_identity
+from .defaults import PIP_PROBE_TIMEOUT, PIP_PROBE_WORKERS
+from .cancel import time_left
+from .pathindex import PIP_NAME_RE, PathIndex, build_path_index, name_version, resolve_pyenv_shim
+from .detect_pep668 import _candidate_site_dirs, is_externally_managed
+from .pip_static import (
+    interpreter_site_dirs,
+    interpreter_version,
+    is_python_interpreter,
+    read_shebang,
+    static_pip_probe,
+)
 
 
 def _read_os_release() -> Optional[str]:
@@ -62,7 +74,30 @@ def _is_windows_store_python() -> bool:
     return "WindowsApps" in s or "Microsoft" in s
 
 
-def gather_python_info() -> PythonInfo:
+# Environment variables that gather_python_info and pyenv-style shims depend on
+_PYTHON_ENV_VARS = ("CONDA_DEFAULT_ENV", "PYENV_ROOT", "PYENV_SHELL")
+_SHIM_ENV_VARS = ("PATH", "PYENV_VERSION", "PYENV_ROOT", "VIRTUAL_ENV", "CONDA_PREFIX")
+
+
+def _python_info_cache_key() -> list:
+    site_ids = []
+    for d in _candidate_site_dirs():
+        # EXTERNALLY-MANAGED lives next to the site dir, so watch the parent too
+        site_ids.append(file_identity(d))
+        site_ids.append(file_identity(os.path.dirname(d)))
+    return [
+        "python_info",
+        file_identity(sys.executable),
+        sys.prefix,
+        getattr(sys, "base_prefix", sys.prefix),
+        site_ids,
+        file_identity("/etc/os-release"),
+        platform.release(),
+        [os.environ.get(k) for k in _PYTHON_ENV_VARS],
+    ]
+
+
+def _collect_python_info() -> PythonInfo:
     is_venv = sys.prefix != getattr(sys, "base_prefix", sys.prefix)
     is_conda = bool(os.environ.get("CONDA_DEFAULT_ENV")) or "conda" in sys.prefix.lower()
     is_pyenv = _is_pyenv_exe()
@@ -83,35 +118,111 @@ def gather_python_info() -> PythonInfo:
         is_pyenv=is_pyenv,
         pep668_externally_managed=pep668,
         platform=PlatformInfo(system=plat, release=rel, distro=distro),
+        prefix=sys.prefix,
+        base_prefix=getattr(sys, "base_prefix", sys.prefix),
+        site_dirs=_candidate_site_dirs(),
     )
 
 
-_PIP_CANDIDATE_NAMES_CACHE: Optional[List[str]] = None
+def python_info_from_probe(data: dict) -> PythonInfo:
+    """Build PythonInfo from a probe.run_probe reply describing another interpreter."""
+    executable = data.get("executable") or ""
+    prefix = data.get("prefix") or ""
+    is_venv = prefix != (data.get("base_prefix") or prefix)
+    is_conda = bool(data.get("is_conda"))
+    is_pyenv = ".pyenv" in executable
+    pep668 = bool(data.get("pep668_externally_managed"))
+    plat = data.get("platform") or {}
+    system = plat.get("system") or platform.system()
+    distro = _read_os_release() if system == "Linux" else None
+    return PythonInfo(
+        executable=executable,
+        version=data.get("version") or "",
+        implementation=data.get("implementation") or "",
+        environment_type=_env_type(is_venv, is_conda, is_pyenv, pep668),
+        is_venv=is_venv,
+        is_conda=is_conda,
+        is_pyenv=is_pyenv,
+        pep668_externally_managed=pep668,
+        platform=PlatformInfo(system=system, release=plat.get("release") or "", distro=distro),
+        prefix=prefix or None,
+        base_prefix=data.get("base_prefix"),
+        site_dirs=list(data.get("site_dirs") or []),
+    )
 
 
-def _pip_candidate_names(pyver: str) -> List[str]:
-    global _PIP_CANDIDATE_NAMES_CACHE
-    if _PIP_CANDIDATE_NAMES_CACHE is not None:
-        return _PIP_CANDIDATE_NAMES_CACHE
-    major_minor = ".".join(pyver.split(".")[:2])
-    names = [
-        "pip",
-        "pip3",
-        f"pip{major_minor}",
-        f"pip{pyver}",
-    ]
-    _PIP_CANDIDATE_NAMES_CACHE = names
-    return names
+def fallback_python_info(executable: Optional[str] = None) -> PythonInfo:
+    """Interpreter facts that cost nothing to read, for a report whose python detector never finished.
+
+    For another interpreter (``executable``) only its path is known, and the
+    empty version marks the rest as unknown.
+    """
+    plat = PlatformInfo(system=platform.system(), release=platform.release())
+    if executable:
+        return PythonInfo(
+            executable=executable,
+            version="",
+            implementation="",
+            environment_type="unknown",
+            is_venv=False,
+            is_conda=False,
+            is_pyenv=False,
+            pep668_externally_managed=False,
+            platform=plat,
+        )
+    is_venv = sys.prefix != getattr(sys, "base_prefix", sys.prefix)
+    is_conda = bool(os.environ.get("CONDA_DEFAULT_ENV")) or "conda" in sys.prefix.lower()
+    return PythonInfo(
+        executable=sys.executable,
+        version=platform.python_version(),
+        implementation=platform.python_implementation(),
+        environment_type=_env_type(is_venv, is_conda, False, False),
+        is_venv=is_venv,
+        is_conda=is_conda,
+        is_pyenv=False,
+        pep668_externally_managed=False,
+        platform=plat,
+        prefix=sys.prefix,
+        base_prefix=getattr(sys, "base_prefix", sys.prefix),
+    )
+
+
+def gather_python_info(cache: Optional[DiskCache] = None) -> PythonInfo:
+    if cache is None:
+        return _collect_python_info()
+    key = _python_info_cache_key()
+    hit = cache.get(key)
+    if hit is not None:
+        try:
+            return PythonInfo.from_dict(hit)
+        except Exception:
+            pass
+    info = _collect_python_info()
+    cache.set(key, to_plain(info))
+    return info
 
 
 _PIP_VERSION_RE = re.compile(r"pip\s+(?P<pver>[\w\.]+)\s+from\s+(?P<path>\S+)\s+\(python\s+(?P<pyver>[\d\.]+)\)")
 
 
-def _pip_info_from_binary(name: str, path: str) -> PipBinary:
-    pb = PipBinary(name=name, path=path)
+def _pip_info_static(name: str, path: str) -> PipBinary:
+    shebang, pip_version, python_version = static_pip_probe(path)
+    pb = PipBinary(name=name, path=path, shebang_python=shebang)
+    if pip_version and python_version:
+        pb.pip_version = pip_version
+        pb.python_version = python_version
+    return pb
+
+
+def _pip_info_from_binary(name: str, path: str, timeout: Optional[float] = PIP_PROBE_TIMEOUT) -> PipBinary:
+    pb = PipBinary(name=name, path=path, shebang_python=read_shebang(path))
+    timeout = time_left(timeout)  # never outlive the detector's own timeout or the run's deadline
     try:
-        proc = subprocess.run([path, "--version"], capture_output=True, text=True, check=False)
+        proc = subprocess.run([path, "--version"], capture_output=True, text=True, check=False, timeout=timeout)
         out = (proc.stdout or "") + (proc.stderr or "")
+    except subprocess.TimeoutExpired:
+        pb.timed_out = True
+        return pb
     except Exception:
         out = ""
     m = _PIP_VERSION_RE.search(out)
@@ -121,17 +232,130 @@ def _pip_info_from_binary(name: str, path: str) -> PipBinary:
     return pb
 
 
-def gather_pip_info(py_info: PythonInfo) -> PipInfo:
-    binaries: List[PipBinary] = []
-    seen = set()
-    for name in _pip_candidate_names(py_info.version):
-        p = shutil.which(name)
-        if p and p not in seen:
-            seen.add(p)
-            binaries.append(_pip_info_from_binary(name, p))
+def _run_pip_probes(found: List[tuple], timeout: Optional[float], max_workers: int) -> List[PipBinary]:
+    if len(found) <= 1 or max_workers <= 1:
+        return [_pip_info_from_binary(name, path, timeout) for name, path in found]
+    workers = min(max_workers, len(found))
+    # each task runs in a copy of the caller's context so timing counters follow it
+    contexts = [contextvars.copy_context() for _ in found]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pip-probe") as pool:
+        # map() keeps PATH discovery order regardless of completion order
+        return list(
+            pool.map(lambda ctx, item: ctx.run(_pip_info_from_binary, item[0], item[1], timeout), contexts, found)
+        )
+
+
+def _pyenv_version_files() -> List[list]:
+    # files a pyenv shim consults to pick the interpreter, nearest first
+    ids = []
+    cur = Path.cwd()
+    for d in (cur, *cur.parents):
+        ids.append(file_identity(str(d / ".python-version")))
+    root = os.environ.get("PYENV_ROOT") or os.path.expanduser("~/.pyenv")
+    ids.append(file_identity(os.path.join(root, "version")))
+    return ids
+
+
+def _pip_cache_key(mode: str, name: str, path: str) -> list:
+    shebang = read_shebang(path)
+    key = ["pip_binary", mode, name, file_identity(path), file_identity(shebang)]
+    if shebang and is_python_interpreter(shebang):
+        version = interpreter_version(shebang)
+        key.append([file_identity(str(d)) for d in interpreter_site_dirs(shebang, version)])
+    else:
+        # shims decide at run time, so key on what they look at
+        key.append([os.environ.get(k) for k in _SHIM_ENV_VARS])
+        key.append(_pyenv_version_files())
+    return key
+
+
+def _probe_pip_binaries(
+    found: List[tuple],
+    timeout: Optional[float],
+    max_workers: int,
+    mode: str = "static",
+    cache: Optional[DiskCache] = None,
+    fallback: bool = True,
+) -> List[PipBinary]:
+    if cache is None:
+        return _probe_pip_binaries_uncached(found, timeout, max_workers, mode, fallback)
+    keys = [_pip_cache_key(mode, name, path) for name, path in found]
+    results: List[Optional[PipBinary]] = []
+    missing: List[int] = []
+    for idx, key in enumerate(keys):
+        hit = cache.get(key)
+        pb = None
+        if hit is not None:
+            try:
+                pb = PipBinary.from_dict(hit)
+            except Exception:
+                pb = None
+        if pb is None:
+            missing.append(idx)
+        results.append(pb)
+    if missing:
+        probed = _probe_pip_binaries_uncached([found[i] for i in missing], timeout, max_workers, mode, fallback)
+        for idx, pb in zip(missing, probed):
+            results[idx] = pb
+            # only cache complete answers; timeouts and failures may be transient
+            if pb.pip_version and pb.python_version and not pb.timed_out:
+                cache.set(keys[idx], to_plain(pb))
+    return results  # type: ignore[return-value]
+
+
+def _probe_pip_binaries_uncached(
+    found: List[tuple], timeout: Optional[float], max_workers: int, mode: str = "static", fallback: bool = True
+) -> List[PipBinary]:
+    if mode != "static":
+        return _run_pip_probes(found, timeout, max_workers)
+    results: List[Optional[PipBinary]] = []
+    unresolved: List[int] = []
+    for idx, (name, path) in enumerate(found):
+        pb = _pip_info_static(name, path)
+        if pb.pip_version is None:
+            unresolved.append(idx)
+        results.append(pb)
+    if unresolved and fallback:
+        probed = _run_pip_probes([found[i] for i in unresolved], timeout, max_workers)
+        for idx, pb in zip(unresolved, probed):
+            results[idx] = pb
+    return results  # type: ignore[return-value]
+
+
+def _expected_python(name: str, current_mm: str) -> str:
+    # pipX.Y is meant for Python X.Y; pip and pip3 for the interpreter in use
+    promised = name_version(name)
+    if promised and "." in promised:
+        return ".".join(promised.split(".")[:2])
+    return current_mm
+
+
+def gather_pip_info(
+    py_info: PythonInfo,
+    timeout: Optional[float] = PIP_PROBE_TIMEOUT,
+    max_workers: int = PIP_PROBE_WORKERS,
+    mode: str = "static",
+    cache: Optional[DiskCache] = None,
+    path_index: Optional[PathIndex] = None,
+    fallback: bool = True,
+) -> PipInfo:
+    index = path_index if path_index is not None else build_path_index()
+    found: List[tuple] = []
+    for e in index.winners(PIP_NAME_RE):
+        # a pyenv shim stands for the binary it dispatches to; one no active version has just fails
+        target = resolve_pyenv_shim(e.path)
+        if target:
+            found.append((e.name, target))
+    # without ``fallback`` a static probe never runs pip, even when the files do not answer
+    binaries = _probe_pip_binaries(found, timeout, max_workers, mode, cache, fallback)
     mismatches: List[str] = []
     cur_mm = ".".join(py_info.version.split(".")[:2])
     for b in binaries:
-        if b.python_version and b.python_version != cur_mm:
-            mismatches.append(f"{b.name} -> Python {b.python_version} (current {cur_mm})")
-    return PipInfo(binaries=binaries, mismatches=mismatches)
+        expected = _expected_python(b.name, cur_mm)
+        if b.python_version and b.python_version != expected:
+            label = "current" if expected == cur_mm else "expected"
+            mismatches.append(f"{b.name} -> Python {b.python_version} ({label} {expected})")
+    shadowed = [
+        f"{name}: {paths[0]} shadows {', '.join(paths[1:])}" for name, paths in sorted(index.shadowed().items())
+    ]
+    return PipInfo(binaries=binaries, mismatches=mismatches, path_shadowed=shadowed)
@@ -1,24 +1,45 @@
 from __future__ import annotations
 
 import os
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
-
-# Common top-level packages that users often accidentally shadow
-_COMMON_PKGS = {
-    "requests",
-    "numpy",
-    "pandas",
-    "matplotlib",
-    "scipy",
-    "typer",
-    "click",
-    "flask",
-    "django",
-    "pytest",
-    "yaml",
-    "pip",
-}
+from typing import TYPE_CHECKING, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .cancel import check_cancelled
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .installed import InstalledIndex
+
+# Popular packages that are worth flagging even before they are installed
+_COMMON_PKGS = frozenset(
+    {
+        "requests",
+        "numpy",
+        "pandas",
+        "matplotlib",
+        "scipy",
+        "typer",
+        "click",
+        "flask",
+        "django",
+        "pytest",
+        "yaml",
+        "pip",
+    }
+)
+
+# Names that look like shadowing but are conventional and harmless
+_IGNORED = frozenset({"__init__", "__main__", "conftest", "test", "tests"})
+
+# Never descended into, besides hidden directories (.git, .venv, .tox, caches)
+_PRUNE = frozenset({"__pycache__", "node_modules", "site-packages", "build", "dist"})
+# a directory holding one of these is an environment, not project code
+_ENV_MARKERS = ("pyvenv.cfg", "conda-meta")
+
+_MODULE_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
 def _norm(name: Optional[str]) -> Optional[str]:
@@ -27,37 +48,212 @@ def _norm(name: Optional[str]) -> Optional[str]:
     return name.replace("-", "_")
 
 
-def detect_shadowing(project_path: Path, project_name: Optional[str]) -> List[str]:
-    project_path = Path(project_path)
-    found: List[str] = []
-    try:
-        entries = list(project_path.iterdir())
-    except Exception:
-        entries = []
+@lru_cache(maxsize=1)
+def stdlib_module_names() -> FrozenSet[str]:
+    """Top-level stdlib module names (``sys.stdlib_module_names``, or a stdlib listing before 3.10)."""
+    names = getattr(sys, "stdlib_module_names", None)
+    if names is not None:
+        return frozenset(names)
+    import sysconfig
+
+    found = set(sys.builtin_module_names)
+    stdlib = sysconfig.get_paths()["stdlib"]
+    for base in (stdlib, os.path.join(stdlib, "lib-dynload")):
+        try:
+            with os.scandir(base) as it:
+                for e in it:
+                    name = e.name.split(".", 1)[0]
+                    if e.name.endswith((".py", ".so", ".pyd")) or (e.is_dir() and name != "site-packages"):
+                        found.add(name)
+        except OSError:
+            continue
+    return frozenset(n for n in found if _MODULE_RE.match(n))
+
+
+def module_index(installed: Optional["InstalledIndex"] = None, exclude: Iterable[str] = ()) -> FrozenSet[str]:
+    """Every top-level name a local module could shadow: stdlib, installed and popular packages.
+
+    ``exclude`` drops names the project provides itself (its own installed top-levels).
+    """
+    names = set(stdlib_module_names()) | _COMMON_PKGS
+    if installed is not None:
+        names.update(installed.by_module)
+    names.difference_update(exclude)
+    names.difference_update(_IGNORED)
+    return frozenset(names)
+
+
+# --- .gitignore ---------------------------------------------------------------
+
+Rule = Tuple["re.Pattern[str]", bool, bool]  # (regex on the path relative to the .gitignore, negated, dir only)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out: List[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_gitignore(text: str) -> List[Rule]:
+    rules: List[Rule] = []
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        body = _glob_to_regex(line.lstrip("/"))
+        regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+        rules.append((re.compile(regex), negated, dir_only))
+    return rules
+
+
+def _ignored(layers: List[Tuple[str, List[Rule]]], rel: str, is_dir: bool) -> bool:
+    # the last matching rule wins; deeper .gitignore files come later
+    result = False
+    for base, rules in layers:
+        if base:
+            if not rel.startswith(base + "/"):
+                continue
+            sub = rel[len(base) + 1 :]
+        else:
+            sub = rel
+        for regex, negated, dir_only in rules:
+            if (is_dir or not dir_only) and regex.match(sub):
+                result = not negated
+    return result
+
 
-    names = set()
-    for e in entries:
+# --- walker -------------------------------------------------------------------
+
+
+def walk_project(
+    root: Path, paths: Optional[List[str]] = None
+) -> Iterator[Tuple[str, str, List["os.DirEntry[str]"], List["os.DirEntry[str]"]]]:
+    """Like ``os.walk`` over the project, yielding ``(dir, relative dir, subdirs, files)``.
+
+    Hidden, dependency and build directories, environments and ``.gitignore``
+    matches are left out. As with ``os.walk``, removing entries from ``subdirs``
+    keeps the walk out of them. Listed directories and ``.gitignore`` files read
+    are appended to ``paths`` when given.
+    """
+    # stack of (directory, relative path, .gitignore layers in effect)
+    stack: List[Tuple[str, str, List[Tuple[str, List[Rule]]]]] = [(str(root), "", [])]
+    while stack:
+        check_cancelled()
+        path, rel, layers = stack.pop()
         try:
-            if e.is_dir():
-                names.add(e.name)
-            elif e.is_file():
-                if e.suffix == ".py":
-                    names.add(e.stem)
-                else:
-                    # common trap: requirements.txt named like a package? ignore
-                    pass
-        except Exception:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        if paths is not None:
+            paths.append(path)
+        names = {e.name for e in entries}
+        if rel and any(m in names for m in _ENV_MARKERS):
             continue
+        if ".gitignore" in names:
+            gi = os.path.join(path, ".gitignore")
+            try:
+                with open(gi, "r", encoding="utf-8", errors="replace") as f:
+                    layers = layers + [(rel, parse_gitignore(f.read()))]
+                if paths is not None:
+                    paths.append(gi)
+            except OSError:
+                pass
+        prefix = rel + "/" if rel else ""
+        dirs: List["os.DirEntry[str]"] = []
+        files: List["os.DirEntry[str]"] = []
+        for e in entries:
+            try:
+                is_dir = e.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir and (e.name in _PRUNE or e.name.startswith(".") or e.name.endswith(".egg-info")):
+                continue
+            if layers and _ignored(layers, prefix + e.name, is_dir):
+                continue
+            (dirs if is_dir else files).append(e)
+        yield path, rel, dirs, files
+        for d in reversed(dirs):
+            stack.append((d.path, prefix + d.name, layers))
 
-    # check common packages
-    for pkg in _COMMON_PKGS:
-        if pkg in names:
-            found.append(pkg)
 
-    # check if project name shadows Python stdlib or third-party usage (basic)
+@dataclass
+class ShadowScan:
+    found: List[str] = field(default_factory=list)
+    # directories listed and .gitignore files read: what a re-check must stat
+    paths: List[str] = field(default_factory=list)
+
+
+def scan_shadowing(project_path: Path, project_name: Optional[str], known: FrozenSet[str]) -> ShadowScan:
+    """Walk the project and report modules that shadow a name in ``known``.
+
+    Only directories that can be a ``sys.path`` entry are checked: the project
+    root and directories that are not packages themselves (``src/``,
+    ``scripts/``, ``tests/``...). Inside a package, modules are submodules and
+    shadow nothing, so packages are not descended into. Results are the module
+    name at the root and ``dir/name`` below it.
+    """
+    scan = ShadowScan()
+    found = set()
     pn = _norm(project_name)
-    if pn and pn in names:
-        # shadowing itself by a top-level script/module that conflicts with package
-        found.append(pn)
+    for _, rel, dirs, files in walk_project(Path(project_path), scan.paths):
+        prefix = rel + "/" if rel else ""
+        modules = [f.name[:-3] for f in files if f.name.endswith(".py")]
+        subdirs = []
+        for d in dirs:
+            if os.path.isfile(os.path.join(d.path, "__init__.py")):
+                modules.append(d.name)
+            else:
+                subdirs.append(d)
+        dirs[:] = subdirs
+        for module in modules:
+            if not _MODULE_RE.match(module):
+                continue
+            # the project's own package may be installed (editable); only a root-level copy shadows it
+            if (module in known and module != pn) or (not rel and module == pn):
+                found.add(prefix + module)
+    scan.found = sorted(found)
+    return scan
+
 
-    return sorted(set(found))
+def detect_shadowing(project_path: Path, project_name: Optional[str], known: Optional[FrozenSet[str]] = None) -> List[str]:
+    """Local modules that shadow stdlib, installed or popular packages (see ``scan_shadowing``)."""
+    return scan_shadowing(project_path, project_name, module_index() if known is None else known).found
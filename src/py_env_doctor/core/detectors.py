@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .defaults import PIP_PROBE_TIMEOUT, PIP_PROBE_WORKERS
+from .registry import COST_PARSE, COST_SOURCES, COST_STAT, COST_SUBPROCESS, COST_WALK, COSTS, Detector
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .cache import DiskCache
+
+# The built-in detectors of ``check`` and the facts they exchange:
+#
+#   project_path, options        given by the caller
+#   python [, probe]             interpreter facts (probe: the --python reply)
+#   path_index                   pip*/python* executables on PATH
+#   pip                          needs python, path_index
+#   project_name                 needs project_path
+#   project                      needs project_path [, probe]
+#   installed_index              needs python
+#   shadowing [, shadowing_paths] needs project_path, project_name, installed_index
+#   dependencies                 needs project_path, installed_index [, probe]
+#   imports, imports_paths       needs project_path, project_name, installed_index [, probe]
+#   verify                       needs installed_index
+#   startup                      needs python, project_path, project_name
+#
+# so pip/installed/dependencies run alongside project/shadowing once python is known.
+# Each detector carries a cost class; --level drops the classes it does not allow
+# (shadowing and imports walk the tree, so basic leaves them out, and imports
+# parses every source file, so only full runs it; so do verify, which hashes
+# every installed file, and startup, which imports the project and so runs its code).
+
+
+@dataclass
+class CheckOptions:
+    probe_timeout: float = PIP_PROBE_TIMEOUT
+    probe_workers: int = PIP_PROBE_WORKERS
+    pip_probe: str = "static"
+    cache: Optional["DiskCache"] = None
+    target_python: Optional[str] = None
+    # False at --level basic: static pip probes do not fall back to running pip
+    allow_subprocess: bool = True
+
+
+def _local_python(options: CheckOptions):
+    from .detect_python import gather_python_info
+
+    return gather_python_info(cache=options.cache)
+
+
+def _target_python(project_path: Path, options: CheckOptions) -> Dict[str, Any]:
+    from .detect_layout import project_import_name
+    from .detect_python import python_info_from_probe
+    from .probe import run_probe
+
+    # one spawn of the target answers every interpreter-side question
+    import_name = project_import_name(project_path)
+    data = run_probe(options.target_python, payload={"modules": [import_name] if import_name else []}, isolated=False)
+    return {"python": python_info_from_probe(data), "probe": data}
+
+
+def _path_index():
+    from .pathindex import build_path_index
+
+    return build_path_index()
+
+
+def _pip(python, options: CheckOptions, path_index):
+    from .detect_python import gather_pip_info
+
+    return gather_pip_info(
+        python,
+        timeout=options.probe_timeout,
+        max_workers=options.probe_workers,
+        mode=options.pip_probe,
+        cache=options.cache,
+        path_index=path_index,
+        fallback=options.allow_subprocess,
+    )
+
+
+def _project_name(project_path: Path) -> Optional[str]:
+    from .detect_layout import _project_name, _read_pyproject
+
+    return _project_name(_read_pyproject(Path(project_path).resolve() / "pyproject.toml"))
+
+
+def _project(project_path: Path, probe: Optional[Dict[str, Any]] = None):
+    from .detect_layout import inspect_project
+
+    find_spec = (probe.get("find_spec") or {}) if probe is not None else None
+    return inspect_project(project_path, find_spec=find_spec)
+
+
+def _shadowing(project_path: Path, project_name: Optional[str], installed_index) -> Dict[str, List[str]]:
+    from .detect_shadowing import module_index, scan_shadowing
+
+    own = installed_index.get(project_name) if project_name else None
+    known = module_index(installed_index, exclude=own.top_level if own is not None else ())
+    scan = scan_shadowing(project_path, project_name, known)
+    return {"shadowing": scan.found, "shadowing_paths": scan.paths}
+
+
+def _installed_index(python):
+    from .installed import build_installed_index
+
+    return build_installed_index(python.site_dirs)
+
+
+def _imports(project_path: Path, project_name: Optional[str], installed_index, probe: Optional[Dict[str, Any]] = None):
+    from .imports import interpreter_context, resolve_imports
+
+    info, paths = resolve_imports(project_path, project_name, installed=installed_index, **interpreter_context(probe))
+    return {"imports": info, "imports_paths": paths}
+
+
+def _verify(installed_index, options: CheckOptions):
+    from .appdirs import user_cache_dir
+    from .verify import verify_installed
+
+    # the hash cache follows --no-cache like the probe cache
+    cache_dir = user_cache_dir() / "verify" if options.cache is not None else None
+    return verify_installed(installed_index, cache_dir=cache_dir)
+
+
+def _startup(python, project_path: Path, project_name: Optional[str], options: CheckOptions):
+    from .detect_layout import _normalize_import_name
+    from .startup import measure_startup
+
+    executable = options.target_python or python.executable
+    import_name = _normalize_import_name(project_name) if project_name else None
+    return measure_startup(executable, python.site_dirs, import_name, cwd=Path(project_path).resolve())
+
+
+def _dependencies(project_path: Path, installed_index, probe: Optional[Dict[str, Any]] = None):
+    from .detect_deps import detect_dependencies
+
+    marker_env = probe.get("marker_environment") if probe is not None else None
+    return detect_dependencies(project_path, installed_index.versions(), marker_env)
+
+
+# cost classes each --level runs; "python" runs at every level since every report needs it
+LEVEL_COSTS = {
+    "basic": (COST_STAT, COST_PARSE),
+    "standard": (COST_STAT, COST_PARSE, COST_WALK, COST_SUBPROCESS),
+    "full": COSTS,
+}
+REQUIRED = ("python",)
+
+
+def for_level(detectors: List[Detector], level: str) -> List[Detector]:
+    """The detectors whose cost class ``level`` allows (see ``LEVEL_COSTS``)."""
+    allowed = LEVEL_COSTS[level]
+    return [d for d in detectors if d.name in REQUIRED or (d.cost or COST_SUBPROCESS) in allowed]
+
+
+def builtin_detectors(
+    target_python: bool = False, timeout: Optional[float] = None, level: str = "standard", pip_probe: str = "static"
+) -> List[Detector]:
+    """The detectors ``check`` runs at ``level``; with ``target_python`` they read the probe reply."""
+    probe = ("probe",) if target_python else ()
+    if target_python:
+        python = Detector(
+            "python", _target_python, ("project_path", "options"), ("python", "probe"), timeout,
+            cost=COST_SUBPROCESS, estimate_ms=80.0, value=100,
+        )
+    else:
+        python = Detector("python", _local_python, ("options",), ("python",), timeout, cost=COST_PARSE, value=100)
+    # static pip probes read shebangs and metadata, and start pip only as a fallback (not at --level basic)
+    pip_cost = COST_SUBPROCESS if pip_probe == "subprocess" else COST_PARSE
+    detectors = [
+        python,
+        Detector("path_index", _path_index, (), ("path_index",), timeout, cost=COST_STAT, value=50),
+        Detector("pip", _pip, ("python", "options", "path_index"), ("pip",), timeout, cost=pip_cost, value=80),
+        Detector(
+            "project_name", _project_name, ("project_path",), ("project_name",), timeout, cost=COST_PARSE, value=60
+        ),
+        Detector("project", _project, ("project_path",) + probe, ("project",), timeout, cost=COST_PARSE, value=90),
+        Detector(
+            "shadowing",
+            _shadowing,
+            ("project_path", "project_name", "installed_index"),
+            ("shadowing", "shadowing_paths"),
+            timeout,
+            cost=COST_WALK,
+            value=40,
+        ),
+        Detector(
+            "installed", _installed_index, ("python",), ("installed_index",), timeout, cost=COST_PARSE, estimate_ms=40.0,
+            value=60,
+        ),
+        Detector(
+            "dependencies",
+            _dependencies,
+            ("project_path", "installed_index") + probe,
+            ("dependencies",),
+            timeout,
+            cost=COST_PARSE,
+            value=70,
+        ),
+        Detector(
+            "imports",
+            _imports,
+            ("project_path", "project_name", "installed_index") + probe,
+            ("imports", "imports_paths"),
+            timeout,
+            cost=COST_SOURCES,
+            value=30,
+        ),
+        Detector(
+            "startup",
+            _startup,
+            ("python", "project_path", "project_name", "options"),
+            ("startup",),
+            timeout,
+            # two spawns, but one of them executes project code: only at --level full
+            cost=COST_SOURCES,
+            estimate_ms=250.0,
+            value=25,
+        ),
+        Detector(
+            "verify", _verify, ("installed_index", "options"), ("verify",), timeout, cost=COST_SOURCES, value=20
+        ),
+    ]
+    return for_level(detectors, level)
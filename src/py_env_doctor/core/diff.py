@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .model import FleetReport, Issue, PipInfo, ProjectInfo, ProjectReport, PythonInfo, Report, to_plain
+
+# Comparing two reports (a stored baseline and a fresh run, or two runs of a
+# fleet scan). Issues are matched through dictionaries keyed by code and
+# projects by path, so a diff is linear in the size of the reports.
+
+AnyReport = Union[Report, FleetReport]
+
+# issue details join their items with ", " or "; "; fragments are compared to
+# tell whether a changed issue gained an item or only lost some
+_ITEM_SEP = re.compile(r"[;,] ")
+_PYTHON_FIELDS = ("executable", "version", "implementation", "environment_type", "pep668_externally_managed")
+
+
+@dataclass
+class Change:
+    field: str
+    old: Any = None
+    new: Any = None
+
+
+@dataclass
+class TargetDiff:
+    """Differences for one target: the environment, or one project of a fleet."""
+
+    target: str
+    added: List[Issue] = field(default_factory=list)
+    resolved: List[Issue] = field(default_factory=list)
+    changes: List[Change] = field(default_factory=list)
+    # changed issues (new side) whose details gained an item; they count as new for --fail-on
+    worsened: List[Issue] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.resolved or self.changes)
+
+
+@dataclass
+class ReportDiff:
+    type: str
+    targets: List[TargetDiff] = field(default_factory=list)
+    added_projects: List[str] = field(default_factory=list)
+    removed_projects: List[str] = field(default_factory=list)
+
+    @property
+    def added_issues(self) -> List[Issue]:
+        return [i for t in self.targets for i in t.added]
+
+    @property
+    def resolved_issues(self) -> List[Issue]:
+        return [i for t in self.targets for i in t.resolved]
+
+    @property
+    def empty(self) -> bool:
+        return not self.added_projects and not self.removed_projects and all(t.empty for t in self.targets)
+
+    def introduces(self, severities: Iterable[str]) -> List[Issue]:
+        """Added or worsened issues whose severity is one of ``severities``."""
+        wanted = set(severities)
+        return [i for t in self.targets for i in t.added + t.worsened if i.severity in wanted]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "py_env_doctor_diff",
+            "compared": self.type,
+            "targets": [
+                {
+                    "target": t.target,
+                    "added": to_plain(t.added),
+                    "resolved": to_plain(t.resolved),
+                    "changes": [vars(c) for c in t.changes],
+                }
+                for t in self.targets
+                if not t.empty
+            ],
+            "added_projects": self.added_projects,
+            "removed_projects": self.removed_projects,
+        }
+
+
+def _by_code(issues: Sequence[Issue]) -> Dict[str, List[Issue]]:
+    out: Dict[str, List[Issue]] = {}
+    for i in issues:
+        out.setdefault(i.code, []).append(i)
+    return out
+
+
+def _unmatched(issues: List[Issue], other: List[Issue]) -> List[Issue]:
+    remaining = Counter(i.details for i in other)
+    out: List[Issue] = []
+    for i in issues:
+        if remaining[i.details] > 0:
+            remaining[i.details] -= 1
+        else:
+            out.append(i)
+    return out
+
+
+def _items(details: Optional[str]) -> set:
+    return set(_ITEM_SEP.split(details)) if details else set()
+
+
+def _issue_diff(
+    old: Sequence[Issue], new: Sequence[Issue]
+) -> Tuple[List[Issue], List[Issue], List[Change], List[Issue]]:
+    """New, resolved and changed issues, plus the changed ones that gained an item.
+
+    Issues are indexed by code; an issue whose code is on both sides but whose
+    details differ (e.g. one more shadowing module) is a change, not a new issue.
+    A change that adds an item (``requests`` -> ``requests, numpy``) is also
+    returned as worsened, so a baseline cannot hide a new problem.
+    """
+    before, after = _by_code(old), _by_code(new)
+    added: List[Issue] = []
+    resolved: List[Issue] = []
+    changes: List[Change] = []
+    worsened: List[Issue] = []
+    for code, issues in after.items():
+        prev = before.get(code)
+        if not prev:
+            added.extend(issues)
+            continue
+        gone, came = _unmatched(prev, issues), _unmatched(issues, prev)
+        for o, n in zip(gone, came):
+            changes.append(Change(f"issue.{code}", o.details, n.details))
+            if _items(n.details) - _items(o.details):
+                worsened.append(n)
+        added.extend(came[len(gone) :])
+        resolved.extend(gone[len(came) :])
+    for code, issues in before.items():
+        if code not in after:
+            resolved.extend(issues)
+    return added, resolved, changes, worsened
+
+
+def _python_changes(old: PythonInfo, new: PythonInfo) -> List[Change]:
+    return [
+        Change(f"python.{name}", getattr(old, name), getattr(new, name))
+        for name in _PYTHON_FIELDS
+        if getattr(old, name) != getattr(new, name)
+    ]
+
+
+def _pip_changes(old: PipInfo, new: PipInfo) -> List[Change]:
+    before = {b.name: b for b in old.binaries}
+    after = {b.name: b for b in new.binaries}
+    out: List[Change] = []
+    for name in sorted(before.keys() | after.keys()):
+        a, b = before.get(name), after.get(name)
+        if a is None or b is None:
+            out.append(Change(f"pip.{name}", a.path if a else None, b.path if b else None))
+            continue
+        for attr in ("path", "pip_version", "python_version"):
+            if getattr(a, attr) != getattr(b, attr):
+                out.append(Change(f"pip.{name}.{attr}", getattr(a, attr), getattr(b, attr)))
+    return out
+
+
+def _project_changes(old: ProjectInfo, new: ProjectInfo) -> List[Change]:
+    out: List[Change] = []
+    before, after = set(old.shadowing), set(new.shadowing)
+    if before != after:
+        out.append(Change("project.shadowing", sorted(before - after), sorted(after - before)))
+    for attr in ("project_name", "package_importable"):
+        if getattr(old, attr) != getattr(new, attr):
+            out.append(Change(f"project.{attr}", getattr(old, attr), getattr(new, attr)))
+    return out
+
+
+def diff_reports(old: AnyReport, new: AnyReport) -> ReportDiff:
+    """Compare two check reports or two fleet reports."""
+    if type(old) is not type(new):
+        raise ValueError(f"cannot compare {old.type} with {new.type}")
+    env = TargetDiff("environment", changes=_python_changes(old.python, new.python) + _pip_changes(old.pip, new.pip))
+    if isinstance(old, Report):
+        env.added, env.resolved, changed, env.worsened = _issue_diff(old.issues, new.issues)
+        env.changes.extend(changed + _project_changes(old.project, new.project))
+        return ReportDiff(type=old.type, targets=[env])
+
+    result = ReportDiff(type=old.type, targets=[env])
+    before: Dict[str, ProjectReport] = {p.project.path: p for p in old.projects}
+    seen = set()
+    for p in new.projects:
+        path = p.project.path
+        seen.add(path)
+        prev = before.get(path)
+        if prev is None:
+            result.added_projects.append(path)
+            result.targets.append(TargetDiff(path, added=list(p.issues)))
+            continue
+        added, resolved, changed, worsened = _issue_diff(prev.issues, p.issues)
+        changed += _project_changes(prev.project, p.project)
+        result.targets.append(TargetDiff(path, added, resolved, changed, worsened))
+    for path, prev in before.items():
+        if path not in seen:
+            result.removed_projects.append(path)
+            result.targets.append(TargetDiff(path, resolved=list(prev.issues)))
+    return result
+
+
+def _from_jsonl(lines: List[str]) -> FleetReport:
+    records = [json.loads(line) for line in lines if line.strip()]
+    header = records[0]
+    return FleetReport.from_dict(
+        {
+            **header,
+            "projects": [{k: v for k, v in r.items() if k != "type"} for r in records if r.get("type") == "project"],
+            "summary": next(({k: v for k, v in r.items() if k != "type"} for r in records if r.get("type") == "summary"), None),
+        }
+    )
+
+
+def load(path: Path) -> AnyReport:
+    """A check or fleet report written with ``--format json`` (or a ``jsonl`` scan)."""
+    text = Path(path).read_text(encoding="utf-8")
+    try:
+        data = json.loads(text)
+    except ValueError:
+        lines = text.splitlines()
+        if len(lines) > 1:
+            return _from_jsonl(lines)
+        raise
+    if isinstance(data, dict) and data.get("type") == "py_env_doctor_fleet_report" and "projects" in data:
+        return FleetReport.from_dict(data)
+    if isinstance(data, dict):
+        return Report.from_dict(data)
+    raise ValueError(f"{path}: not a py-env-doctor report")
+
+
+def parse_fail_on(value: Optional[str], choices: Sequence[str]) -> List[str]:
+    """``"warning,error"`` -> ``["warning", "error"]``; raises ValueError for unknown severities."""
+    if not value:
+        return []
+    out = [s.strip().lower() for s in value.split(",") if s.strip()]
+    unknown = [s for s in out if s not in choices]
+    if unknown:
+        raise ValueError(f"unknown severity {', '.join(unknown)}; choose from {', '.join(choices)}")
+    return out
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import advice, detect_deps, detect_layout, detect_shadowing
+from .model import FleetReport, FleetSummary, InstalledInfo, PipInfo, ProjectReport, PythonInfo, ProjectInfo, now_iso
+
+# Below this many projects a process pool costs more than it saves.
+_MIN_PROJECTS_FOR_POOL = 8
+# projects per task when streaming: small, so lines come out as projects finish
+# and at most 2 * workers * _STREAM_CHUNK reports are held at once
+_STREAM_CHUNK = 4
+
+
+def expand_project_paths(paths: Iterable[str], patterns: Iterable[str] = ()) -> List[Path]:
+    """Resolve explicit paths and glob patterns to unique project directories, in input order."""
+    out: List[Path] = []
+    seen = set()
+    candidates: List[str] = list(paths)
+    for pattern in patterns:
+        candidates.extend(sorted(glob.glob(pattern, recursive=True)))
+    for c in candidates:
+        p = Path(c)
+        if p.name == "pyproject.toml":
+            p = p.parent
+        if not p.is_dir():
+            continue
+        key = os.path.normcase(str(p.resolve()))
+        if key not in seen:
+            seen.add(key)
+            out.append(p)
+    return out
+
+
+@dataclass
+class ScanContext:
+    """Interpreter-wide facts computed once and shipped to every project worker."""
+
+    python: PythonInfo
+    pip: PipInfo
+    diagnostics_only: bool = False
+    find_spec: Optional[Dict[str, bool]] = None
+    installed: Optional[InstalledInfo] = None
+    versions: Dict[str, Optional[str]] = field(default_factory=dict)
+    marker_environment: Optional[Dict[str, str]] = None
+    known_modules: Optional[FrozenSet[str]] = None
+
+
+def diagnose_project(args: Tuple[str, ScanContext]) -> ProjectReport:
+    """Per-project part of a check; a top-level function so process pools can pickle it."""
+    project_path, ctx = args
+    path = Path(project_path)
+    try:
+        proj_info = detect_layout.inspect_project(path, find_spec=ctx.find_spec)
+        proj_info.shadowing = detect_shadowing.detect_shadowing(path, proj_info.project_name, ctx.known_modules)
+        proj_info.dependencies = detect_deps.detect_dependencies(path, ctx.versions, ctx.marker_environment)
+        issues = advice.evaluate_issues(ctx.python, ctx.pip, proj_info, ctx.installed)
+        adv = [] if ctx.diagnostics_only else advice.make_advice(ctx.python, ctx.pip, proj_info, issues)
+    except Exception as exc:  # one broken project must not sink the whole scan
+        return ProjectReport(project=ProjectInfo(path=str(path), pyproject=False), error=f"{type(exc).__name__}: {exc}")
+    return ProjectReport(project=proj_info, issues=issues, advice=adv)
+
+
+def _diagnose_chunk(jobs: List[Tuple[str, ScanContext]]) -> List[ProjectReport]:
+    return [diagnose_project(job) for job in jobs]
+
+
+def iter_project_reports(
+    project_paths: List[Path],
+    ctx: ScanContext,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+) -> Iterator[ProjectReport]:
+    """Yield one ProjectReport per path, fanning out over a process pool.
+
+    With ``ordered`` results come back in input order; otherwise small chunks
+    (``_STREAM_CHUNK`` projects) are yielded as soon as they finish and at most
+    two per worker are in flight, so a streaming consumer holds a number of
+    reports that does not grow with the fleet.
+    """
+    jobs = [(str(p), ctx) for p in project_paths]
+    if workers == 1 or len(jobs) < _MIN_PROJECTS_FOR_POOL:
+        for job in jobs:
+            yield diagnose_project(job)
+        return
+    n_workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (n_workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            yield from pool.map(diagnose_project, jobs, chunksize=chunksize)
+            return
+        pending: Set[Future] = set()
+        for start in range(0, len(jobs), _STREAM_CHUNK):
+            pending.add(pool.submit(_diagnose_chunk, jobs[start : start + _STREAM_CHUNK]))
+            if len(pending) >= n_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield from fut.result()
+        for fut in as_completed(pending):
+            yield from fut.result()
+
+
+def summarize(results: Iterable[ProjectReport]) -> FleetSummary:
+    summary = FleetSummary()
+    for r in results:
+        summary.add(r)
+    return summary.sort_counts()
+
+
+def scan_projects(project_paths: List[Path], ctx: ScanContext, workers: Optional[int] = None) -> FleetReport:
+    results = list(iter_project_reports(project_paths, ctx, workers))
+    return FleetReport(
+        type="py_env_doctor_fleet_report",
+        generated_at=now_iso(),
+        python=ctx.python,
+        pip=ctx.pip,
+        projects=results,
+        summary=summarize(results),
+        installed=ctx.installed,
+    )
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import json
+import re
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .appdirs import user_data_dir
+from .model import Report
+
+# Local report history. Each recorded check is one row in `reports` (with the
+# compact JSON so it can be re-rendered later) plus normalized rows for its
+# issues, pip binaries and timing steps. Query columns are copied into the
+# child tables so trend queries are answered from (code|name, recorded_at)
+# indexes without touching the report rows.
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    generated_at TEXT NOT NULL,
+    project_path TEXT,
+    python_executable TEXT,
+    python_version TEXT,
+    environment_type TEXT,
+    issue_count INTEGER NOT NULL,
+    total_ms REAL,
+    report TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_recorded ON reports (recorded_at);
+CREATE INDEX IF NOT EXISTS reports_host_recorded ON reports (host, recorded_at, total_ms);
+CREATE TABLE IF NOT EXISTS issues (
+    report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+    host TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    code TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS issues_code_recorded ON issues (code, recorded_at, host, report_id);
+CREATE INDEX IF NOT EXISTS issues_report ON issues (report_id);
+CREATE TABLE IF NOT EXISTS pip_binaries (
+    report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    pip_version TEXT,
+    python_version TEXT
+);
+CREATE INDEX IF NOT EXISTS pip_binaries_report ON pip_binaries (report_id);
+CREATE TABLE IF NOT EXISTS timings (
+    report_id INTEGER NOT NULL REFERENCES reports (id) ON DELETE CASCADE,
+    host TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    name TEXT NOT NULL,
+    ms REAL NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timings_name_recorded ON timings (name, recorded_at, host, ms);
+CREATE INDEX IF NOT EXISTS timings_report ON timings (report_id);
+"""
+
+_SINCE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def default_history_path() -> Path:
+    return user_data_dir() / "history.sqlite3"
+
+
+def connect(path: Optional[Path] = None) -> sqlite3.Connection:
+    """Open (creating if needed) the history database at ``path``."""
+    path = Path(path) if path else default_history_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        conn.close()
+        raise sqlite3.DatabaseError(f"history database {path} has newer schema version {version}")
+    if version < SCHEMA_VERSION:
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    return conn
+
+
+def parse_since(value: str, now: Optional[float] = None) -> float:
+    """``7d``, ``12h``, ``30m``, ``2w`` or ``90s`` -> a unix timestamp that far back."""
+    m = _SINCE_RE.match(value)
+    if not m:
+        raise ValueError(f"invalid duration {value!r}; use e.g. 30m, 12h, 7d, 2w")
+    return (time.time() if now is None else now) - float(m.group(1)) * _UNITS[m.group(2)]
+
+
+def record(conn: sqlite3.Connection, report: Report, host: Optional[str] = None, now: Optional[float] = None) -> int:
+    """Store ``report`` and its issues, pip binaries and timings in one transaction; returns the report id."""
+    host = host or socket.gethostname()
+    now = time.time() if now is None else now
+    timings = report.timings
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO reports (host, recorded_at, generated_at, project_path, python_executable, python_version,"
+            " environment_type, issue_count, total_ms, report) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                host,
+                now,
+                report.generated_at,
+                report.project.path,
+                report.python.executable,
+                report.python.version,
+                report.python.environment_type,
+                len(report.issues),
+                timings.total_ms if timings is not None else None,
+                json.dumps(report.to_dict(), separators=(",", ":")),
+            ),
+        )
+        rid = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO issues (report_id, host, recorded_at, code, severity, details) VALUES (?, ?, ?, ?, ?, ?)",
+            [(rid, host, now, i.code, i.severity, i.details) for i in report.issues],
+        )
+        conn.executemany(
+            "INSERT INTO pip_binaries (report_id, name, path, pip_version, python_version) VALUES (?, ?, ?, ?, ?)",
+            [(rid, b.name, b.path, b.pip_version, b.python_version) for b in report.pip.binaries],
+        )
+        if timings is not None:
+            conn.executemany(
+                "INSERT INTO timings (report_id, host, recorded_at, name, ms, status) VALUES (?, ?, ?, ?, ?, ?)",
+                [(rid, host, now, s.name, s.ms, s.status) for s in timings.steps],
+            )
+    return int(rid)
+
+
+def _where(clauses: Sequence[Tuple[str, Any]]) -> Tuple[str, List[Any]]:
+    active = [(sql, v) for sql, v in clauses if v is not None]
+    if not active:
+        return "", []
+    return " WHERE " + " AND ".join(sql for sql, _ in active), [v for _, v in active]
+
+
+def issue_hosts(
+    conn: sqlite3.Connection, code: str, since: Optional[float] = None, host: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Hosts where ``code`` was reported, with how often and when first/last seen."""
+    where, params = _where([("code = ?", code), ("recorded_at >= ?", since), ("host = ?", host)])
+    rows = conn.execute(
+        "SELECT host, COUNT(DISTINCT report_id) AS reports, MIN(recorded_at) AS first_seen, MAX(recorded_at) AS last_seen"
+        f" FROM issues{where} GROUP BY host ORDER BY last_seen DESC",
+        params,
+    )
+    return [dict(r) for r in rows]
+
+
+def _percentile_sql(source: str, value: str, group: str) -> str:
+    # nearest-rank percentiles with window functions; SQLite has no percentile aggregate
+    return f"""
+        WITH ranked AS (
+            SELECT {group} AS grp, {value} AS v,
+                   ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY {value}) AS rn,
+                   COUNT(*) OVER (PARTITION BY {group}) AS n
+            FROM {source}
+        )
+        SELECT grp, n AS runs,
+               MIN(CASE WHEN rn >= 0.50 * n THEN v END) AS p50_ms,
+               MIN(CASE WHEN rn >= 0.95 * n THEN v END) AS p95_ms,
+               MAX(v) AS max_ms
+        FROM ranked GROUP BY grp ORDER BY p95_ms DESC
+    """
+
+
+def durations(
+    conn: sqlite3.Connection, since: Optional[float] = None, host: Optional[str] = None, step: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """p50/p95/max check duration per host, or of one timing ``step`` when given."""
+    if step:
+        where, params = _where([("name = ?", step), ("recorded_at >= ?", since), ("host = ?", host)])
+        source = f"(SELECT host, ms FROM timings{where})"
+        value = "ms"
+    else:
+        where, params = _where([("recorded_at >= ?", since), ("host = ?", host)])
+        source = f"(SELECT host, total_ms FROM reports{where}{' AND' if where else ' WHERE'} total_ms IS NOT NULL)"
+        value = "total_ms"
+    rows = conn.execute(_percentile_sql(source, value, "host"), params)
+    return [
+        {"host": r["grp"], "runs": r["runs"], "p50_ms": r["p50_ms"], "p95_ms": r["p95_ms"], "max_ms": r["max_ms"]}
+        for r in rows
+    ]
+
+
+def recent(
+    conn: sqlite3.Connection, since: Optional[float] = None, host: Optional[str] = None, limit: int = 20
+) -> List[Dict[str, Any]]:
+    where, params = _where([("recorded_at >= ?", since), ("host = ?", host)])
+    rows = conn.execute(
+        "SELECT id, host, recorded_at, generated_at, project_path, python_version, environment_type, issue_count, total_ms"
+        f" FROM reports{where} ORDER BY recorded_at DESC LIMIT ?",
+        params + [limit],
+    )
+    return [dict(r) for r in rows]
+
+
+def load_report(conn: sqlite3.Connection, report_id: int) -> Optional[Report]:
+    row = conn.execute("SELECT report FROM reports WHERE id = ?", (report_id,)).fetchone()
+    return Report.from_dict(json.loads(row["report"])) if row else None
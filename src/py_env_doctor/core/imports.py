@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import ast
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from importlib.machinery import BYTECODE_SUFFIXES, EXTENSION_SUFFIXES, SOURCE_SUFFIXES
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .detect_shadowing import _MODULE_RE, _norm, stdlib_module_names, walk_project
+from .model import ImportsInfo
+from .cancel import check_cancelled
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .installed import InstalledIndex
+
+# Import-resolution simulator: parse every project file for absolute imports,
+# then resolve each top-level name the way PathFinder would (builtins, then
+# sys.path in order, regular packages before modules before namespace
+# portions) against one listing per directory instead of calling find_spec.
+
+# Below this many files a process pool costs more than it saves.
+_MIN_FILES_FOR_POOL = 64
+# FileFinder's order within one directory: extension modules, source, bytecode
+_SUFFIXES = tuple(EXTENSION_SUFFIXES) + tuple(SOURCE_SUFFIXES) + tuple(BYTECODE_SUFFIXES)
+_IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError", "Exception", "BaseException"}
+_MAX_LOCATIONS = 3
+
+# (top-level name, line, guarded): guarded imports sit in a try/except ImportError,
+# an ``if TYPE_CHECKING:`` or a version/platform check and may legitimately fail
+ImportRef = Tuple[str, int, bool]
+
+
+def _catches_import_error(handler: ast.ExceptHandler) -> bool:
+    t = handler.type
+    if t is None:
+        return True
+    names = t.elts if isinstance(t, ast.Tuple) else [t]
+    return any(isinstance(n, ast.Name) and n.id in _IMPORT_ERRORS for n in names)
+
+
+def _is_conditional(test: ast.expr) -> bool:
+    """``if TYPE_CHECKING:`` and ``if sys.version_info ...``/``sys.platform ...`` branches."""
+    for node in ast.walk(test):
+        if isinstance(node, ast.Name) and node.id == "TYPE_CHECKING":
+            return True
+        if isinstance(node, ast.Attribute) and node.attr in ("TYPE_CHECKING", "version_info", "platform"):
+            return True
+    return False
+
+
+def _collect(body: List[ast.stmt], guarded: bool, found: List[ImportRef]) -> None:
+    # imports are statements: walk statement bodies only, never expressions
+    for node in body:
+        if isinstance(node, ast.Import):
+            found.extend((a.name.split(".", 1)[0], node.lineno, guarded) for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level == 0 and node.module:
+                found.append((node.module.split(".", 1)[0], node.lineno, guarded))
+        elif isinstance(node, ast.Try) or type(node).__name__ == "TryStar":
+            # the body and its fallbacks are both optional when ImportError is caught
+            catches = guarded or any(_catches_import_error(h) for h in node.handlers)  # type: ignore[attr-defined]
+            _collect(node.body, catches, found)  # type: ignore[attr-defined]
+            for h in node.handlers:  # type: ignore[attr-defined]
+                _collect(h.body, catches, found)
+            _collect(node.orelse + node.finalbody, guarded, found)  # type: ignore[attr-defined]
+        elif isinstance(node, ast.If):
+            _collect(node.body, guarded or _is_conditional(node.test), found)
+            _collect(node.orelse, guarded or _is_conditional(node.test), found)
+        else:
+            for name in ("body", "orelse", "finalbody"):
+                sub = getattr(node, name, None)
+                if isinstance(sub, list):
+                    _collect(sub, guarded, found)
+            for case in getattr(node, "cases", ()):
+                _collect(case.body, guarded, found)
+
+
+def parse_imports(path: str) -> Tuple[str, List[ImportRef], Optional[str]]:
+    """Absolute imports in one file; a top-level function so process pools can pickle it."""
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as exc:
+        return path, [], f"{type(exc).__name__}: {exc}"
+    found: List[ImportRef] = []
+    _collect(tree.body, False, found)
+    return path, found, None
+
+
+def _parse_chunk(paths: List[str]) -> List[Tuple[str, List[ImportRef], Optional[str]]]:
+    return [parse_imports(p) for p in paths]
+
+
+def _pool_context() -> Any:
+    # parse_all runs in a scheduler thread next to other detector threads, and
+    # forking a multi-threaded process can deadlock: start workers fresh instead
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def parse_all(paths: List[str], workers: Optional[int] = None) -> List[Tuple[str, List[ImportRef], Optional[str]]]:
+    if workers == 1 or len(paths) < _MIN_FILES_FOR_POOL:
+        return _parse_chunk(paths)
+    n_workers = workers or os.cpu_count() or 1
+    size = max(16, len(paths) // (n_workers * 4))
+    chunks = [paths[i : i + size] for i in range(0, len(paths), size)]
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+    results: List[Tuple[str, List[ImportRef], Optional[str]]] = []
+    try:
+        for chunk in pool.map(_parse_chunk, chunks):
+            check_cancelled()
+            results.extend(chunk)
+    finally:
+        # once cancelled, chunks not yet started are dropped instead of parsed
+        pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+@dataclass
+class _Listing:
+    files: Dict[str, str] = field(default_factory=dict)  # module name -> file
+    dirs: Set[str] = field(default_factory=set)
+
+
+class PathResolver:
+    """Resolve top-level module names along a ``sys.path``, listing each directory once."""
+
+    def __init__(self, path: Sequence[str], builtins: Iterable[str] = ()) -> None:
+        self.path = [p for p in path if p]
+        self.builtins = frozenset(builtins)
+        self._listings: Dict[str, _Listing] = {}
+
+    def _listing(self, directory: str) -> _Listing:
+        listing = self._listings.get(directory)
+        if listing is not None:
+            return listing
+        listing = _Listing()
+        rank: Dict[str, int] = {}
+        try:
+            with os.scandir(directory) as it:
+                for e in it:
+                    try:
+                        if e.is_dir():
+                            listing.dirs.add(e.name)
+                            continue
+                    except OSError:
+                        continue
+                    for i, suffix in enumerate(_SUFFIXES):
+                        if e.name.endswith(suffix):
+                            name = e.name[: -len(suffix)]
+                            if i < rank.get(name, len(_SUFFIXES)):
+                                rank[name] = i
+                                listing.files[name] = e.path
+                            break
+        except OSError:
+            pass
+        self._listings[directory] = listing
+        return listing
+
+    def resolve(self, name: str, first: Sequence[str] = ()) -> Tuple[str, Optional[str]]:
+        """``(kind, location)``: kind is builtin, package, module, namespace or missing."""
+        if name in self.builtins:
+            return "builtin", None
+        namespace = None
+        for directory in list(first) + self.path:
+            listing = self._listing(directory)
+            if name in listing.dirs:
+                init = self._listing(os.path.join(directory, name)).files.get("__init__")
+                if init is not None:
+                    return "package", init
+            if name in listing.files:
+                return "module", listing.files[name]
+            if namespace is None and name in listing.dirs:
+                namespace = os.path.join(directory, name)
+        if namespace is not None:
+            return "namespace", namespace
+        return "missing", None
+
+
+def _within(path: str, dirs: Iterable[str]) -> bool:
+    path = os.path.normcase(os.path.abspath(path))
+    for d in dirs:
+        d = os.path.normcase(os.path.abspath(d))
+        if path == d or path.startswith(d.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+def _script_root(directory: str, packages: Set[str]) -> str:
+    # a file is importable from the nearest ancestor that is not itself a package
+    while directory in packages:
+        directory = os.path.dirname(directory)
+    return directory
+
+
+def resolve_imports(
+    project_path: Path,
+    project_name: Optional[str],
+    sys_path: Sequence[str],
+    installed: Optional["InstalledIndex"] = None,
+    builtins: Iterable[str] = (),
+    stdlib: Optional[FrozenSet[str]] = None,
+    stdlib_dirs: Sequence[str] = (),
+    workers: Optional[int] = None,
+) -> Tuple[ImportsInfo, List[str]]:
+    """Resolve every absolute import in the project.
+
+    Returns the summary and the paths a re-check must stat: the directories
+    listed, the ``.gitignore`` files read and the files parsed.
+
+    Each file's imports are resolved against its script root (its directory,
+    or the directory holding its top-level package) followed by ``sys_path``.
+    An import is *unresolved* when nothing provides it and it is not guarded
+    by ``try/except ImportError`` or ``TYPE_CHECKING``, and *shadowed* when a
+    stdlib or installed name loads from somewhere other than where that
+    module lives.
+    """
+    root = os.path.abspath(str(project_path))
+    stdlib = stdlib_module_names() if stdlib is None else stdlib
+    files: List[str] = []
+    listed: List[str] = []
+    packages: Set[str] = set()
+    for path, _, _, entries in walk_project(Path(root), listed):
+        if any(e.name == "__init__.py" for e in entries):
+            packages.add(path)
+        files.extend(e.path for e in entries if e.name.endswith(".py"))
+    files.sort()
+
+    by_module = installed.by_module if installed is not None else {}
+    pn = _norm(project_name)
+    own = {pn} if pn else set()
+    own_dist = installed.get(project_name) if installed is not None and project_name else None
+    if own_dist is not None:
+        own.update(own_dist.top_level)
+
+    resolver = PathResolver(sys_path, builtins)
+    cache: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {}
+    unresolved: Dict[str, List[str]] = {}
+    shadowed: Dict[str, Tuple[str, str, List[str]]] = {}
+    errors: List[str] = []
+    seen: Set[str] = set()
+
+    for path, refs, error in parse_all(files, workers):
+        check_cancelled()
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        if error:
+            errors.append(f"{rel}: {error}")
+            continue
+        script_root = _script_root(os.path.dirname(path), packages)
+        for name, line, guarded in refs:
+            if not _MODULE_RE.match(name) or name == "__future__":
+                continue
+            seen.add(name)
+            key = (script_root, name)
+            hit = cache.get(key)
+            if hit is None:
+                hit = cache[key] = resolver.resolve(name, (script_root,))
+            kind, location = hit
+            where = f"{rel}:{line}"
+            if kind == "missing":
+                # the project itself is covered by PROJECT_NOT_IMPORTABLE; installed names may use import hooks
+                if not guarded and name not in own and name not in by_module:
+                    unresolved.setdefault(name, []).append(where)
+                continue
+            if location is None:
+                continue
+            expected = None
+            if name in stdlib:
+                if stdlib_dirs and not _within(location, stdlib_dirs):
+                    expected = "the standard library"
+            elif name in by_module and name not in own:
+                site_dirs = {d.site_dir for d in by_module[name]}
+                if not _within(location, site_dirs):
+                    expected = f"{by_module[name][0].name} in {sorted(site_dirs)[0]}"
+            if expected:
+                shown = os.path.relpath(location, root).replace(os.sep, "/") if _within(location, [root]) else location
+                shadowed.setdefault(name, (shown, expected, []))[2].append(where)
+
+    def _locations(refs: List[str]) -> str:
+        more = f", +{len(refs) - _MAX_LOCATIONS} more" if len(refs) > _MAX_LOCATIONS else ""
+        return ", ".join(refs[:_MAX_LOCATIONS]) + more
+
+    info = ImportsInfo(
+        files=len(files),
+        modules=len(seen),
+        unresolved=[f"{name} ({_locations(refs)})" for name, refs in sorted(unresolved.items())],
+        shadowed=[
+            f"{name} -> {location}, expected {expected} ({_locations(refs)})"
+            for name, (location, expected, refs) in sorted(shadowed.items())
+        ],
+        parse_errors=errors,
+    )
+    return info, listed + files
+
+
+def _stdlib_dirs(
+    sysconfig_paths: Dict[str, str], sys_path: Sequence[str], base_prefix: Optional[str], site_dirs: Sequence[str]
+) -> List[str]:
+    dirs = list(dict.fromkeys(sysconfig_paths[k] for k in ("stdlib", "platstdlib") if sysconfig_paths.get(k)))
+    if not base_prefix:
+        return dirs
+    # stdlib also loads from entries outside Lib, e.g. extension modules in
+    # <prefix>\DLLs on Windows: whatever sits under base_prefix before site-packages
+    for p in sys_path:
+        if _within(p, site_dirs):
+            break
+        if p not in dirs and _within(p, [base_prefix]):
+            dirs.append(p)
+    return dirs
+
+
+def interpreter_context(probe: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """``sys_path``, ``builtins``, ``stdlib`` names and ``stdlib_dirs`` of the target interpreter.
+
+    Taken from a ``--python`` probe reply when given, else from the running
+    interpreter. The running interpreter's ``sys.path[0]`` is dropped: it is
+    the directory of whatever script started it, not part of the environment.
+    The probe already removed its own empty ``-c`` entry.
+    """
+    if probe is not None:
+        names = probe.get("stdlib_module_names")
+        sys_path = [p for p in probe.get("sys_path") or [] if p]
+        return {
+            "sys_path": sys_path,
+            "builtins": probe.get("builtin_module_names") or [],
+            "stdlib": frozenset(names) if names else None,
+            "stdlib_dirs": _stdlib_dirs(
+                probe.get("sysconfig_paths") or {}, sys_path, probe.get("base_prefix"), probe.get("site_dirs") or []
+            ),
+        }
+    import sysconfig
+
+    from .detect_pep668 import _candidate_site_dirs
+
+    sys_path = [p for p in sys.path[1:] if p]
+    return {
+        "sys_path": sys_path,
+        "builtins": sys.builtin_module_names,
+        "stdlib": None,
+        "stdlib_dirs": _stdlib_dirs(sysconfig.get_paths(), sys_path, sys.base_prefix, _candidate_site_dirs()),
+    }
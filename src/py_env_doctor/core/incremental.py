@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .appdirs import user_cache_dir
+from .installed import InstalledDist, InstalledIndex
+from .model import DependencyInfo, ImportsInfo, PipInfo, ProjectInfo, PythonInfo, to_plain
+from .pathindex import PathEntry, PathIndex
+from .registry import OK, REUSED, Detector, downstream
+
+# State for `check --incremental`: the outputs of each built-in detector plus a
+# fingerprint of what it read. Fingerprints avoid inode numbers and use content
+# hashes for project files, so a state file restored by a CI cache onto a
+# fresh checkout still matches.
+
+STATE_FORMAT = 2
+_PYTHON_ENV_VARS = ("VIRTUAL_ENV", "CONDA_PREFIX", "CONDA_DEFAULT_ENV", "PYENV_VERSION", "PYTHONPATH")
+
+
+def _stat_key(path: Optional[str]) -> List[Any]:
+    if not path:
+        return [None, None, None]
+    try:
+        st = os.stat(path)
+    except OSError:
+        return [path, None, None]
+    return [path, st.st_size, st.st_mtime_ns]
+
+
+def _file_sha(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _detector_inputs(name: str, project_path: Path, options: Any, facts: Dict[str, Any]) -> Optional[Any]:
+    """What detector ``name`` read, as a JSON-able value; None when it cannot be described."""
+    project = str(Path(project_path).resolve())
+    pyproject = os.path.join(project, "pyproject.toml")
+    py = facts.get("python")
+    site_dirs = list(py.site_dirs) if py is not None else []
+    sites = [_stat_key(d) for d in site_dirs]
+    if name == "python":
+        exe = options.target_python or sys.executable
+        markers = []
+        for d in site_dirs:
+            markers.append(os.path.isfile(os.path.join(d, "EXTERNALLY-MANAGED")))
+            markers.append(os.path.isfile(os.path.join(os.path.dirname(d), "EXTERNALLY-MANAGED")))
+        value = [_stat_key(exe), [os.environ.get(k) for k in _PYTHON_ENV_VARS], sites, markers]
+        if py is not None and py.prefix:
+            value.append(_stat_key(os.path.join(py.prefix, "pyvenv.cfg")))
+        if options.target_python:
+            value.append(_file_sha(pyproject))  # the probe also answers find_spec for the project
+        return value
+    if name == "path_index":
+        path = os.environ.get("PATH", "")
+        return [path, [_stat_key(d) for d in path.split(os.pathsep) if d]]
+    if name == "pip":
+        pip = facts.get("pip")
+        binaries = [_stat_key(b.path) for b in pip.binaries] if pip is not None else []
+        return [binaries, options.pip_probe]
+    if name in ("project_name", "dependencies"):
+        return _file_sha(pyproject)
+    if name == "project":
+        return [_file_sha(pyproject), sites]
+    if name == "shadowing":
+        # every directory the walk listed plus the .gitignore files it read
+        return [_stat_key(p) for p in facts.get("shadowing_paths") or [project]]
+    if name == "imports":
+        # the project walk plus every site directory resolution looked in
+        return [[_stat_key(p) for p in facts.get("imports_paths") or [project]], sites]
+    if name == "installed":
+        return sites
+    return None
+
+
+def fingerprint(name: str, project_path: Path, options: Any, facts: Dict[str, Any]) -> Optional[str]:
+    value = _detector_inputs(name, project_path, options, facts)
+    return None if value is None else _digest(value)
+
+
+def _identity(v: Any) -> Any:
+    return v
+
+
+def _dump_path_index(ix: PathIndex) -> Dict[str, Any]:
+    return {"dirs": ix.dirs, "entries": [[e.name, e.path, e.dir_index] for e in ix.entries]}
+
+
+def _load_path_index(d: Dict[str, Any]) -> PathIndex:
+    return PathIndex([PathEntry(*e) for e in d["entries"]], list(d["dirs"]))
+
+
+def _dump_installed(ix: InstalledIndex) -> Dict[str, Any]:
+    return {"site_dirs": ix.site_dirs, "dists": [[d.name, d.version, d.path, d.site_dir] for d in ix.dists]}
+
+
+def _load_installed(d: Dict[str, Any]) -> InstalledIndex:
+    return InstalledIndex([InstalledDist(*row) for row in d["dists"]], list(d["site_dirs"]))
+
+
+_CODECS: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "python": (to_plain, PythonInfo.from_dict),
+    "probe": (_identity, _identity),
+    "path_index": (_dump_path_index, _load_path_index),
+    "pip": (to_plain, PipInfo.from_dict),
+    "project_name": (_identity, _identity),
+    "project": (to_plain, ProjectInfo.from_dict),
+    "shadowing": (list, list),
+    "shadowing_paths": (list, list),
+    "imports": (to_plain, ImportsInfo.from_dict),
+    "imports_paths": (list, list),
+    "installed_index": (_dump_installed, _load_installed),
+    "dependencies": (to_plain, lambda d: DependencyInfo.from_dict(d) if d is not None else None),
+}
+
+
+def state_key(project_path: Path, options: Any) -> List[Any]:
+    from .. import __version__
+
+    return [STATE_FORMAT, __version__, str(Path(project_path).resolve()), options.target_python, options.pip_probe]
+
+
+def default_state_path(key: List[Any]) -> Path:
+    return user_cache_dir() / "state" / f"{_digest(key)[:32]}.json"
+
+
+def load_state(path: Path, key: List[Any]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("key") != json.loads(json.dumps(key)):
+        return None
+    return state
+
+
+def reusable(
+    state: Optional[Dict[str, Any]],
+    detectors: Sequence[Detector],
+    project_path: Path,
+    options: Any,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Saved outputs and fingerprints of the detectors whose inputs did not change.
+
+    Fingerprints are computed against the saved facts (the site directories and
+    pip binaries of the last run); a detector is reused only when everything
+    upstream of it is reused too.
+    """
+    if not state:
+        return {}, {}
+    try:
+        saved = {out: _CODECS[out][1](v) for out, v in state.get("facts", {}).items() if out in _CODECS}
+    except Exception:
+        return {}, {}
+    saved_fps = state.get("fingerprints", {})
+    matching = set()
+    current: Dict[str, str] = {}
+    for d in detectors:
+        if not d.outputs or any(out not in saved for out in d.outputs):
+            continue
+        fp = fingerprint(d.name, project_path, options, saved)
+        if fp is not None and fp == saved_fps.get(d.name):
+            matching.add(d.name)
+            current[d.name] = fp
+    rerun = downstream(detectors, {d.name for d in detectors} - matching)
+    facts: Dict[str, Any] = {}
+    fps: Dict[str, str] = {}
+    for d in detectors:
+        if d.name not in rerun:
+            for out in d.outputs:
+                facts[out] = saved[out]
+            fps[d.name] = current[d.name]
+    return facts, fps
+
+
+def save_state(
+    path: Path,
+    key: List[Any],
+    detectors: Sequence[Detector],
+    status: Dict[str, str],
+    facts: Dict[str, Any],
+    fingerprints: Dict[str, str],
+    project_path: Path,
+    options: Any,
+) -> None:
+    """Write outputs and fingerprints of every detector that succeeded; failures are rerun next time."""
+    out_facts: Dict[str, Any] = {}
+    out_fps: Dict[str, str] = {}
+    for d in detectors:
+        if status.get(d.name) not in (OK, REUSED) or any(o not in _CODECS or o not in facts for o in d.outputs):
+            continue
+        fp = fingerprints.get(d.name) or fingerprint(d.name, project_path, options, facts)
+        if fp is None:
+            continue
+        for o in d.outputs:
+            out_facts[o] = _CODECS[o][0](facts[o])
+        out_fps[d.name] = fp
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "fingerprints": out_fps, "facts": out_facts}, f)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    except (OSError, TypeError, ValueError):
+        return
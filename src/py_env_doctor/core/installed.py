@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .detect_pep668 import _candidate_site_dirs
+from .model import InstalledInfo
+
+# Scans site directories directly instead of going through importlib.metadata,
+# which builds a Distribution object (and parses full metadata) per entry.
+
+_HEADER_READ_BYTES = 4096
+_CANON_RE = re.compile(r"[-_.]+")
+_RECORD_SKIP_SUFFIXES = (".dist-info", ".egg-info", ".data", ".pth")
+
+
+def canonicalize_name(name: str) -> str:
+    """PEP 503 normalized distribution name."""
+    return _CANON_RE.sub("-", name).lower()
+
+
+@dataclass
+class InstalledDist:
+    name: str
+    version: Optional[str]
+    path: str
+    site_dir: str
+    _top_level: Optional[Tuple[str, ...]] = field(default=None, repr=False)
+
+    @property
+    def key(self) -> str:
+        return canonicalize_name(self.name)
+
+    @property
+    def top_level(self) -> Tuple[str, ...]:
+        """Top-level import names, from top_level.txt or else the RECORD file list."""
+        if self._top_level is None:
+            self._top_level = _read_top_level(self.path)
+        return self._top_level
+
+
+def _read_headers(path: str) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_HEADER_READ_BYTES)
+    except OSError:
+        return None, None
+    name = version = None
+    for raw in head.split(b"\n"):
+        line = raw.strip(b"\r")
+        if not line:
+            break  # headers end at the first blank line
+        if line[:5].lower() == b"name:":
+            name = line[5:].strip().decode("utf-8", "replace")
+        elif line[:8].lower() == b"version:":
+            version = line[8:].strip().decode("utf-8", "replace")
+        if name and version:
+            break
+    return name, version
+
+
+def _module_from_record_path(rel: str) -> Optional[str]:
+    first = rel.replace("\\", "/").split("/", 1)
+    head = first[0]
+    if not head or head.startswith(".") or head == "__pycache__" or head.endswith(_RECORD_SKIP_SUFFIXES):
+        return None
+    if len(first) > 1:
+        return head if head.isidentifier() else None
+    # single file at the site root: foo.py, foo.cpython-312-x86_64-linux-gnu.so, foo.pyd
+    stem = head.split(".", 1)[0]
+    if head.endswith((".py", ".so", ".pyd")) and stem.isidentifier():
+        return stem
+    return None
+
+
+def _read_top_level(meta_dir: str) -> Tuple[str, ...]:
+    if not os.path.isdir(meta_dir):
+        return ()
+    try:
+        with open(os.path.join(meta_dir, "top_level.txt"), "r", encoding="utf-8", errors="replace") as f:
+            names = [line.strip().replace("/", ".").split(".", 1)[0] for line in f]
+        return tuple(sorted({n for n in names if n}))
+    except OSError:
+        pass
+    mods = set()
+    for fname in ("RECORD", "installed-files.txt"):
+        try:
+            with open(os.path.join(meta_dir, fname), "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    rel = line.split(",", 1)[0].strip().strip('"')
+                    mod = _module_from_record_path(rel)
+                    if mod:
+                        mods.add(mod)
+            break
+        except OSError:
+            continue
+    return tuple(sorted(mods))
+
+
+def _scan_site_dir(site_dir: str) -> List[InstalledDist]:
+    out: List[InstalledDist] = []
+    try:
+        with os.scandir(site_dir) as it:
+            entries = [(e.name, e.path, e.is_dir()) for e in it if e.name.endswith((".dist-info", ".egg-info"))]
+    except OSError:
+        return out
+    entries.sort()
+    for name, path, is_dir in entries:
+        if name.endswith(".dist-info"):
+            meta = os.path.join(path, "METADATA")
+        elif is_dir:
+            meta = os.path.join(path, "PKG-INFO")
+        else:
+            meta = path  # legacy single-file egg-info
+        dist_name, version = _read_headers(meta)
+        if not dist_name:
+            # fall back to the directory name: name-version.dist-info
+            stem = name.rsplit(".", 1)[0]
+            dist_name, _, guessed = stem.partition("-")
+            version = version or (guessed.split("-", 1)[0] or None)
+        out.append(InstalledDist(name=dist_name, version=version, path=path, site_dir=site_dir))
+    return out
+
+
+class InstalledIndex:
+    """Installed distributions of one interpreter with O(1) lookups.
+
+    ``site_dirs`` must be in ``sys.path`` order (user site first, as
+    ``_candidate_site_dirs`` and the probe list them), so lookups by
+    distribution name return the entry that wins on ``sys.path``
+    (first site directory); the module index is built on first use because it
+    needs one extra file read per distribution.
+    """
+
+    def __init__(self, dists: List[InstalledDist], site_dirs: List[str]) -> None:
+        self.dists = dists
+        self.site_dirs = site_dirs
+        self.by_name: Dict[str, InstalledDist] = {}
+        self._all_by_name: Dict[str, List[InstalledDist]] = {}
+        for d in dists:
+            self._all_by_name.setdefault(d.key, []).append(d)
+            self.by_name.setdefault(d.key, d)
+        self._by_module: Optional[Dict[str, List[InstalledDist]]] = None
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def __contains__(self, name: str) -> bool:
+        return canonicalize_name(name) in self.by_name
+
+    def get(self, name: str) -> Optional[InstalledDist]:
+        return self.by_name.get(canonicalize_name(name))
+
+    def version(self, name: str) -> Optional[str]:
+        d = self.get(name)
+        return d.version if d else None
+
+    def versions(self) -> Dict[str, Optional[str]]:
+        """Canonical name -> version of the winning distribution."""
+        return {k: d.version for k, d in self.by_name.items()}
+
+    @property
+    def by_module(self) -> Dict[str, List[InstalledDist]]:
+        if self._by_module is None:
+            idx: Dict[str, List[InstalledDist]] = {}
+            for d in self.dists:
+                for mod in d.top_level:
+                    idx.setdefault(mod, []).append(d)
+            self._by_module = idx
+        return self._by_module
+
+    def providers(self, module: str) -> List[InstalledDist]:
+        return self.by_module.get(module.split(".", 1)[0], [])
+
+    def conflicts(self) -> Dict[str, List[InstalledDist]]:
+        """Names with several metadata directories in the same site directory (broken upgrades)."""
+        out = {}
+        for key, ds in self._all_by_name.items():
+            if len(ds) > 1 and len({d.site_dir for d in ds}) < len(ds):
+                out[key] = ds
+        return out
+
+    def shadowed(self) -> Dict[str, List[InstalledDist]]:
+        """Names installed in more than one site directory; the first one wins."""
+        out = {}
+        for key, ds in self._all_by_name.items():
+            if len({d.site_dir for d in ds}) > 1:
+                out[key] = ds
+        return out
+
+
+def build_installed_index(site_dirs: Optional[Iterable[str]] = None) -> InstalledIndex:
+    dirs = list(site_dirs) if site_dirs is not None else _candidate_site_dirs()
+    dists: List[InstalledDist] = []
+    for d in dirs:
+        dists.extend(_scan_site_dir(d))
+    return InstalledIndex(dists, dirs)
+
+
+def _describe(ds: List[InstalledDist]) -> str:
+    versions = ", ".join(f"{d.version or '?'} in {d.site_dir}" for d in ds)
+    return f"{ds[0].name} ({versions})"
+
+
+def summarize_installed(index: InstalledIndex) -> InstalledInfo:
+    return InstalledInfo(
+        site_dirs=list(index.site_dirs),
+        distributions=len(index),
+        conflicts=[_describe(ds) for _, ds in sorted(index.conflicts().items())],
+        shadowed=[_describe(ds) for _, ds in sorted(index.shadowed().items())],
+    )
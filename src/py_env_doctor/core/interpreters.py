@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .defaults import INTERPRETER_WORKERS, PROBE_TIMEOUT
+from .detect_python import python_info_from_probe
+from .pathindex import PYTHON_NAME_RE, build_path_index
+from .model import InterpreterEntry, InterpreterReport, now_iso
+from .probe import ProbeError, run_probe
+
+_CONDA_HOMES = ("miniconda3", "anaconda3", "miniforge3", "mambaforge", "micromamba", ".conda")
+
+
+def _env_python(root: Path) -> Optional[Path]:
+    for rel in (("bin", "python"), ("Scripts", "python.exe"), ("python.exe",)):
+        p = root.joinpath(*rel)
+        if p.is_file():
+            return p
+    return None
+
+
+def _pyenv_root() -> Path:
+    return Path(os.environ.get("PYENV_ROOT") or "~/.pyenv").expanduser()
+
+
+def _path_candidates() -> List[str]:
+    # pyenv shims only re-dispatch to versions we enumerate directly
+    shims = os.path.normcase(str(_pyenv_root() / "shims"))
+    index = build_path_index((PYTHON_NAME_RE,))
+    return [
+        e.path
+        for e in index.matching(PYTHON_NAME_RE)
+        if os.path.normcase(os.path.abspath(index.dirs[e.dir_index])) != shims
+    ]
+
+
+def _pyenv_candidates() -> List[str]:
+    root = _pyenv_root() / "versions"
+    out: List[str] = []
+    try:
+        versions = sorted(root.iterdir())
+    except OSError:
+        return out
+    for v in versions:
+        p = _env_python(v)
+        if p:
+            out.append(str(p))
+    return out
+
+
+def _conda_bases() -> List[Path]:
+    bases: List[Path] = []
+    conda_exe = os.environ.get("CONDA_EXE")
+    if conda_exe:
+        bases.append(Path(conda_exe).parent.parent)
+    for var in ("CONDA_PREFIX", "CONDA_ROOT", "MAMBA_ROOT_PREFIX"):
+        v = os.environ.get(var)
+        if v:
+            bases.append(Path(v))
+    home = Path("~").expanduser()
+    bases.extend(home / name for name in _CONDA_HOMES)
+    return bases
+
+
+def _conda_candidates() -> List[str]:
+    out: List[str] = []
+    envs: List[Path] = []
+    for base in _conda_bases():
+        envs.append(base)
+        try:
+            envs.extend(sorted(p for p in (base / "envs").iterdir() if p.is_dir()))
+        except OSError:
+            pass
+    # environments created with -p are only listed here
+    try:
+        listed = Path("~/.conda/environments.txt").expanduser().read_text(encoding="utf-8").splitlines()
+    except OSError:
+        listed = []
+    envs.extend(Path(line.strip()) for line in listed if line.strip())
+    for env in envs:
+        p = _env_python(env)
+        if p:
+            out.append(str(p))
+    return out
+
+
+def _root_candidates(roots: Iterable[str]) -> List[str]:
+    # a root is an environment itself or a directory of environments/projects with .venv
+    out: List[str] = []
+    for r in roots:
+        root = Path(r).expanduser()
+        p = _env_python(root)
+        if p:
+            out.append(str(p))
+        try:
+            children = sorted(c for c in root.iterdir() if c.is_dir())
+        except OSError:
+            continue
+        for child in children:
+            for env in (child, child / ".venv", child / "venv"):
+                p = _env_python(env)
+                if p:
+                    out.append(str(p))
+    return out
+
+
+def discover_interpreters(roots: Iterable[str] = (), include_path: bool = True) -> List[str]:
+    """Candidate interpreter executables from PATH, pyenv, conda and the given roots.
+
+    Entries that are the same file in the same directory (python3 -> python3.12)
+    are collapsed; a venv's python symlinked to its base interpreter is kept,
+    since it lives in a different environment.
+    """
+    candidates: List[str] = []
+    if include_path:
+        candidates += _path_candidates()
+    candidates += _pyenv_candidates()
+    candidates += _conda_candidates()
+    candidates += _root_candidates(roots)
+
+    out: List[str] = []
+    seen = set()
+    for c in candidates:
+        path = os.path.abspath(c)
+        try:
+            key = (os.path.normcase(os.path.dirname(path)), os.path.normcase(os.path.realpath(path)))
+        except OSError:
+            key = (os.path.normcase(path), "")
+        if key not in seen:
+            seen.add(key)
+            out.append(path)
+    return out
+
+
+def _probe_entry(path: str, timeout: Optional[float]) -> InterpreterEntry:
+    try:
+        data = run_probe(path, timeout=timeout)
+    except ProbeError as exc:
+        return InterpreterEntry(path=path, error=str(exc), timed_out=exc.timed_out)
+    return InterpreterEntry(path=path, python=python_info_from_probe(data), prefix=data.get("prefix"))
+
+
+def iter_interpreter_entries(
+    paths: List[str],
+    timeout: Optional[float] = PROBE_TIMEOUT,
+    max_workers: int = INTERPRETER_WORKERS,
+) -> Iterator[Tuple[int, InterpreterEntry]]:
+    """Probe interpreters concurrently, yielding ``(index, entry)`` as each probe finishes."""
+    if not paths:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths))), thread_name_prefix="interp-probe") as pool:
+        futures = {pool.submit(_probe_entry, p, timeout): idx for idx, p in enumerate(paths)}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
+def mark_duplicates(entries: Iterable[InterpreterEntry]) -> Iterator[Tuple[InterpreterEntry, Optional[str]]]:
+    """Pair each entry with the path of an earlier entry for the same environment, if any.
+
+    Shims and aliases that land in an environment already seen are duplicates.
+    """
+    first: Dict[Tuple[str, str], str] = {}
+    for e in entries:
+        if e.python is None:
+            yield e, None
+            continue
+        key = (os.path.normcase(e.prefix or ""), e.python.version)
+        if key in first:
+            yield e, first[key]
+        else:
+            first[key] = e.path
+            yield e, None
+
+
+def _collapse_duplicates(entries: List[InterpreterEntry]) -> List[InterpreterEntry]:
+    out: List[InterpreterEntry] = []
+    by_path: Dict[str, InterpreterEntry] = {}
+    for e, duplicate_of in mark_duplicates(entries):
+        if duplicate_of is None:
+            by_path[e.path] = e
+            out.append(e)
+        else:
+            by_path[duplicate_of].duplicates.append(e.path)
+    return out
+
+
+def diagnose_interpreters(
+    roots: Iterable[str] = (),
+    include_path: bool = True,
+    timeout: Optional[float] = PROBE_TIMEOUT,
+    max_workers: int = INTERPRETER_WORKERS,
+) -> InterpreterReport:
+    paths = discover_interpreters(roots, include_path)
+    entries: List[Optional[InterpreterEntry]] = [None] * len(paths)
+    for idx, entry in iter_interpreter_entries(paths, timeout, max_workers):
+        entries[idx] = entry
+    return InterpreterReport(
+        type="py_env_doctor_interpreter_report",
+        generated_at=now_iso(),
+        interpreters=_collapse_duplicates([e for e in entries if e is not None]),
+    )
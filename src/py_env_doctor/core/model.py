@@ -1,21 +1,48 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
-from typing import List, Optional, Literal, Dict, Any
+import sys
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Literal, Dict, Any, Tuple
 from datetime import datetime, timezone
 
 EnvironmentType = Literal["system", "venv", "conda", "pyenv", "unknown"]
 Severity = Literal["info", "warning", "error"]
 
+# Report objects are held by the thousand in fleet scans and history, so they
+# use __slots__ where dataclasses supports it (3.10+) and serialize through
+# to_plain() instead of dataclasses.asdict, which deep-copies everything.
+_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+_FIELDS: Dict[type, Tuple[str, ...]] = {}
 
-@dataclass
+
+def _model(cls):
+    cls = _dataclass(cls)
+    _FIELDS[cls] = tuple(f.name for f in fields(cls))
+    return cls
+
+
+def to_plain(value: Any) -> Any:
+    """JSON-ready form of a model object without copying leaf values.
+
+    Lists of strings and plain dicts are shared with the model rather than
+    copied, so treat the result as read-only.
+    """
+    names = _FIELDS.get(type(value))
+    if names is not None:
+        return {n: to_plain(getattr(value, n)) for n in names}
+    if type(value) is list and value and type(value[0]) in _FIELDS:
+        return [to_plain(v) for v in value]
+    return value
+
+
+@_model
 class PlatformInfo:
     system: str
     release: str
     distro: Optional[str] = None
 
 
-@dataclass
+@_model
 class PythonInfo:
     executable: str
     version: str
@@ -26,46 +53,178 @@ class PythonInfo:
     is_pyenv: bool
     pep668_externally_managed: bool
     platform: PlatformInfo
+    prefix: Optional[str] = None
+    base_prefix: Optional[str] = None
+    site_dirs: List[str] = field(default_factory=list)
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PythonInfo":
+        fields = dict(d)
+        fields["platform"] = PlatformInfo(**fields["platform"])
+        return cls(**fields)
 
-@dataclass
+
+@_model
 class PipBinary:
     name: str
     path: str
     pip_version: Optional[str] = None
     python_version: Optional[str] = None
     shebang_python: Optional[str] = None
+    timed_out: bool = False
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PipBinary":
+        return cls(**d)
 
 
-@dataclass
+@_model
 class PipInfo:
     binaries: List[PipBinary] = field(default_factory=list)
     mismatches: List[str] = field(default_factory=list)
+    path_shadowed: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PipInfo":
+        fields = dict(d)
+        fields["binaries"] = [PipBinary.from_dict(b) for b in fields.get("binaries", [])]
+        return cls(**fields)
+
+
+@_model
+class DependencyInfo:
+    checked: int = 0
+    missing: List[str] = field(default_factory=list)
+    missing_optional: List[str] = field(default_factory=list)
+    mismatched: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    invalid: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "DependencyInfo":
+        return cls(**d)
+
+
+@_model
+class ImportsInfo:
+    files: int = 0
+    modules: int = 0
+    unresolved: List[str] = field(default_factory=list)
+    shadowed: List[str] = field(default_factory=list)
+    parse_errors: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ImportsInfo":
+        return cls(**d)
 
 
-@dataclass
+@_model
 class ProjectInfo:
     path: str
     pyproject: bool
     project_name: Optional[str] = None
     package_importable: Optional[bool] = None
     shadowing: List[str] = field(default_factory=list)
+    dependencies: Optional[DependencyInfo] = None
+    imports: Optional[ImportsInfo] = None
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ProjectInfo":
+        fields = dict(d)
+        if fields.get("dependencies") is not None:
+            fields["dependencies"] = DependencyInfo.from_dict(fields["dependencies"])
+        if fields.get("imports") is not None:
+            fields["imports"] = ImportsInfo.from_dict(fields["imports"])
+        return cls(**fields)
 
-@dataclass
+
+@_model
+class VerifyInfo:
+    dists: int = 0
+    files: int = 0
+    hashed: int = 0
+    missing: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    extra: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "VerifyInfo":
+        return cls(**d)
+
+
+@_model
+class InstalledInfo:
+    site_dirs: List[str] = field(default_factory=list)
+    distributions: int = 0
+    conflicts: List[str] = field(default_factory=list)
+    shadowed: List[str] = field(default_factory=list)
+    verify: Optional[VerifyInfo] = None
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "InstalledInfo":
+        fields = dict(d)
+        if fields.get("verify") is not None:
+            fields["verify"] = VerifyInfo.from_dict(fields["verify"])
+        return cls(**fields)
+
+
+@_model
+class StartupInfo:
+    import_name: Optional[str] = None
+    pth_files: int = 0
+    pth_exec: List[str] = field(default_factory=list)
+    bare_ms: float = 0.0
+    total_ms: float = 0.0
+    overhead_ms: float = 0.0
+    imports_ms: float = 0.0
+    project_ms: Optional[float] = None
+    slowest: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "StartupInfo":
+        return cls(**d)
+
+
+@_model
 class Issue:
     code: str
     severity: Severity
     details: Optional[str] = None
 
 
-@dataclass
+@_model
 class AdviceItem:
     title: str
     steps: List[str]
 
 
-@dataclass
+@_model
+class TimingEntry:
+    name: str
+    ms: float
+    status: str = "ok"
+    subprocesses: int = 0
+    files_opened: int = 0
+    dirs_scanned: int = 0
+
+
+@_model
+class Timings:
+    total_ms: float = 0.0
+    steps: List[TimingEntry] = field(default_factory=list)
+    counted: bool = False  # steps carry subprocess/open/listing counts
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Timings":
+        return cls(
+            total_ms=d.get("total_ms", 0.0),
+            steps=[TimingEntry(**s) for s in d.get("steps", [])],
+            counted=d.get("counted", False),
+        )
+
+
+@_model
 class Report:
     type: str
     generated_at: str
@@ -74,10 +233,118 @@ class Report:
     project: ProjectInfo
     issues: List[Issue] = field(default_factory=list)
     advice: List[AdviceItem] = field(default_factory=list)
+    installed: Optional[InstalledInfo] = None
+    startup: Optional[StartupInfo] = None
+    timings: Optional[Timings] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return to_plain(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Report":
+        """Rebuild a report from ``to_dict()`` output (e.g. a stored JSON report)."""
+        if d.get("type") != "py_env_doctor_report":
+            raise ValueError(f"not a py-env-doctor report: type={d.get('type')!r}")
+        fields = dict(d)
+        fields["python"] = PythonInfo.from_dict(fields["python"])
+        fields["pip"] = PipInfo.from_dict(fields["pip"])
+        fields["project"] = ProjectInfo.from_dict(fields["project"])
+        fields["issues"] = [Issue(**i) for i in fields.get("issues", [])]
+        fields["advice"] = [AdviceItem(**a) for a in fields.get("advice", [])]
+        if fields.get("installed") is not None:
+            fields["installed"] = InstalledInfo.from_dict(fields["installed"])
+        if fields.get("startup") is not None:
+            fields["startup"] = StartupInfo.from_dict(fields["startup"])
+        if fields.get("timings") is not None:
+            fields["timings"] = Timings.from_dict(fields["timings"])
+        return cls(**fields)
+
+
+@_model
+class ProjectReport:
+    project: ProjectInfo
+    issues: List[Issue] = field(default_factory=list)
+    advice: List[AdviceItem] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ProjectReport":
+        return cls(
+            project=ProjectInfo.from_dict(d["project"]),
+            issues=[Issue(**i) for i in d.get("issues", [])],
+            advice=[AdviceItem(**a) for a in d.get("advice", [])],
+            error=d.get("error"),
+        )
+
+
+@_model
+class FleetSummary:
+    projects: int = 0
+    projects_with_issues: int = 0
+    failed: int = 0
+    issue_counts: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, result: "ProjectReport") -> None:
+        self.projects += 1
+        if result.error:
+            self.failed += 1
+        if result.issues:
+            self.projects_with_issues += 1
+        for code in {i.code for i in result.issues}:
+            self.issue_counts[code] = self.issue_counts.get(code, 0) + 1
+
+    def sort_counts(self) -> "FleetSummary":
+        """Order issue counts most-frequent first; call once all projects are added."""
+        self.issue_counts = dict(sorted(self.issue_counts.items(), key=lambda kv: (-kv[1], kv[0])))
+        return self
+
+
+@_model
+class FleetReport:
+    type: str
+    generated_at: str
+    python: PythonInfo
+    pip: PipInfo
+    projects: List[ProjectReport] = field(default_factory=list)
+    summary: FleetSummary = field(default_factory=FleetSummary)
+    installed: Optional[InstalledInfo] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return to_plain(self)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "FleetReport":
+        if d.get("type") != "py_env_doctor_fleet_report":
+            raise ValueError(f"not a py-env-doctor fleet report: type={d.get('type')!r}")
+        return cls(
+            type=d["type"],
+            generated_at=d["generated_at"],
+            python=PythonInfo.from_dict(d["python"]),
+            pip=PipInfo.from_dict(d["pip"]),
+            projects=[ProjectReport.from_dict(p) for p in d.get("projects", [])],
+            summary=FleetSummary(**d["summary"]) if d.get("summary") else FleetSummary(),
+            installed=InstalledInfo.from_dict(d["installed"]) if d.get("installed") else None,
+        )
+
+
+@_model
+class InterpreterEntry:
+    path: str
+    python: Optional[PythonInfo] = None
+    prefix: Optional[str] = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    duplicates: List[str] = field(default_factory=list)
+
+
+@_model
+class InterpreterReport:
+    type: str
+    generated_at: str
+    interpreters: List[InterpreterEntry] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        return d
+        return to_plain(self)
 
 
 def now_iso() -> str:
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Pattern
+
+# One os.scandir per PATH directory instead of a full PATH walk per
+# shutil.which() call; only entries matching the patterns are kept, and only
+# those are checked for the executable bit.
+
+PIP_NAME_RE = re.compile(r"^pip(\d+(\.\d+)*)?(\.exe)?$", re.IGNORECASE)
+PYTHON_NAME_RE = re.compile(r"^python(\d+(\.\d+)?)?(\.exe)?$", re.IGNORECASE)
+_VERSION_SUFFIX_RE = re.compile(r"(\d+(?:\.\d+)*)$")
+
+
+@dataclass
+class PathEntry:
+    name: str  # command name as typed: no .exe, lowercased on Windows
+    path: str
+    dir_index: int
+
+
+def command_name(filename: str) -> str:
+    if os.name == "nt":
+        filename = filename.lower()
+        if filename.endswith(".exe"):
+            filename = filename[:-4]
+    return filename
+
+
+def name_version(name: str) -> Optional[str]:
+    """The version a command name promises, e.g. ``3.11`` for ``pip3.11``; None for bare ``pip``."""
+    m = _VERSION_SUFFIX_RE.search(name)
+    return m.group(1) if m else None
+
+
+def _is_executable(path: str) -> bool:
+    if os.name == "nt":
+        return path.lower().endswith(".exe")
+    return os.access(path, os.X_OK)
+
+
+class PathIndex:
+    """Matching executables of every PATH directory, in PATH precedence order."""
+
+    def __init__(self, entries: List[PathEntry], dirs: List[str]) -> None:
+        self.entries = entries
+        self.dirs = dirs
+        self.by_name: Dict[str, List[PathEntry]] = {}
+        for e in entries:
+            self.by_name.setdefault(e.name, []).append(e)
+
+    def which(self, name: str) -> Optional[str]:
+        hits = self.by_name.get(command_name(name))
+        return hits[0].path if hits else None
+
+    def winners(self, pattern: Pattern[str]) -> List[PathEntry]:
+        """The entry each matching command name resolves to, in PATH order."""
+        return [e for e in self.entries if pattern.match(e.name) and self.by_name[e.name][0] is e]
+
+    def matching(self, pattern: Pattern[str]) -> List[PathEntry]:
+        return [e for e in self.entries if pattern.match(e.name)]
+
+    def shadowed(self, pattern: Optional[Pattern[str]] = None) -> Dict[str, List[str]]:
+        """Command name -> [winning path, shadowed paths...] for names found as different files."""
+        out: Dict[str, List[str]] = {}
+        for name, hits in self.by_name.items():
+            if len(hits) < 2 or (pattern is not None and not pattern.match(name)):
+                continue
+            # merged-/usr systems list /bin and /usr/bin: same file, nothing shadowed
+            seen = {os.path.realpath(hits[0].path)}
+            losers = []
+            for h in hits[1:]:
+                real = os.path.realpath(h.path)
+                if real not in seen:
+                    seen.add(real)
+                    losers.append(h.path)
+            if losers:
+                out[name] = [hits[0].path] + losers
+        return out
+
+
+def _pyenv_root() -> str:
+    return os.environ.get("PYENV_ROOT") or os.path.expanduser("~/.pyenv")
+
+
+def pyenv_active_versions() -> List[str]:
+    """Versions a pyenv shim would dispatch to, in order: PYENV_VERSION, .python-version, global."""
+    env = os.environ.get("PYENV_VERSION")
+    if env:
+        return [v for v in env.split(":") if v]
+    files = []
+    cur = os.getcwd()
+    while True:
+        files.append(os.path.join(cur, ".python-version"))
+        parent = os.path.dirname(cur)
+        if parent == cur:
+            break
+        cur = parent
+    files.append(os.path.join(_pyenv_root(), "version"))
+    for f in files:
+        try:
+            with open(f, "r", encoding="utf-8") as fh:
+                versions = [line.strip() for line in fh if line.strip() and not line.startswith("#")]
+        except OSError:
+            continue
+        if versions:
+            return versions
+    return ["system"]
+
+
+def resolve_pyenv_shim(path: str) -> Optional[str]:
+    """The executable a pyenv shim would run, without running pyenv.
+
+    Returns ``path`` unchanged when it is not a shim or pyenv would fall back to
+    the system interpreter, and ``""`` when no active version provides the command.
+    """
+    root = _pyenv_root()
+    if os.path.normcase(os.path.dirname(os.path.abspath(path))) != os.path.normcase(os.path.join(root, "shims")):
+        return path
+    versions = pyenv_active_versions()
+    if "system" in versions:
+        return path
+    name = os.path.basename(path)
+    for v in versions:
+        for bindir in ("bin", "Scripts"):
+            cand = os.path.join(root, "versions", v, bindir, name)
+            if os.path.isfile(cand):
+                return cand
+    return ""
+
+
+def build_path_index(
+    patterns: Iterable[Pattern[str]] = (PIP_NAME_RE, PYTHON_NAME_RE),
+    path_env: Optional[str] = None,
+) -> PathIndex:
+    patterns = tuple(patterns)
+    raw = os.environ.get("PATH", "") if path_env is None else path_env
+    dirs: List[str] = []
+    seen = set()
+    for d in raw.split(os.pathsep):
+        if not d:
+            continue
+        key = os.path.normcase(os.path.abspath(d))
+        if key not in seen:
+            seen.add(key)
+            dirs.append(d)
+    entries: List[PathEntry] = []
+    for idx, d in enumerate(dirs):
+        try:
+            with os.scandir(d) as it:
+                # is_dir() comes from the directory entry type, no extra stat
+                names = sorted(e.name for e in it if any(p.match(e.name) for p in patterns) and not e.is_dir())
+        except OSError:
+            continue
+        for filename in names:
+            path = os.path.join(d, filename)
+            if _is_executable(path):
+                entries.append(PathEntry(name=command_name(filename), path=path, dir_index=idx))
+    return PathIndex(entries, dirs)
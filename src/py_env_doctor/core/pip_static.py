@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import os
+import re
+import shlex
+import shutil
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Read pip's version without starting an interpreter: follow the script's shebang
+# to its Python, locate that Python's site-packages and read pip's metadata.
+
+_SHEBANG_READ_BYTES = 1024
+_EXE_TAIL_BYTES = 8192
+_PY_EXE_RE = re.compile(r"^(python|pypy)[\d.]*(w)?(\.exe)?$", re.IGNORECASE)
+_PY_VERSION_IN_NAME_RE = re.compile(r"python(\d+\.\d+)", re.IGNORECASE)
+_INIT_VERSION_RE = re.compile(r"""^__version__\s*=\s*['"]([^'"]+)['"]""", re.MULTILINE)
+
+
+def _split_shebang(line: str) -> List[str]:
+    try:
+        return shlex.split(line, posix=os.name != "nt")
+    except ValueError:
+        return line.split()
+
+
+def _interpreter_from_command(cmd: List[str]) -> Optional[str]:
+    if not cmd:
+        return None
+    prog = cmd[0]
+    if os.path.basename(prog) == "env":
+        # /usr/bin/env [-S] python3 -> resolve the name on PATH like env would
+        args = [a for a in cmd[1:] if not a.startswith("-")]
+        if not args:
+            return None
+        return shutil.which(args[0])
+    return prog
+
+
+def _shebang_from_exe(path: str) -> Optional[str]:
+    # Windows launchers (distlib) append "#!<python>\n" followed by a zip archive
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            f.seek(max(0, size - _EXE_TAIL_BYTES))
+            tail = f.read()
+    except Exception:
+        return None
+    idx = tail.rfind(b"#!")
+    if idx < 0:
+        return None
+    line = tail[idx + 2:].split(b"\n", 1)[0].strip()
+    try:
+        return line.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def read_shebang(path: str) -> Optional[str]:
+    """Return the interpreter path a console script would run with, if it can be determined."""
+    if path.lower().endswith(".exe"):
+        line = _shebang_from_exe(path)
+        if not line:
+            return None
+        return _interpreter_from_command(_split_shebang(line))
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_SHEBANG_READ_BYTES)
+    except Exception:
+        return None
+    if not head.startswith(b"#!"):
+        return None
+    lines = head.decode("utf-8", errors="replace").splitlines()
+    cmd = _split_shebang(lines[0][2:].strip())
+    if cmd and os.path.basename(cmd[0]) in ("sh", "bash") and len(lines) > 1:
+        # pip's trick for shebangs longer than the kernel limit:
+        #   #!/bin/sh
+        #   '''exec' "/long/path/python" "$0" "$@"
+        second = lines[1]
+        if second.startswith("'''exec'"):
+            cmd = _split_shebang(second[len("'''exec'"):].strip())
+    return _interpreter_from_command(cmd)
+
+
+def is_python_interpreter(interp: str) -> bool:
+    return bool(_PY_EXE_RE.match(os.path.basename(interp)))
+
+
+def _prefix_of(interp: Path) -> Path:
+    # <prefix>/bin/python, <venv>\Scripts\python.exe or <prefix>\python.exe
+    parent = interp.parent
+    if parent.name.lower() in ("bin", "scripts"):
+        return parent.parent
+    return parent
+
+
+def _pyvenv_cfg(prefix: Path) -> dict:
+    cfg = prefix / "pyvenv.cfg"
+    items = {}
+    try:
+        for line in cfg.read_text(encoding="utf-8", errors="ignore").splitlines():
+            if "=" in line:
+                k, v = line.split("=", 1)
+                items[k.strip().lower()] = v.strip()
+    except Exception:
+        pass
+    return items
+
+
+def _major_minor(version: str) -> Optional[str]:
+    parts = version.split(".")
+    if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit():
+        return f"{parts[0]}.{parts[1]}"
+    return None
+
+
+def interpreter_version(interp: str) -> Optional[str]:
+    """Best-effort major.minor of an interpreter from files next to it, without running it."""
+    exe = Path(interp)
+    prefix = _prefix_of(exe)
+    cfg = _pyvenv_cfg(prefix)
+    for key in ("version_info", "version"):
+        if cfg.get(key):
+            mm = _major_minor(cfg[key])
+            if mm:
+                return mm
+    try:
+        real = os.path.realpath(interp)
+    except Exception:
+        real = interp
+    m = _PY_VERSION_IN_NAME_RE.search(os.path.basename(real))
+    if m:
+        return m.group(1)
+    # a single lib/pythonX.Y directory is unambiguous
+    try:
+        libs = [p.name for p in (prefix / "lib").iterdir() if _PY_VERSION_IN_NAME_RE.fullmatch(p.name)]
+    except Exception:
+        libs = []
+    if len(libs) == 1:
+        return _PY_VERSION_IN_NAME_RE.fullmatch(libs[0]).group(1)
+    return None
+
+
+def _user_site(version: str) -> Optional[Path]:
+    base = os.environ.get("PYTHONUSERBASE")
+    nodot = version.replace(".", "")
+    if sys.platform == "win32":
+        root = Path(base) if base else Path(os.environ.get("APPDATA", "~")).expanduser() / "Python"
+        return root / f"Python{nodot}" / "site-packages"
+    if sys.platform == "darwin" and not base:
+        return Path("~/Library/Python").expanduser() / version / "lib" / "python" / "site-packages"
+    root = Path(base) if base else Path("~/.local").expanduser()
+    return root / "lib" / f"python{version}" / "site-packages"
+
+
+def interpreter_site_dirs(interp: str, version: Optional[str]) -> List[Path]:
+    """Site directories of an interpreter in import precedence order, derived from its location."""
+    exe = Path(interp)
+    prefix = _prefix_of(exe)
+    cfg = _pyvenv_cfg(prefix)
+    dirs: List[Path] = []
+    is_venv = bool(cfg)
+    if version and (not is_venv or cfg.get("include-system-site-packages", "").lower() == "true"):
+        user = _user_site(version)
+        if user:
+            dirs.append(user)
+    if version:
+        dirs.append(prefix / "lib" / f"python{version}" / "site-packages")
+        dirs.append(prefix / "local" / "lib" / f"python{version}" / "dist-packages")
+        dirs.append(prefix / "lib" / f"python{version}" / "dist-packages")
+    dirs.append(prefix / "lib" / "python3" / "dist-packages")
+    dirs.append(prefix / "Lib" / "site-packages")
+    out: List[Path] = []
+    seen = set()
+    for d in dirs:
+        key = os.path.normcase(str(d))
+        if key not in seen:
+            seen.add(key)
+            out.append(d)
+    return out
+
+
+def _version_from_metadata(metadata: Path) -> Optional[str]:
+    try:
+        with metadata.open("r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if not line.strip():
+                    break  # end of the header block
+                if line.lower().startswith("version:"):
+                    return line.split(":", 1)[1].strip() or None
+    except Exception:
+        return None
+    return None
+
+
+def pip_version_in(site_dir: Path) -> Optional[str]:
+    """Version of pip installed in ``site_dir`` from its dist-info METADATA or ``pip/__init__.py``."""
+    try:
+        dist_infos = sorted(site_dir.glob("pip-*.dist-info"))
+    except Exception:
+        dist_infos = []
+    for d in dist_infos:
+        v = _version_from_metadata(d / "METADATA")
+        if v:
+            return v
+    init = site_dir / "pip" / "__init__.py"
+    try:
+        m = _INIT_VERSION_RE.search(init.read_text(encoding="utf-8", errors="ignore"))
+    except Exception:
+        return None
+    return m.group(1) if m else None
+
+
+def static_pip_probe(path: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Return ``(shebang_python, pip_version, python_version)`` for a pip script without running it.
+
+    Any element may be ``None`` when it cannot be determined from files alone.
+    """
+    interp = read_shebang(path)
+    if not interp or not is_python_interpreter(interp):
+        return interp, None, None
+    version = interpreter_version(interp)
+    if not version:
+        return interp, None, None
+    for site_dir in interpreter_site_dirs(interp, version):
+        pip_version = pip_version_in(site_dir)
+        if pip_version:
+            return interp, pip_version, version
+    return interp, None, version
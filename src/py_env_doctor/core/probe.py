@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from typing import Any, Dict, List, Optional
+
+from .defaults import PROBE_TIMEOUT
+from .cancel import time_left
+
+# Self-contained script run inside a target interpreter. It must only use the
+# stdlib and syntax every Python from 2.7 on understands (no f-strings, no
+# walrus), since the target may be older than the interpreter running us.
+PROBE_SCRIPT = r"""
+import json, os, platform, site, sys, sysconfig
+
+def _site_dirs():
+    # sys.path order: the user site (only when enabled) comes before site-packages
+    paths = []
+    if getattr(site, "ENABLE_USER_SITE", False):
+        try:
+            up = site.getusersitepackages()
+            if up:
+                paths.append(up)
+        except Exception:
+            pass
+    try:
+        paths.extend(site.getsitepackages())
+    except Exception:
+        pass
+    try:
+        sc = sysconfig.get_paths()
+        for key in ("purelib", "platlib"):
+            if sc.get(key):
+                paths.append(sc[key])
+    except Exception:
+        pass
+    out = []
+    for p in paths:
+        if p and p not in out:
+            out.append(p)
+    return out
+
+def _externally_managed(dirs):
+    for base in dirs:
+        for cand in (os.path.join(base, "EXTERNALLY-MANAGED"),
+                     os.path.join(os.path.dirname(base), "EXTERNALLY-MANAGED")):
+            try:
+                if os.path.isfile(cand):
+                    return True
+            except Exception:
+                pass
+    return False
+
+def _find_specs(names):
+    try:
+        import importlib.util as iu
+    except Exception:
+        return {}
+    out = {}
+    for name in names:
+        try:
+            out[name] = iu.find_spec(name) is not None
+        except Exception:
+            out[name] = False
+    return out
+
+def _marker_environment():
+    # the PEP 508 marker variables, as packaging.markers.default_environment computes them
+    impl = getattr(sys, "implementation", None)
+    if impl is not None:
+        iv = impl.version
+        impl_version = "%d.%d.%d" % (iv.major, iv.minor, iv.micro)
+        if iv.releaselevel != "final":
+            impl_version += iv.releaselevel[0] + str(iv.serial)
+        impl_name = impl.name
+    else:
+        impl_version, impl_name = "0", ""
+    return {
+        "implementation_name": impl_name,
+        "implementation_version": impl_version,
+        "os_name": os.name,
+        "platform_machine": platform.machine(),
+        "platform_release": platform.release(),
+        "platform_system": platform.system(),
+        "platform_version": platform.version(),
+        "python_full_version": platform.python_version(),
+        "platform_python_implementation": platform.python_implementation(),
+        "python_version": ".".join(platform.python_version_tuple()[:2]),
+        "sys_platform": sys.platform,
+    }
+
+try:
+    payload = json.loads(sys.stdin.read() or "{}")
+except Exception:
+    payload = {}
+# the doctor's working directory must not count as part of the target environment
+sys.path = [p for p in sys.path if p]
+dirs = _site_dirs()
+try:
+    sc_paths = sysconfig.get_paths()
+except Exception:
+    sc_paths = {}
+print(json.dumps({
+    "executable": sys.executable,
+    "version": platform.python_version(),
+    "implementation": platform.python_implementation(),
+    "prefix": sys.prefix,
+    "base_prefix": getattr(sys, "base_prefix", sys.prefix),
+    "site_dirs": dirs,
+    "pep668_externally_managed": _externally_managed(dirs),
+    "is_conda": os.path.isdir(os.path.join(sys.prefix, "conda-meta")),
+    "platform": {"system": platform.system(), "release": platform.release()},
+    "sysconfig_paths": sc_paths,
+    "sys_path": sys.path,
+    "builtin_module_names": list(sys.builtin_module_names),
+    "stdlib_module_names": sorted(getattr(sys, "stdlib_module_names", ())),
+    "find_spec": _find_specs(payload.get("modules") or []),
+    "marker_environment": _marker_environment(),
+}))
+"""
+
+
+class ProbeError(Exception):
+    """A target interpreter could not be probed."""
+
+    def __init__(self, message: str, timed_out: bool = False) -> None:
+        super().__init__(message)
+        self.timed_out = timed_out
+
+
+def _spawn(cmd: List[str], payload: Optional[Dict[str, Any]], timeout: Optional[float]) -> subprocess.CompletedProcess:
+    timeout = time_left(timeout)
+    try:
+        return subprocess.run(
+            cmd,
+            input=json.dumps(payload or {}),
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        raise ProbeError(f"probe timed out after {timeout}s", timed_out=True)
+    except OSError as exc:
+        raise ProbeError(str(exc))
+
+
+def run_probe(
+    executable: str,
+    payload: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = PROBE_TIMEOUT,
+    isolated: bool = True,
+) -> Dict[str, Any]:
+    """Run PROBE_SCRIPT in ``executable`` and return its JSON reply.
+
+    ``payload`` is sent as JSON on stdin; ``{"modules": [...]}`` asks for
+    ``find_spec`` results, so every fact comes back from a single spawn.
+    An interpreter that rejects ``-I`` (Python 2) is retried once with ``-E -s``.
+    Raises ProbeError when the interpreter cannot be started, times out or replies garbage.
+    """
+    flags = ["-I"] if isolated else []
+    proc = _spawn([executable, *flags, "-c", PROBE_SCRIPT], payload, timeout)
+    if isolated and proc.returncode != 0 and "Unknown option: -I" in (proc.stderr or ""):
+        # Python 2 has no -I; -E -s keeps PYTHON* variables and the user site out just the same
+        proc = _spawn([executable, "-E", "-s", "-c", PROBE_SCRIPT], payload, timeout)
+    if proc.returncode != 0:
+        err = [line.strip() for line in (proc.stderr or "").splitlines() if line.strip()]
+        if not err:
+            raise ProbeError(f"exit status {proc.returncode}")
+        # a traceback ends with the exception; launcher/usage errors lead with it
+        raise ProbeError(err[-1] if err[0].startswith("Traceback") else err[0])
+    try:
+        data = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        raise ProbeError("probe returned no JSON")
+    if not isinstance(data, dict):
+        raise ProbeError("probe returned no JSON")
+    return data
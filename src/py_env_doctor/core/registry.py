@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .cancel import _CONTROL, Cancelled, _Control
+from .cancel import check_cancelled, time_left  # noqa: F401  # re-exported: plugins call registry.check_cancelled()
+from .model import TimingEntry
+from .timing import _CURRENT, Counters, install_hook, make_entry
+
+ENTRY_POINT_GROUP = "py_env_doctor.detectors"
+
+# Detector run states recorded by the scheduler
+OK = "ok"
+ERROR = "error"
+TIMED_OUT = "timed_out"
+SKIPPED = "skipped"
+REUSED = "reused"  # output taken from a saved earlier run
+
+# Detector cost classes, cheapest first. The --level of a check decides which
+# classes run; --time-budget picks detectors by their estimated wall time.
+COST_STAT = "stat"  # stat and directory listings only
+COST_PARSE = "parse"  # reads and parses a bounded set of files
+COST_WALK = "walk"  # walks the project tree
+COST_SUBPROCESS = "subprocess"  # starts another process
+COST_SOURCES = "sources"  # parses every source file of the project
+COSTS = (COST_STAT, COST_PARSE, COST_WALK, COST_SUBPROCESS, COST_SOURCES)
+# typical wall time per class; a detector without a cost (e.g. a plugin) counts as a subprocess
+COST_ESTIMATE_MS = {COST_STAT: 2.0, COST_PARSE: 15.0, COST_WALK: 60.0, COST_SUBPROCESS: 250.0, COST_SOURCES: 400.0}
+
+
+@dataclass
+class Detector:
+    """A unit of fact gathering with declared inputs and outputs.
+
+    ``func`` is called with one keyword argument per input fact. With a single
+    output it returns that fact; with several it returns a mapping of output
+    name to value. ``produces_issues`` marks detectors whose single output is a
+    list of ``Issue`` objects to merge into the report.
+
+    ``cost`` is one of ``COSTS`` and ``estimate_ms`` overrides the class
+    estimate; ``value`` ranks detectors when a time budget cannot fit them all.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    produces_issues: bool = False
+    cost: Optional[str] = None
+    estimate_ms: Optional[float] = None
+    value: int = 50
+
+    @property
+    def estimated_ms(self) -> float:
+        if self.estimate_ms is not None:
+            return self.estimate_ms
+        return COST_ESTIMATE_MS.get(self.cost or COST_SUBPROCESS, COST_ESTIMATE_MS[COST_SUBPROCESS])
+
+
+@dataclass
+class RunResult:
+    facts: Dict[str, Any] = field(default_factory=dict)
+    status: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    timings: Dict[str, TimingEntry] = field(default_factory=dict)
+    # detectors still running or waiting when the run's deadline passed (also in status as timed_out)
+    unfinished: List[str] = field(default_factory=list)
+
+
+_REGISTERED: List[Detector] = []
+
+
+def register(detector: Detector) -> Detector:
+    """Register a detector for every subsequent check run in this process."""
+    _REGISTERED.append(detector)
+    return detector
+
+
+def registered_detectors() -> List[Detector]:
+    return list(_REGISTERED)
+
+
+def _entry_point_specs(group: str, path_entries: Optional[Iterable[str]] = None) -> List[Tuple[str, str]]:
+    """``(name, "module:attr")`` for ``group`` from the entry_points.txt of every dist on sys.path.
+
+    Reads the files directly; importing importlib.metadata and building its
+    Distribution objects costs more than the rest of a cached check.
+    """
+    import sys
+
+    specs: List[Tuple[str, str]] = []
+    seen = set()
+    header = f"[{group}]"
+    for entry in path_entries if path_entries is not None else sys.path:
+        try:
+            with os.scandir(entry or ".") as it:
+                metas = sorted(e.path for e in it if e.name.endswith((".dist-info", ".egg-info")) and e.is_dir())
+        except OSError:
+            continue
+        for meta in metas:
+            try:
+                with open(os.path.join(meta, "entry_points.txt"), "r", encoding="utf-8") as f:
+                    text = f.read()
+            except OSError:
+                continue
+            if header not in text:
+                continue
+            section = None
+            for raw in text.splitlines():
+                line = raw.strip()
+                if not line or line.startswith(("#", ";")):
+                    continue
+                if line.startswith("["):
+                    section = line
+                    continue
+                if section != header or "=" not in line:
+                    continue
+                name, _, value = line.partition("=")
+                name, value = name.strip(), value.split("[", 1)[0].strip()
+                if name not in seen:  # the first distribution on sys.path wins, as with importlib.metadata
+                    seen.add(name)
+                    specs.append((name, value))
+    return specs
+
+
+def load_entry_point_detectors(path_entries: Optional[Iterable[str]] = None) -> Tuple[List[Detector], Dict[str, str]]:
+    """Detectors advertised by installed packages under the ``py_env_doctor.detectors`` group.
+
+    An entry point may name a Detector, a list of them, or a callable returning
+    either. Returns the detectors plus load errors keyed by entry point name.
+    """
+    import importlib
+
+    found: List[Detector] = []
+    errors: Dict[str, str] = {}
+    for name, value in _entry_point_specs(ENTRY_POINT_GROUP, path_entries):
+        try:
+            module, _, attr = value.partition(":")
+            obj = importlib.import_module(module.strip())
+            for part in attr.strip().split(".") if attr.strip() else ():
+                obj = getattr(obj, part)
+            if callable(obj) and not isinstance(obj, Detector):
+                obj = obj()
+            items = obj if isinstance(obj, (list, tuple)) else [obj]
+            for d in items:
+                if not isinstance(d, Detector):
+                    raise TypeError(f"expected Detector, got {type(d).__name__}")
+                found.append(d)
+        except Exception as exc:
+            errors[name] = f"{type(exc).__name__}: {exc}"
+    return found, errors
+
+
+def _check_graph(detectors: Sequence[Detector], initial: Iterable[str]) -> None:
+    produced = set(initial)
+    names = set()
+    for d in detectors:
+        if d.name in names:
+            raise ValueError(f"duplicate detector name: {d.name}")
+        names.add(d.name)
+        for out in d.outputs:
+            if out in produced:
+                raise ValueError(f"fact {out!r} is produced more than once")
+            produced.add(out)
+
+
+def downstream(detectors: Sequence[Detector], names: Iterable[str]) -> Set[str]:
+    """``names`` plus every detector that consumes, directly or not, one of their outputs."""
+    producers = {out: d.name for d in detectors for out in d.outputs}
+    out = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for d in detectors:
+            if d.name not in out and any(producers.get(i) in out for i in d.inputs):
+                out.add(d.name)
+                changed = True
+    return out
+
+
+def upstream(detectors: Sequence[Detector], names: Iterable[str]) -> Set[str]:
+    """``names`` plus every detector whose outputs they need, directly or not."""
+    by_name = {d.name: d for d in detectors}
+    producers = {out: d.name for d in detectors for out in d.outputs}
+    out: Set[str] = set()
+    todo = [n for n in names if n in by_name]
+    while todo:
+        name = todo.pop()
+        if name in out:
+            continue
+        out.add(name)
+        todo.extend(producers[i] for i in by_name[name].inputs if i in producers)
+    return out
+
+
+def critical_path_ms(detectors: Sequence[Detector], names: Iterable[str]) -> float:
+    """Estimated wall time of running ``names`` concurrently: the longest chain of estimates."""
+    chosen = set(names)
+    by_name = {d.name: d for d in detectors if d.name in chosen}
+    producers = {out: d.name for d in by_name.values() for out in d.outputs}
+    finish: Dict[str, float] = {}
+
+    def end(name: str) -> float:
+        if name not in finish:
+            det = by_name[name]
+            ready = max((end(producers[i]) for i in det.inputs if i in producers), default=0.0)
+            finish[name] = ready + det.estimated_ms
+        return finish[name]
+
+    return max((end(n) for n in by_name), default=0.0)
+
+
+def select_within_budget(
+    detectors: Sequence[Detector], budget_ms: float, required: Iterable[str] = ()
+) -> Tuple[List[Detector], List[Detector]]:
+    """Split ``detectors`` into those that fit ``budget_ms`` and those left out.
+
+    ``required`` detectors and their inputs are always kept. The rest are
+    taken greedily by ``value``, each together with whatever it needs, as long
+    as the estimated critical path stays within the budget.
+    """
+    selected = upstream(detectors, required)
+    for det in sorted(detectors, key=lambda d: -d.value):
+        if det.name in selected:
+            continue
+        candidate = selected | upstream(detectors, [det.name])
+        if critical_path_ms(detectors, candidate) <= budget_ms:
+            selected = candidate
+    return [d for d in detectors if d.name in selected], [d for d in detectors if d.name not in selected]
+
+
+def merge_results(previous: RunResult, partial: RunResult, kept: Iterable[Detector]) -> RunResult:
+    """A full result from a partial rerun: ``partial`` plus the state of the ``kept`` detectors."""
+    merged = RunResult(facts=dict(partial.facts))
+    for d in kept:
+        if d.name in previous.status:
+            merged.status[d.name] = previous.status[d.name]
+        if d.name in previous.timings:
+            merged.timings[d.name] = previous.timings[d.name]
+        if d.name in previous.errors:
+            merged.errors[d.name] = previous.errors[d.name]
+    merged.status.update(partial.status)
+    merged.timings.update(partial.timings)
+    merged.errors.update(partial.errors)
+    return merged
+
+
+def _run_one(
+    det: Detector, kwargs: Dict[str, Any], counters: Optional[Counters], control: _Control, done: "queue.Queue"
+) -> None:
+    _CURRENT.set(counters)  # a new thread starts with an empty context
+    _CONTROL.set(control)
+    try:
+        value = det.func(**kwargs)
+        done.put((det.name, value, None))
+    except BaseException as exc:  # reported back to the scheduler thread
+        done.put((det.name, None, exc))
+
+
+def run_detectors(
+    detectors: Sequence[Detector],
+    facts: Dict[str, Any],
+    max_workers: Optional[int] = None,
+    deadline: Optional[float] = None,
+    count_io: bool = False,
+) -> RunResult:
+    """Run detectors as soon as their inputs exist, independent ones concurrently.
+
+    Each detector runs in a daemon thread, so one that overruns its timeout is
+    abandoned rather than joined: its outputs stay missing and every detector
+    that needs them is marked skipped. Wall time follows the critical path.
+
+    ``deadline`` (a ``time.monotonic()`` value) bounds the whole run: when it
+    passes, every detector still running or waiting is marked timed out and
+    listed in ``unfinished``, and the facts gathered so far are returned.
+    Abandoned detectors are told through ``check_cancelled``/``time_left``,
+    so their loops and subprocesses stop soon after.
+
+    Timings always carry wall time. ``count_io`` adds subprocess, open and
+    directory-listing counts, which needs ``timing.install_hook``: a
+    process-wide audit hook that stays installed for the life of the process.
+    """
+    _check_graph(detectors, facts)
+    if count_io:
+        install_hook()
+    result = RunResult(facts=dict(facts))
+    pending: Dict[str, Detector] = {d.name: d for d in detectors}
+    by_name = dict(pending)
+    running: Dict[str, _Control] = {}
+    end = deadline if deadline is not None else float("inf")
+    started: Dict[str, Tuple[int, Counters]] = {}
+    done: "queue.Queue" = queue.Queue()
+    limit = max_workers if max_workers and max_workers > 0 else len(detectors) or 1
+    producers = {out: d.name for d in detectors for out in d.outputs}
+
+    def blocked(det: Detector) -> bool:
+        # an input that will never appear: its producer failed or nobody produces it
+        for inp in det.inputs:
+            if inp in result.facts:
+                continue
+            prod = producers.get(inp)
+            if prod is None or result.status.get(prod) in (ERROR, TIMED_OUT, SKIPPED):
+                return True
+        return False
+
+    def record(name: str, status: str) -> None:
+        start, counters = started[name]
+        result.status[name] = status
+        result.timings[name] = make_entry(name, time.perf_counter_ns() - start, counters, status)
+
+    def abandon(name: str) -> None:
+        running.pop(name).cancelled.set()
+        record(name, TIMED_OUT)
+
+    def finish(name: str, value: Any, exc: Optional[BaseException], control: _Control) -> None:
+        det = by_name[name]
+        if exc is not None and (isinstance(exc, Cancelled) or time.monotonic() >= control.deadline):
+            # it hit its deadline (e.g. a capped subprocess timeout) before the scheduler noticed
+            record(name, TIMED_OUT)
+            if time.monotonic() >= end:
+                result.unfinished.append(name)
+            return
+        if exc is not None:
+            record(name, ERROR)
+            result.errors[name] = exc
+            return
+        if len(det.outputs) == 1:
+            result.facts[det.outputs[0]] = value
+        elif det.outputs:
+            value = value or {}
+            for out in det.outputs:
+                if out in value:
+                    result.facts[out] = value[out]
+        record(name, OK)
+
+    while pending or running:
+        progressed = True
+        while progressed:
+            progressed = False
+            for name, det in list(pending.items()):
+                if blocked(det):
+                    result.status[name] = SKIPPED
+                    del pending[name]
+                    progressed = True
+                elif len(running) < limit and all(i in result.facts for i in det.inputs) and time.monotonic() < end:
+                    del pending[name]
+                    kwargs = {i: result.facts[i] for i in det.inputs}
+                    counters = Counters()
+                    own = time.monotonic() + det.timeout if det.timeout else float("inf")
+                    control = _Control(threading.Event(), min(own, end))
+                    t = threading.Thread(
+                        target=_run_one,
+                        args=(det, kwargs, counters if count_io else None, control, done),
+                        name=f"detector-{name}",
+                        daemon=True,
+                    )
+                    running[name] = control
+                    started[name] = (time.perf_counter_ns(), counters)
+                    t.start()
+                    progressed = True
+        if time.monotonic() >= end:
+            # the run's deadline: report what finished, give up on the rest
+            for name in list(running):
+                abandon(name)
+                result.unfinished.append(name)
+            for name in pending:
+                result.status[name] = TIMED_OUT
+                result.unfinished.append(name)
+            break
+        if not running:
+            break
+        wait = min(c.deadline for c in running.values()) - time.monotonic()
+        try:
+            name, value, exc = done.get(timeout=None if wait == float("inf") else max(0.0, wait))
+        except queue.Empty:
+            now = time.monotonic()
+            for name, control in list(running.items()):
+                if control.deadline <= now and now < end:
+                    abandon(name)
+            continue
+        if name not in running:
+            continue  # a late result from a detector we already gave up on
+        finish(name, value, exc, running.pop(name))
+    return result
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .defaults import PROBE_TIMEOUT
+from .model import StartupInfo
+from .cancel import check_cancelled, time_left
+
+# Interpreter startup cost: .pth files that run code on every start, and what
+# importing the project package costs. The timing side spawns the target
+# twice: a bare `-S -c pass` for the floor, then `-X importtime -c "import
+# <project>"`, whose stderr lists the self and cumulative time of every import.
+
+_SLOWEST = 5
+# the name goes into `-c` source, so nothing but a dotted identifier may pass
+_DOTTED_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*")
+_MAX_LINE = 80
+# (name, depth, self µs, cumulative µs)
+ImportTime = Tuple[str, int, int, int]
+
+
+def audit_pth(site_dirs: Iterable[str]) -> Tuple[int, List[str]]:
+    """How many .pth files the site directories hold, and their executable lines.
+
+    site.py runs a line that starts with ``import`` followed by a space or tab;
+    every other line is a path entry or a comment.
+    """
+    count = 0
+    found: List[str] = []
+    for site_dir in site_dirs:
+        try:
+            names = sorted(n for n in os.listdir(site_dir) if n.endswith(".pth") and not n.startswith("."))
+        except OSError:
+            continue
+        for name in names:
+            count += 1
+            path = os.path.join(site_dir, name)
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+            for lineno, line in enumerate(lines, start=1):
+                if line.startswith(("import ", "import\t")):
+                    text = line.strip()
+                    if len(text) > _MAX_LINE:
+                        text = text[: _MAX_LINE - 3] + "..."
+                    found.append(f"{path}:{lineno}: {text}")
+    return count, found
+
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    """Entries of ``-X importtime`` output in the order they finished."""
+    out: List[ImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|", 2)
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the header line
+        name = parts[2][1:] if parts[2].startswith(" ") else parts[2]
+        stripped = name.lstrip(" ")
+        out.append((stripped, (len(name) - len(stripped)) // 2, int(parts[0]), int(parts[1])))
+    return out
+
+
+def _run(cmd: List[str], cwd: Optional[str], timeout: Optional[float]) -> Tuple[float, subprocess.CompletedProcess]:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        cmd, cwd=cwd, capture_output=True, text=True, check=False, timeout=time_left(timeout), stdin=subprocess.DEVNULL
+    )
+    return (time.perf_counter() - start) * 1000, proc
+
+
+def measure_startup(
+    executable: str,
+    site_dirs: Iterable[str],
+    import_name: Optional[str] = None,
+    cwd: Optional[Path] = None,
+    timeout: Optional[float] = PROBE_TIMEOUT,
+) -> StartupInfo:
+    """Audit .pth files and time a bare start against a start that imports ``import_name``.
+
+    The import runs in ``cwd`` (the project directory), the way ``python -c
+    "import pkg"`` would from a checkout. An import that raises still yields
+    timing of the two runs but no import breakdown; its last stderr line goes
+    into ``error``. A name that is not a dotted identifier is not run at all.
+    """
+    pth_files, pth_exec = audit_pth(site_dirs)
+    info = StartupInfo(import_name=import_name, pth_files=pth_files, pth_exec=pth_exec)
+    if import_name is not None and not _DOTTED_NAME.fullmatch(import_name):
+        info.error = f"not a valid import name: {import_name!r}"
+        return info
+    where = str(cwd) if cwd is not None else None
+    bare_ms, _ = _run([executable, "-S", "-c", "pass"], where, timeout)
+    check_cancelled()
+    code = f"import {import_name}" if import_name else "pass"
+    total_ms, proc = _run([executable, "-X", "importtime", "-c", code], where, timeout)
+    info.bare_ms = round(bare_ms, 1)
+    info.total_ms = round(total_ms, 1)
+    info.overhead_ms = round(max(0.0, total_ms - bare_ms), 1)
+    if proc.returncode != 0:
+        err = [line.strip() for line in (proc.stderr or "").splitlines() if line.strip() and not line.startswith("import time:")]
+        info.error = err[-1] if err else f"exit status {proc.returncode}"
+        return info
+    entries = parse_importtime(proc.stderr or "")
+    info.imports_ms = round(sum(cum for _, depth, _, cum in entries if depth == 0) / 1000, 1)
+    info.project_ms = next((round(cum / 1000, 1) for n, d, _, cum in entries if d == 0 and n == import_name), None)
+    slowest = sorted(entries, key=lambda e: e[2], reverse=True)[:_SLOWEST]
+    info.slowest = [f"{name} {self_us / 1000:.1f} ms" for name, _, self_us, _ in slowest]
+    return info
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from .model import TimingEntry
+
+# Per-step counters are collected by a process-wide audit hook that looks up
+# the step active in the current context. Audit hooks cannot be removed, so it
+# is only installed when counts are asked for (``count_io``); otherwise steps
+# carry wall time alone. Worker pools inside a step must run their tasks with
+# contextvars.copy_context() to be attributed to it. os.stat has no audit
+# event, so file activity is counted as opens and directory listings.
+
+
+@dataclass
+class Counters:
+    subprocesses: int = 0
+    files_opened: int = 0
+    dirs_scanned: int = 0
+
+
+_CURRENT: ContextVar[Optional[Counters]] = ContextVar("py_env_doctor_counters", default=None)
+_HOOK_LOCK = threading.Lock()
+_hook_installed = False
+
+
+def _audit_hook(event: str, args) -> None:
+    counters = _CURRENT.get()
+    if counters is None:
+        return
+    if event == "open":
+        counters.files_opened += 1
+    elif event in ("os.scandir", "os.listdir"):
+        counters.dirs_scanned += 1
+    elif event == "subprocess.Popen":
+        counters.subprocesses += 1
+
+
+def install_hook() -> None:
+    """Install the counting audit hook once, for the rest of the process; it is a no-op outside measured steps."""
+    global _hook_installed
+    with _HOOK_LOCK:
+        if not _hook_installed:
+            sys.addaudithook(_audit_hook)
+            _hook_installed = True
+
+
+def _ms(ns: int) -> float:
+    return round(ns / 1_000_000, 3)
+
+
+def make_entry(name: str, elapsed_ns: int, counters: Counters, status: str = "ok") -> TimingEntry:
+    return TimingEntry(
+        name=name,
+        ms=_ms(elapsed_ns),
+        status=status,
+        subprocesses=counters.subprocesses,
+        files_opened=counters.files_opened,
+        dirs_scanned=counters.dirs_scanned,
+    )
+
+
+@contextmanager
+def measure(name: str, steps: List[TimingEntry], count_io: bool = False) -> Iterator[Counters]:
+    """Time the block with perf_counter_ns and append its entry to ``steps``.
+
+    ``count_io`` also counts its subprocesses, opens and listings (see install_hook).
+    """
+    if count_io:
+        install_hook()
+    counters = Counters()
+    token = _CURRENT.set(counters if count_io else None)
+    start = time.perf_counter_ns()
+    status = "ok"
+    try:
+        yield counters
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter_ns() - start
+        _CURRENT.reset(token)
+        steps.append(make_entry(name, elapsed, counters, status))
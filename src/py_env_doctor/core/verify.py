@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import base64
+import csv
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .model import VerifyInfo
+from .cancel import check_cancelled
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .installed import InstalledDist, InstalledIndex
+
+# RECORD verification: re-hash every file a wheel install recorded and compare
+# it with the digest in RECORD. Hashing runs in a thread pool (hashlib releases
+# the GIL on large buffers) over mmap'd files, and a per-site-directory cache
+# keyed by (inode, size, mtime) skips files that did not change since the last
+# run, so a re-check costs one stat per file.
+
+CACHE_FORMAT = 1
+# files per pool task; one future per file costs more than hashing a small file
+_CHUNK = 64
+_MAX_LISTED = 5
+# RECORD lists the bytecode pip compiled at install time; removing it is harmless
+_SKIP_MISSING_SUFFIXES = (".pyc",)
+
+# (absolute path, algorithm, expected digest); algorithm and digest are None for unhashed entries
+Entry = Tuple[str, Optional[str], Optional[str]]
+# (inode, size, mtime_ns, algorithm, digest)
+Stamp = List[Any]
+
+
+def read_record(meta_dir: str) -> Optional[List[Tuple[str, Optional[str], Optional[str]]]]:
+    """(relative path, algorithm, digest) rows of ``meta_dir``/RECORD; None without a RECORD."""
+    try:
+        with open(os.path.join(meta_dir, "RECORD"), "r", encoding="utf-8", errors="replace", newline="") as f:
+            rows = list(csv.reader(f))
+    except OSError:
+        return None
+    out = []
+    for row in rows:
+        if not row or not row[0]:
+            continue
+        algo = digest = None
+        if len(row) > 1 and "=" in row[1]:
+            algo, _, digest = row[1].partition("=")
+        out.append((row[0], algo, digest))
+    return out
+
+
+def hash_file(path: str, algo: str) -> str:
+    """urlsafe-base64 digest of ``path`` without padding, the form RECORD uses."""
+    h = hashlib.new(algo)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    h.update(m)
+            except (OSError, ValueError):
+                # not mappable (special files, some network filesystems)
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+    return base64.urlsafe_b64encode(h.digest()).rstrip(b"=").decode("ascii")
+
+
+def _check(entries: List[Entry], cached: Dict[str, Stamp]) -> List[Tuple[str, Optional[Stamp], bool]]:
+    """(status, new cache stamp, hashed) per entry; status is ok, missing, modified or unreadable."""
+    out = []
+    for path, algo, digest in entries:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            out.append(("missing", None, False))
+            continue
+        except OSError:
+            out.append(("unreadable", None, False))
+            continue
+        if algo is None:
+            out.append(("ok", None, False))
+            continue
+        key = [st.st_ino, st.st_size, st.st_mtime_ns, algo]
+        old = cached.get(path)
+        if old is not None and old[:4] == key:
+            actual, hashed = old[4], False
+        else:
+            try:
+                actual, hashed = hash_file(path, algo), True
+            except (OSError, ValueError):
+                out.append(("unreadable", None, False))
+                continue
+        out.append(("ok" if actual == digest else "modified", key + [actual], hashed))
+    return out
+
+
+def _cache_path(cache_dir: Path, site_dir: str) -> Path:
+    return cache_dir / f"{hashlib.sha256(site_dir.encode('utf-8')).hexdigest()[:32]}.json"
+
+
+def _load_cache(path: Path) -> Dict[str, Stamp]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+        return {}
+    return data.get("files") or {}
+
+
+def _save_cache(path: Path, files: Dict[str, Stamp]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"format": CACHE_FORMAT, "files": files}, f)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+    except (OSError, TypeError, ValueError):
+        return
+
+
+def _top_dir(rel: str) -> Optional[str]:
+    """The site-directory child a RECORD path lives in, when it is a package directory."""
+    parts = rel.replace("\\", "/").split("/")
+    head = parts[0]
+    if len(parts) < 2 or head in ("", ".", "..", "__pycache__") or head.endswith((".dist-info", ".data")):
+        return None
+    return head
+
+
+def _walk_files(root: str) -> List[str]:
+    out: List[str] = []
+    stack = [root]
+    while stack:
+        check_cancelled()
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name != "__pycache__":
+                            stack.append(e.path)
+                    elif not e.name.endswith(_SKIP_MISSING_SUFFIXES):
+                        out.append(os.path.normpath(e.path))
+        except OSError:
+            continue
+    return out
+
+
+def _describe(dist: "InstalledDist", paths: Sequence[str]) -> str:
+    rels = sorted(os.path.relpath(p, dist.site_dir) for p in paths)
+    shown = ", ".join(rels[:_MAX_LISTED])
+    more = f" (+{len(rels) - _MAX_LISTED} more)" if len(rels) > _MAX_LISTED else ""
+    return f"{dist.name} {dist.version or '?'}: {shown}{more}"
+
+
+def verify_installed(
+    index: "InstalledIndex", workers: Optional[int] = None, cache_dir: Optional[Path] = None
+) -> VerifyInfo:
+    """Check every distribution with a RECORD against the files on disk.
+
+    Reports files RECORD lists that are gone, files whose hash differs, and
+    files inside a distribution's package directories that no RECORD in the
+    same site directory lists. With ``cache_dir`` the digests of unchanged
+    files are read from, and stored to, one cache file per site directory.
+    """
+    info = VerifyInfo()
+    owners: List[Tuple["InstalledDist", List[Entry]]] = []
+    recorded: Dict[str, Set[str]] = {}
+    top_dirs: Dict[Tuple[str, str], "InstalledDist"] = {}
+    for dist in index.dists:
+        rows = read_record(dist.path) if dist.path.endswith(".dist-info") else None
+        if rows is None:
+            continue
+        entries: List[Entry] = []
+        seen = recorded.setdefault(dist.site_dir, set())
+        for rel, algo, digest in rows:
+            path = os.path.normpath(os.path.join(dist.site_dir, rel))
+            seen.add(path)
+            top = _top_dir(rel)
+            if top is not None:
+                top_dirs.setdefault((dist.site_dir, top), dist)
+            if algo is None and path.endswith(_SKIP_MISSING_SUFFIXES):
+                continue
+            entries.append((path, algo, digest))
+        owners.append((dist, entries))
+        info.dists += 1
+        info.files += len(entries)
+
+    caches = {s: _load_cache(_cache_path(cache_dir, s)) for s in recorded} if cache_dir is not None else {}
+    jobs = []  # (owner index, start, chunk)
+    for i, (dist, entries) in enumerate(owners):
+        for start in range(0, len(entries), _CHUNK):
+            jobs.append((i, start, entries[start : start + _CHUNK]))
+    fresh: Dict[str, Dict[str, Stamp]] = {s: {} for s in caches}
+    problems: Dict[int, Dict[str, List[str]]] = {}
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="record-hash")
+    try:
+        results = pool.map(lambda job: _check(job[2], caches.get(owners[job[0]][0].site_dir, {})), jobs)
+        for (i, start, chunk), checked in zip(jobs, results):
+            check_cancelled()
+            site = owners[i][0].site_dir
+            for (path, _, _), (status, stamp, hashed) in zip(chunk, checked):
+                info.hashed += hashed
+                if stamp is not None and site in fresh:
+                    fresh[site][path] = stamp
+                if status in ("missing", "modified"):
+                    problems.setdefault(i, {}).setdefault(status, []).append(path)
+    finally:
+        # once cancelled, chunks not yet started are dropped instead of hashed
+        pool.shutdown(wait=True, cancel_futures=True)
+    for site, files in fresh.items():
+        _save_cache(_cache_path(cache_dir, site), files)
+
+    for i, (dist, _) in enumerate(owners):
+        found = problems.get(i, {})
+        if found.get("missing"):
+            info.missing.append(_describe(dist, found["missing"]))
+        if found.get("modified"):
+            info.modified.append(_describe(dist, found["modified"]))
+    extra: Dict[str, List[str]] = {}
+    for (site, top), dist in sorted(top_dirs.items()):
+        root = os.path.join(site, top)
+        extra_files = [p for p in _walk_files(root) if p not in recorded[site]]
+        if extra_files:
+            extra.setdefault(dist.path, []).extend(extra_files)
+    for dist, _ in owners:
+        if dist.path in extra:
+            info.extra.append(_describe(dist, extra[dist.path]))
+    return info
@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import registry
+from .model import Issue, Report, to_plain
+from .registry import Detector, RunResult
+
+# Watch mode keeps the detector facts of the last run in memory and polls the
+# files each detector read. An idle cycle is one os.stat per watched path; on
+# a change only the detectors whose inputs moved, plus everything downstream
+# of them, run again.
+
+Stamp = Optional[Tuple[int, int, int]]
+
+
+def stamp(path: str) -> Stamp:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _pep668_markers(site_dirs: List[str]) -> List[str]:
+    out: List[str] = []
+    for base in site_dirs:
+        out.append(os.path.join(base, "EXTERNALLY-MANAGED"))
+        out.append(os.path.join(os.path.dirname(base), "EXTERNALLY-MANAGED"))
+    return out
+
+
+def watched_paths(project_path: Path, facts: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Detector name -> files and directories whose stat change invalidates its output.
+
+    A directory's mtime moves when entries are added, removed or renamed, which
+    covers installs and upgrades in site-packages and new executables on PATH.
+    """
+    project = str(Path(project_path).resolve())
+    pyproject = os.path.join(project, "pyproject.toml")
+    py = facts.get("python")
+    site_dirs = list(py.site_dirs) if py is not None else []
+    python_files = list(site_dirs) + _pep668_markers(site_dirs)
+    if py is not None:
+        python_files.append(py.executable)
+        if py.prefix:
+            python_files.append(os.path.join(py.prefix, "pyvenv.cfg"))
+    pip = facts.get("pip")
+    index = facts.get("path_index")
+    return {
+        "python": python_files,
+        "path_index": list(index.dirs) if index is not None else os.environ.get("PATH", "").split(os.pathsep),
+        "pip": [b.path for b in pip.binaries] if pip is not None else [],
+        "project_name": [pyproject],
+        "project": [pyproject] + site_dirs,
+        "shadowing": list(facts.get("shadowing_paths") or [project]),
+        "installed": list(site_dirs),
+        # edits inside a package leave the site directory alone; rerun with --level full instead
+        "verify": list(site_dirs),
+        "dependencies": [pyproject],
+        "startup": [pyproject] + site_dirs,
+        "imports": list(facts.get("imports_paths") or [project]) + site_dirs,
+    }
+
+
+def _issue_key(i: Issue) -> Tuple[str, Optional[str]]:
+    return (i.code, i.details)
+
+
+@dataclass
+class WatchUpdate:
+    generation: int
+    changed: List[str]
+    rerun: List[str]
+    added: List[Issue] = field(default_factory=list)
+    resolved: List[Issue] = field(default_factory=list)
+    report: Optional[Report] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "event": "update",
+            "generation": self.generation,
+            "changed": self.changed,
+            "rerun": self.rerun,
+            "added": to_plain(self.added),
+            "resolved": to_plain(self.resolved),
+            "error": self.error,
+        }
+
+
+class Watcher:
+    """A resident check: one full run, then stat polling and partial reruns."""
+
+    def __init__(
+        self,
+        project_path: Path,
+        options: Any,
+        detectors: List[Detector],
+        extra: List[Detector],
+        assemble: Callable[[RunResult], Report],
+    ) -> None:
+        self.project_path = Path(project_path)
+        self.options = options
+        self.detectors = detectors
+        self.extra = extra
+        self.assemble = assemble
+        self.result: Optional[RunResult] = None
+        self.report: Optional[Report] = None
+        self.generation = 0
+        self._stamps: Dict[str, Stamp] = {}
+        self._owners: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._responses: Dict[str, bytes] = {}
+
+    @property
+    def all_detectors(self) -> List[Detector]:
+        return self.detectors + self.extra
+
+    def start(self) -> Report:
+        result = registry.run_detectors(self.all_detectors, self._initial_facts())
+        self._publish(result)
+        return self.report  # type: ignore[return-value]
+
+    def _initial_facts(self) -> Dict[str, Any]:
+        return {"project_path": self.project_path, "options": self.options}
+
+    def _rearm(self, seen: Optional[Dict[str, Stamp]] = None) -> None:
+        # stamps taken before a rerun are kept, so a change made while it ran is seen next poll
+        seen = seen or {}
+        owners: Dict[str, List[str]] = {}
+        for name, paths in watched_paths(self.project_path, self.result.facts).items():
+            for p in paths:
+                if p:
+                    owners.setdefault(p, []).append(name)
+        self._owners = owners
+        self._stamps = {p: seen[p] if p in seen else stamp(p) for p in owners}
+
+    def _publish(self, result: RunResult, seen: Optional[Dict[str, Stamp]] = None) -> None:
+        report = self.assemble(result)
+        with self._lock:
+            self.result = result
+            self.report = report
+            self.generation += 1
+            self._responses = _responses(report, self.generation)
+        self._rearm(seen)
+
+    def current_stamps(self) -> Dict[str, Stamp]:
+        """The idle path: one stat per watched file."""
+        return {p: stamp(p) for p in self._stamps}
+
+    def poll(self) -> Optional[WatchUpdate]:
+        seen = self.current_stamps()
+        changed = [p for p, st in seen.items() if st != self._stamps[p]]
+        if not changed or self.result is None:
+            return None
+        dirty = {name for p in changed for name in self._owners.get(p, ())}
+        # plugin detectors declare no files, and failed ones may now succeed: rerun them on any change
+        dirty.update(d.name for d in self.extra)
+        dirty.update(name for name, status in self.result.status.items() if status != registry.OK)
+        rerun = registry.downstream(self.all_detectors, dirty)
+        keep = [d for d in self.all_detectors if d.name not in rerun]
+        facts = self._initial_facts()
+        for d in keep:
+            for out in d.outputs:
+                if out in self.result.facts:
+                    facts[out] = self.result.facts[out]
+        # importlib caches directory listings; make find_spec see new installs
+        importlib.invalidate_caches()
+        partial = registry.run_detectors([d for d in self.all_detectors if d.name in rerun], facts)
+        merged = registry.merge_results(self.result, partial, keep)
+
+        rerun_names = [d.name for d in self.all_detectors if d.name in rerun]
+        before = {_issue_key(i): i for i in self.report.issues} if self.report else {}
+        try:
+            self._publish(merged, seen)
+        except Exception as exc:
+            # keep serving the last good report; the next change triggers another attempt
+            self._stamps.update(seen)
+            return WatchUpdate(
+                generation=self.generation,
+                changed=sorted(changed),
+                rerun=rerun_names,
+                report=self.report,
+                error=f"{type(exc).__name__}: {exc}",
+            )
+        after = {_issue_key(i): i for i in self.report.issues}
+        return WatchUpdate(
+            generation=self.generation,
+            changed=sorted(changed),
+            rerun=rerun_names,
+            added=[i for k, i in after.items() if k not in before],
+            resolved=[i for k, i in before.items() if k not in after],
+            report=self.report,
+        )
+
+    def query(self, command: str) -> bytes:
+        with self._lock:
+            return self._responses.get(command.strip().lower(), b'{"error": "unknown command"}\n')
+
+
+def _responses(report: Report, generation: int) -> Dict[str, bytes]:
+    # serialized once per update so a socket query is a dict lookup
+    status = {"generation": generation, "generated_at": report.generated_at, "issues": len(report.issues)}
+    return {
+        "ping": b"pong\n",
+        "status": (json.dumps(status) + "\n").encode(),
+        "issues": (json.dumps(to_plain(report.issues)) + "\n").encode(),
+        "report": (json.dumps(report.to_dict()) + "\n").encode(),
+    }
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            self.wfile.write(self.server.watcher.query(line.decode("utf-8", "replace")))  # type: ignore[attr-defined]
+            self.wfile.flush()
+
+
+if hasattr(socket, "AF_UNIX"):  # the stdlib defines UnixStreamServer only there
+
+    class _QueryServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+def _is_socket(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+
+def _is_listening(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            return False
+    return True
+
+
+def remove_socket(path: str) -> None:
+    """Unlink ``path`` if it is a socket; any other file is left alone."""
+    if _is_socket(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def serve_queries(watcher: Watcher, path: str) -> socketserver.BaseServer:
+    """Answer ``ping``/``status``/``issues``/``report`` lines on a Unix socket from a daemon thread.
+
+    A stale socket at ``path`` (nobody accepts on it) is replaced; a socket another
+    watcher still listens on, or any other file there, is an error.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix domain sockets are not available on this platform")
+    if os.path.lexists(path):
+        if not _is_socket(path):
+            raise FileExistsError(f"{path} exists and is not a socket")
+        if _is_listening(path):
+            raise FileExistsError(f"another watcher is listening on {path}")
+        os.unlink(path)  # a stale socket from an earlier run
+    server = _QueryServer(path, _QueryHandler)
+    server.watcher = watcher  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, name="watch-socket", daemon=True).start()
+    return server
+
+
+def run_watch(
+    watcher: Watcher,
+    emit: Callable[[Optional[WatchUpdate]], None],
+    interval: float = 1.0,
+    cycles: Optional[int] = None,
+    started: bool = False,
+) -> None:
+    """Emit the initial report, then poll every ``interval`` seconds (forever unless ``cycles`` is set).
+
+    With ``started`` the watcher already ran and its initial report was shown.
+    """
+    if not started:
+        watcher.start()
+        emit(None)
+    n = 0
+    while cycles is None or n < cycles:
+        time.sleep(interval)
+        update = watcher.poll()
+        if update is not None:
+            emit(update)
+        n += 1
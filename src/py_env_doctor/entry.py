@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import sys
+
+# Console-script entry point. `version` and `check` with a few everyday options
+# run without importing Typer; anything else - help, completion, other
+# commands, any other option, unusual or invalid arguments - is handed to the
+# full Typer CLI, which owns all parsing errors and messages. Both paths end in
+# `runner.run_check`, so the fast path only has to parse. Even `typing` is left
+# out: annotations here are never evaluated.
+
+_VALUE_OPTIONS = {
+    "--project-path": "project_path",
+    "--format": "output_format",
+    "--output": "output_format",
+    "--fmt": "output_format",
+    "--out": "out",
+    "--level": "level",
+}
+_FLAG_OPTIONS = {
+    "--compact": "compact",
+    "--diagnostics-only": "diagnostics_only",
+    "--no-cache": "no_cache",
+}
+
+
+def _parse_check_args(args: list[str]) -> dict[str, object] | None:
+    """Options for a fast-path `check`, or None when Typer should handle the command line."""
+    opts: dict[str, object] = {"project_path": ".", "output_format": "text", "out": None, "level": "standard"}
+    opts.update(dict.fromkeys(_FLAG_OPTIONS.values(), False))
+    i = 0
+    while i < len(args):
+        name, eq, value = args[i].partition("=")
+        if name in _VALUE_OPTIONS:
+            if not eq:
+                i += 1
+                if i >= len(args):
+                    return None
+                value = args[i]
+            opts[_VALUE_OPTIONS[name]] = value
+        elif args[i] in _FLAG_OPTIONS:
+            opts[_FLAG_OPTIONS[args[i]]] = True
+        else:
+            return None
+        i += 1
+    from .core import defaults
+
+    opts["level"] = opts["level"].lower()
+    if opts["level"] not in defaults.LEVELS or opts["output_format"].lower() not in defaults.OUTPUT_FORMATS:
+        return None
+    return opts
+
+
+def _run_check(opts: dict[str, object]) -> int:
+    from pathlib import Path
+
+    from .runner import run_check
+
+    cache = None
+    if not opts["no_cache"]:
+        from .core.cache import default_cache
+
+        cache = default_cache()
+    return run_check(
+        Path(opts["project_path"]),
+        opts["output_format"],
+        Path(opts["out"]) if opts["out"] else None,
+        opts["compact"],
+        opts["level"],
+        opts["diagnostics_only"],
+        cache=cache,
+    )
+
+
+def run(argv: list[str]) -> int | None:
+    """Handle ``argv`` on the fast path; returns None when the full CLI is needed."""
+    if argv in (["version"], ["--version"]):
+        from . import __version__
+
+        sys.stdout.write(__version__ + "\n")
+        return 0
+    if argv and argv[0] == "check":
+        opts = _parse_check_args(argv[1:])
+        if opts is not None:
+            return _run_check(opts)
+    return None
+
+
+def main() -> None:
+    code = run(sys.argv[1:])
+    if code is None:
+        from .cli import main as cli_main
+
+        cli_main()
+        return
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,10 @@
-from . import json_report, text_report, markdown_report  # noqa: F401
+import importlib
+
+# Renderers load on first attribute access (PEP 562); a run only imports the one it uses.
+_SUBMODULES = {"json_report", "jsonl_report", "text_report", "markdown_report"}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
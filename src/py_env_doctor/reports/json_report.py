@@ -1,8 +1,42 @@
 from __future__ import annotations
 
 import json
-from ..core.model import Report
+from typing import TYPE_CHECKING
 
+from ..core.model import Report, FleetReport, InterpreterReport
 
-def render(report: Report) -> str:
-    return json.dumps(report.to_dict(), indent=2, sort_keys=False)
+if TYPE_CHECKING:  # pragma: no cover
+    from ..core.diff import ReportDiff
+    from ..core.watch import WatchUpdate
+
+
+def _dumps(data: object, compact: bool) -> str:
+    if compact:
+        return json.dumps(data, separators=(",", ":"))
+    return json.dumps(data, indent=2, sort_keys=False)
+
+
+def render(report: Report, compact: bool = False) -> str:
+    return _dumps(report.to_dict(), compact)
+
+
+def render_fleet(fleet: FleetReport, compact: bool = False) -> str:
+    return _dumps(fleet.to_dict(), compact)
+
+
+def render_interpreters(report: InterpreterReport, compact: bool = False) -> str:
+    return _dumps(report.to_dict(), compact)
+
+
+def render_diff(diff: "ReportDiff", compact: bool = False) -> str:
+    return _dumps(diff.to_dict(), compact)
+
+
+def load(text: str) -> Report:
+    """Parse a report written by ``render`` (compact or not) back into a Report."""
+    return Report.from_dict(json.loads(text))
+
+
+def render_watch_update(update: "WatchUpdate") -> str:
+    # one compact line per event so editors can read the stream line by line
+    return json.dumps(update.to_dict())
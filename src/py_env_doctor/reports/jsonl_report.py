@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from ..core.model import (
+    FleetReport,
+    FleetSummary,
+    InstalledInfo,
+    InterpreterEntry,
+    InterpreterReport,
+    PipInfo,
+    ProjectReport,
+    PythonInfo,
+    Report,
+    now_iso,
+    to_plain,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..core.diff import ReportDiff
+    from ..core.watch import WatchUpdate
+
+# JSON Lines: one compact object per line. Multi-target runs write a header
+# line, one line per project or interpreter as it completes, then a summary,
+# flushing after each so consumers can start before the run ends.
+
+Record = Dict[str, Any]
+
+
+def _line(record: Record) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def write_records(records: Iterable[Record], stream: TextIO) -> int:
+    """Write each record as one line and flush; returns the number of lines written."""
+    n = 0
+    for record in records:
+        stream.write(_line(record))
+        stream.flush()
+        n += 1
+    return n
+
+
+def fleet_records(
+    python: PythonInfo,
+    pip: PipInfo,
+    installed: Optional[InstalledInfo],
+    projects: Iterable[ProjectReport],
+    generated_at: Optional[str] = None,
+) -> Iterator[Record]:
+    yield {
+        "type": "py_env_doctor_fleet_report",
+        "generated_at": generated_at or now_iso(),
+        "python": to_plain(python),
+        "pip": to_plain(pip),
+        "installed": to_plain(installed),
+    }
+    summary = FleetSummary()
+    for result in projects:
+        summary.add(result)
+        yield {"type": "project", **to_plain(result)}
+    yield {"type": "summary", **to_plain(summary.sort_counts())}
+
+
+def interpreter_records(
+    entries: Iterable[Tuple[InterpreterEntry, Optional[str]]],
+    generated_at: Optional[str] = None,
+) -> Iterator[Record]:
+    """Records for ``(entry, duplicate_of)`` pairs; a duplicate names the entry it aliases."""
+    yield {"type": "py_env_doctor_interpreter_report", "generated_at": generated_at or now_iso()}
+    total = failed = duplicates = 0
+    for entry, duplicate_of in entries:
+        total += 1
+        record = {"type": "interpreter", **to_plain(entry)}
+        if entry.error:
+            failed += 1
+        duplicates += len(entry.duplicates)  # already collapsed when rendering a finished report
+        if duplicate_of:
+            duplicates += 1
+            record["duplicate_of"] = duplicate_of
+        yield record
+    yield {"type": "summary", "interpreters": total, "failed": failed, "duplicates": duplicates}
+
+
+def render(report: Report) -> str:
+    return _line(report.to_dict()).rstrip("\n")
+
+
+def render_fleet(fleet: FleetReport) -> str:
+    records = fleet_records(fleet.python, fleet.pip, fleet.installed, fleet.projects, fleet.generated_at)
+    return "".join(_line(r) for r in records).rstrip("\n")
+
+
+def render_interpreters(report: InterpreterReport) -> str:
+    records = interpreter_records(((e, None) for e in report.interpreters), report.generated_at)
+    return "".join(_line(r) for r in records).rstrip("\n")
+
+
+def render_watch_update(update: "WatchUpdate") -> str:
+    return _line(update.to_dict()).rstrip("\n")
+
+
+def render_diff(diff: "ReportDiff") -> str:
+    return _line(diff.to_dict()).rstrip("\n")
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
-from ..core.model import Report, Issue, AdviceItem
+from ..core.model import Report, Issue, AdviceItem, FleetReport, InstalledInfo, InterpreterReport, PipInfo, ProjectInfo, PythonInfo, StartupInfo, Timings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..core.diff import ReportDiff
+    from ..core.watch import WatchUpdate
 
 
 def _h1(text: str) -> str:
@@ -25,15 +29,8 @@ def _block(lines: List[str]) -> str:
     return "".join(lines) + "\n"
 
 
-def render(report: Report) -> str:
-    py = report.python
-    pip = report.pip
-    proj = report.project
-
-    out: List[str] = []
-    out.append(_h1("py-env-doctor: environment check"))
-
-    out.append(_h2("Python"))
+def _python(py: PythonInfo) -> str:
+    out: List[str] = [_h2("Python")]
     out.append(_li(f"Executable: {py.executable}"))
     out.append(_li(f"Version: {py.version}"))
     plat = f"{py.platform.system} ({py.platform.distro or py.platform.release})"
@@ -41,22 +38,28 @@ def render(report: Report) -> str:
     out.append(_li(f"Environment: {py.environment_type}"))
     out.append(_li(f"PEP 668: {'EXTERNALLY MANAGED' if py.pep668_externally_managed else 'No'}"))
     out.append("\n")
+    return "".join(out)
 
-    out.append(_h2("pip"))
+
+def _pip(pip: PipInfo) -> str:
+    out: List[str] = [_h2("pip")]
     if not pip.binaries:
         out.append(_li("No pip binaries found on PATH"))
     else:
         for b in pip.binaries:
-            ver = b.python_version or "?"
-            out.append(_li(f"{_code(b.name)} on PATH: {b.path} -> Python {ver}"))
+            ver = "probe timed out" if b.timed_out else f"Python {b.python_version or '?'}"
+            out.append(_li(f"{_code(b.name)} on PATH: {b.path} -> {ver}"))
     if pip.mismatches:
         out.append("\n")
         out.append("Mismatches:\n")
         for m in pip.mismatches:
             out.append(_li(m))
     out.append("\n")
+    return "".join(out)
 
-    out.append(_h2("Project"))
+
+def _project(proj: ProjectInfo) -> str:
+    out: List[str] = [_h2("Project")]
     out.append(_li(f"Path: {proj.path}"))
     out.append(_li(f"pyproject.toml: {'found' if proj.pyproject else 'not found'}"))
     if proj.project_name:
@@ -65,7 +68,92 @@ def render(report: Report) -> str:
         out.append(_li(f"package importable: {'yes' if proj.package_importable else 'no'}"))
     if proj.shadowing:
         out.append(_li(f"shadowing: {', '.join(proj.shadowing)}"))
+    deps = proj.dependencies
+    if deps is not None:
+        problems = len(deps.missing) + len(deps.mismatched)
+        out.append(_li(f"dependencies: {deps.checked} checked, {problems} problem(s)"))
+        for label, items in (("missing", deps.missing), ("wrong version", deps.mismatched), ("invalid", deps.invalid)):
+            for item in items:
+                out.append(f"  - {label}: {_code(item)}\n")
+    imports = proj.imports
+    if imports is not None:
+        problems = len(imports.unresolved) + len(imports.shadowed)
+        out.append(_li(f"imports: {imports.modules} module(s) in {imports.files} file(s), {problems} problem(s)"))
+        for label, items in (("unresolved", imports.unresolved), ("shadowed", imports.shadowed), ("unparsable", imports.parse_errors)):
+            for item in items:
+                out.append(f"  - {label}: {_code(item)}\n")
+    out.append("\n")
+    return "".join(out)
+
+
+def _installed(installed: Optional[InstalledInfo]) -> str:
+    if installed is None:
+        return ""
+    out: List[str] = [_h2("Installed")]
+    out.append(_li(f"Distributions: {installed.distributions}"))
+    for c in installed.conflicts:
+        out.append(_li(f"duplicate metadata: {c}"))
+    for sh in installed.shadowed:
+        out.append(_li(f"shadowed: {sh}"))
+    verify = installed.verify
+    if verify is not None:
+        problems = len(verify.missing) + len(verify.modified) + len(verify.extra)
+        out.append(_li(f"RECORD check: {verify.files} file(s) in {verify.dists} distribution(s), {problems} problem(s)"))
+        for label, items in (("missing", verify.missing), ("modified", verify.modified), ("extra", verify.extra)):
+            for item in items:
+                out.append(f"  - {label}: {_code(item)}\n")
     out.append("\n")
+    return "".join(out)
+
+
+def _startup(startup: Optional[StartupInfo]) -> str:
+    if startup is None:
+        return ""
+    out: List[str] = [_h2("Startup")]
+    what = f"import {_code(startup.import_name)}" if startup.import_name else "start with site"
+    if startup.error:
+        out.append(_li(f"{what}: failed: {_code(startup.error)}"))
+    else:
+        out.append(_li(f"bare start (-S): {startup.bare_ms:.1f} ms"))
+        out.append(_li(f"{what}: {startup.total_ms:.1f} ms (+{startup.overhead_ms:.1f} ms, imports {startup.imports_ms:.1f} ms)"))
+    for s in startup.slowest:
+        out.append(f"  - slowest: {_code(s)}\n")
+    out.append(_li(f".pth files: {startup.pth_files}, {len(startup.pth_exec)} executable line(s)"))
+    for line in startup.pth_exec:
+        out.append(f"  - runs: {_code(line)}\n")
+    out.append("\n")
+    return "".join(out)
+
+
+def _timings(timings: Optional[Timings]) -> str:
+    if timings is None:
+        return ""
+    out: List[str] = [_h2("Timings")]
+    out.append(f"Total: {timings.total_ms:.1f} ms\n\n")
+    if not timings.counted:
+        out.append("| Step | ms | Status |\n")
+        out.append("|---|---:|---|\n")
+        for t in timings.steps:
+            out.append(f"| {t.name} | {t.ms:.1f} | {t.status} |\n")
+        out.append("\n")
+        return "".join(out)
+    out.append("| Step | ms | Status | Subprocesses | Files opened | Dirs scanned |\n")
+    out.append("|---|---:|---|---:|---:|---:|\n")
+    for t in timings.steps:
+        out.append(f"| {t.name} | {t.ms:.1f} | {t.status} | {t.subprocesses} | {t.files_opened} | {t.dirs_scanned} |\n")
+    out.append("\n")
+    return "".join(out)
+
+
+def render(report: Report) -> str:
+    out: List[str] = []
+    out.append(_h1("py-env-doctor: environment check"))
+
+    out.append(_python(report.python))
+    out.append(_pip(report.pip))
+    out.append(_project(report.project))
+    out.append(_installed(report.installed))
+    out.append(_startup(report.startup))
 
     out.append(_h2("Common issues detected"))
     if not report.issues:
@@ -86,4 +174,92 @@ def render(report: Report) -> str:
                 out.append(f"    {step}\n")
             out.append("\n")
 
+    out.append(_timings(report.timings))
+    return "".join(out)
+
+
+def render_fleet(fleet: FleetReport) -> str:
+    out: List[str] = []
+    out.append(_h1("py-env-doctor: fleet scan"))
+
+    out.append(_python(fleet.python))
+    out.append(_pip(fleet.pip))
+    out.append(_installed(fleet.installed))
+
+    out.append(_h2("Projects"))
+    out.append("| Project | Name | Issues |\n|---|---|---|\n")
+    for r in fleet.projects:
+        if r.error:
+            issues = f"failed: {r.error}"
+        else:
+            issues = ", ".join(_code(i.code) for i in r.issues) or "none"
+        out.append(f"| {r.project.path} | {r.project.project_name or '-'} | {issues} |\n")
+    out.append("\n")
+
+    s = fleet.summary
+    out.append(_h2("Fleet summary"))
+    out.append(_li(f"Projects: {s.projects}"))
+    out.append(_li(f"With issues: {s.projects_with_issues}"))
+    if s.failed:
+        out.append(_li(f"Failed: {s.failed}"))
+    for code, count in s.issue_counts.items():
+        out.append(_li(f"{_code(code)}: {count}"))
+    out.append("\n")
+
+    return "".join(out)
+
+
+def render_interpreters(report: InterpreterReport) -> str:
+    out: List[str] = []
+    out.append(_h1("py-env-doctor: interpreters"))
+    out.append("| Interpreter | Version | Implementation | Environment | PEP 668 | Status |\n")
+    out.append("|---|---|---|---|---|---|\n")
+    for e in report.interpreters:
+        py = e.python
+        if py is None:
+            status = "timed out" if e.timed_out else f"failed: {e.error}"
+            out.append(f"| {_code(e.path)} | ? | ? | ? | ? | {status} |\n")
+            continue
+        status = "ok"
+        if e.duplicates:
+            status = "ok, aliases: " + ", ".join(_code(d) for d in e.duplicates)
+        pep668 = "yes" if py.pep668_externally_managed else "no"
+        out.append(
+            f"| {_code(e.path)} | {py.version} | {py.implementation} | {py.environment_type} | {pep668} | {status} |\n"
+        )
+    out.append("\n")
+    return "".join(out)
+
+
+def render_watch_update(update: "WatchUpdate") -> str:
+    out: List[str] = [_h2(f"Update {update.generation}")]
+    out += [_li(f"changed: {_code(p)}") for p in update.changed]
+    out.append(_li(f"reran: {', '.join(update.rerun) or 'nothing'}"))
+    out += [_li(f"new: {i.code} ({i.severity})" + (f": {i.details}" if i.details else "")) for i in update.added]
+    out += [_li(f"resolved: {i.code} ({i.severity})") for i in update.resolved]
+    if update.error:
+        out.append(_li(f"re-check failed, keeping the previous report: {update.error}"))
+    out.append("\n")
+    return "".join(out)
+
+
+def render_diff(diff: "ReportDiff") -> str:
+    out: List[str] = [_h1("py-env-doctor report diff")]
+    if diff.empty:
+        out.append("No differences.\n")
+        return "".join(out)
+    if diff.added_projects or diff.removed_projects:
+        out.append(_h2("Projects"))
+        out += [_li(f"added: {_code(p)}") for p in diff.added_projects]
+        out += [_li(f"removed: {_code(p)}") for p in diff.removed_projects]
+        out.append("\n")
+    for t in diff.targets:
+        if t.empty:
+            continue
+        out.append(_h2(t.target))
+        out += [_li(f"new: {i.code} ({i.severity})" + (f": {i.details}" if i.details else "")) for i in t.added]
+        out += [_li(f"resolved: {i.code} ({i.severity})") for i in t.resolved]
+        out += [_li(f"changed {_code(c.field)}: {c.old} -> {c.new}") for c in t.changes]
+        out.append("\n")
+    out.append(f"**{len(diff.added_issues)} new issue(s), {len(diff.resolved_issues)} resolved**\n")
     return "".join(out)
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 
-from ..core.model import Report, Issue, AdviceItem
+from ..core.model import Report, Issue, AdviceItem, FleetReport, InstalledInfo, InterpreterReport, PipInfo, ProjectInfo, PythonInfo, StartupInfo, Timings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..core.diff import ReportDiff
+    from ..core.watch import WatchUpdate
 
 
 def _section(title: str) -> str:
@@ -39,37 +43,36 @@ def _advice(items: List[AdviceItem]) -> str:
     return "".join(out)
 
 
-def render(report: Report) -> str:
-    py = report.python
-    pip = report.pip
-    proj = report.project
-
-    parts: List[str] = []
-    parts.append("py-env-doctor: environment check\n\n")
-
-    parts.append("[Python]\n")
+def _python(py: PythonInfo) -> str:
+    parts: List[str] = ["[Python]\n"]
     parts.append(_kv("Executable", py.executable))
     parts.append(_kv("Version", py.version))
     parts.append(_kv("Platform", f"{py.platform.system} ({py.platform.distro or py.platform.release})"))
     parts.append(_kv("Environment", py.environment_type))
     parts.append(_kv("PEP 668", "EXTERNALLY MANAGED" if py.pep668_externally_managed else "No"))
     parts.append("\n")
+    return "".join(parts)
 
-    parts.append("[pip]\n")
+
+def _pip(pip: PipInfo) -> str:
+    parts: List[str] = ["[pip]\n"]
     if not pip.binaries:
         parts.append("- No pip binaries found on PATH\n\n")
     else:
         for b in pip.binaries:
-            ver = b.python_version or "?"
-            parts.append(f"- `{b.name}` on PATH: {b.path} -> Python {ver}\n")
+            ver = "probe timed out" if b.timed_out else f"Python {b.python_version or '?'}"
+            parts.append(f"- `{b.name}` on PATH: {b.path} -> {ver}\n")
         parts.append("\n")
     if pip.mismatches:
         parts.append("Mismatches:\n")
         for m in pip.mismatches:
             parts.append(f"- {m}\n")
         parts.append("\n")
+    return "".join(parts)
 
-    parts.append("[Project]\n")
+
+def _project(proj: ProjectInfo) -> str:
+    parts: List[str] = ["[Project]\n"]
     parts.append(_kv("Path", proj.path))
     parts.append(_kv("pyproject.toml", "found" if proj.pyproject else "not found"))
     if proj.project_name:
@@ -78,9 +81,186 @@ def render(report: Report) -> str:
         parts.append(_kv("package importable", "yes" if proj.package_importable else "no"))
     if proj.shadowing:
         parts.append(_kv("shadowing", ", ".join(proj.shadowing)))
+    deps = proj.dependencies
+    if deps is not None:
+        problems = len(deps.missing) + len(deps.mismatched)
+        parts.append(_kv("dependencies", f"{deps.checked} checked, {problems} problem(s)"))
+        for label, items in (("missing", deps.missing), ("wrong version", deps.mismatched), ("invalid", deps.invalid)):
+            for item in items:
+                parts.append(f"    {label}: {item}\n")
+    imports = proj.imports
+    if imports is not None:
+        problems = len(imports.unresolved) + len(imports.shadowed)
+        parts.append(_kv("imports", f"{imports.modules} module(s) in {imports.files} file(s), {problems} problem(s)"))
+        for label, items in (("unresolved", imports.unresolved), ("shadowed", imports.shadowed), ("unparsable", imports.parse_errors)):
+            for item in items:
+                parts.append(f"    {label}: {item}\n")
     parts.append("\n")
+    return "".join(parts)
+
+
+def _installed(installed: Optional[InstalledInfo]) -> str:
+    if installed is None:
+        return ""
+    parts: List[str] = ["[Installed]\n"]
+    parts.append(_kv("Distributions", str(installed.distributions)))
+    for c in installed.conflicts:
+        parts.append(_kv("duplicate metadata", c))
+    for sh in installed.shadowed:
+        parts.append(_kv("shadowed", sh))
+    verify = installed.verify
+    if verify is not None:
+        problems = len(verify.missing) + len(verify.modified) + len(verify.extra)
+        parts.append(_kv("RECORD check", f"{verify.files} file(s) in {verify.dists} distribution(s), {problems} problem(s)"))
+        for label, items in (("missing", verify.missing), ("modified", verify.modified), ("extra", verify.extra)):
+            for item in items:
+                parts.append(f"    {label}: {item}\n")
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _startup(startup: Optional[StartupInfo]) -> str:
+    if startup is None:
+        return ""
+    parts: List[str] = ["[Startup]\n"]
+    what = f"import {startup.import_name}" if startup.import_name else "start with site"
+    if startup.error:
+        parts.append(_kv(what, f"failed: {startup.error}"))
+    else:
+        parts.append(_kv("bare start (-S)", f"{startup.bare_ms:.1f} ms"))
+        parts.append(_kv(what, f"{startup.total_ms:.1f} ms (+{startup.overhead_ms:.1f} ms, imports {startup.imports_ms:.1f} ms)"))
+    for s in startup.slowest:
+        parts.append(f"    slowest: {s}\n")
+    parts.append(_kv(".pth files", f"{startup.pth_files}, {len(startup.pth_exec)} executable line(s)"))
+    for line in startup.pth_exec:
+        parts.append(f"    runs: {line}\n")
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _timings(timings: Optional[Timings]) -> str:
+    if timings is None:
+        return ""
+    parts: List[str] = ["[Timings]\n"]
+    parts.append(_kv("total", f"{timings.total_ms:.1f} ms"))
+    for t in timings.steps:
+        counts = ""
+        if timings.counted:
+            counts = f" ({t.subprocesses} subprocesses, {t.files_opened} files opened, {t.dirs_scanned} dirs scanned)"
+        status = "" if t.status == "ok" else f" [{t.status}]"
+        parts.append(_kv(t.name, f"{t.ms:.1f} ms{counts}{status}"))
+    parts.append("\n")
+    return "".join(parts)
+
+
+def render(report: Report) -> str:
+    parts: List[str] = []
+    parts.append("py-env-doctor: environment check\n\n")
+
+    parts.append(_python(report.python))
+    parts.append(_pip(report.pip))
+    parts.append(_project(report.project))
+    parts.append(_installed(report.installed))
+    parts.append(_startup(report.startup))
 
     parts.append(_issues(report.issues))
     parts.append(_advice(report.advice))
+    parts.append(_timings(report.timings))
 
     return "".join(parts)
+
+
+def render_fleet(fleet: FleetReport) -> str:
+    parts: List[str] = []
+    parts.append("py-env-doctor: fleet scan\n\n")
+
+    parts.append(_python(fleet.python))
+    parts.append(_pip(fleet.pip))
+    parts.append(_installed(fleet.installed))
+
+    for idx, r in enumerate(fleet.projects, start=1):
+        name = r.project.project_name or "-"
+        if r.error:
+            parts.append(f"[{idx}] {r.project.path} ({name}): FAILED {r.error}\n")
+            continue
+        codes = ", ".join(i.code for i in r.issues) or "ok"
+        parts.append(f"[{idx}] {r.project.path} ({name}): {codes}\n")
+    if fleet.projects:
+        parts.append("\n")
+
+    s = fleet.summary
+    parts.append("[Fleet summary]\n")
+    parts.append(_kv("Projects", str(s.projects)))
+    parts.append(_kv("With issues", str(s.projects_with_issues)))
+    if s.failed:
+        parts.append(_kv("Failed", str(s.failed)))
+    for code, count in s.issue_counts.items():
+        parts.append(f"- {code}: {count}\n")
+    parts.append("\n")
+
+    return "".join(parts)
+
+
+def render_interpreters(report: InterpreterReport) -> str:
+    header = ("Interpreter", "Version", "Impl", "Environment", "PEP 668", "Status")
+    rows = []
+    for e in report.interpreters:
+        py = e.python
+        if py is None:
+            status = "timed out" if e.timed_out else f"failed: {e.error}"
+            rows.append((e.path, "?", "?", "?", "?", status))
+            continue
+        status = "ok"
+        if e.duplicates:
+            status = f"ok (+{len(e.duplicates)} aliases)"
+        rows.append(
+            (e.path, py.version, py.implementation, py.environment_type, "yes" if py.pep668_externally_managed else "no", status)
+        )
+    widths = [max(len(str(r[i])) for r in [header, *rows]) for i in range(len(header))]
+
+    def line(cols) -> str:
+        return "  ".join(str(c).ljust(w) for c, w in zip(cols, widths)).rstrip() + "\n"
+
+    parts: List[str] = ["py-env-doctor: interpreters\n\n"]
+    parts.append(line(header))
+    parts.append(line(["-" * w for w in widths]))
+    for r in rows:
+        parts.append(line(r))
+    parts.append(f"\n{len(report.interpreters)} interpreter(s)\n")
+    return "".join(parts)
+
+
+def render_watch_update(update: "WatchUpdate") -> str:
+    lines = [f"[watch] update {update.generation}: {len(update.changed)} changed path(s)"]
+    lines += [f"- changed: {p}" for p in update.changed]
+    lines.append(f"- reran: {', '.join(update.rerun) or 'nothing'}")
+    lines += [f"+ {i.code} ({i.severity})" + (f": {i.details}" if i.details else "") for i in update.added]
+    lines += [f"- resolved {i.code} ({i.severity})" for i in update.resolved]
+    if update.error:
+        lines.append(f"! re-check failed, keeping the previous report: {update.error}")
+    return "\n".join(lines) + "\n"
+
+
+def _change(field: str, old, new) -> str:
+    if field == "project.shadowing":
+        return f"~ shadowing: added {', '.join(new) or 'none'}; removed {', '.join(old) or 'none'}"
+    return f"~ {field}: {old if old is not None else '(none)'} -> {new if new is not None else '(none)'}"
+
+
+def render_diff(diff: "ReportDiff") -> str:
+    lines = ["py-env-doctor: report diff", ""]
+    if diff.empty:
+        lines.append("No differences.")
+        return "\n".join(lines) + "\n"
+    lines += [f"+ project {p}" for p in diff.added_projects]
+    lines += [f"- project {p}" for p in diff.removed_projects]
+    for t in diff.targets:
+        if t.empty:
+            continue
+        lines.append(f"[{t.target}]")
+        lines += [f"+ {i.code} ({i.severity})" + (f": {i.details}" if i.details else "") for i in t.added]
+        lines += [f"- resolved {i.code} ({i.severity})" for i in t.resolved]
+        lines += [_change(c.field, c.old, c.new) for c in t.changes]
+        lines.append("")
+    lines.append(f"{len(diff.added_issues)} new issue(s), {len(diff.resolved_issues)} resolved")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,556 @@
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .core.defaults import BASIC_TIME_BUDGET, PIP_PROBE_TIMEOUT, PIP_PROBE_WORKERS
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .core.cache import DiskCache
+    from .core.diff import ReportDiff
+    from .core.fleet import ScanContext
+    from .core.model import FleetReport, Issue, Report
+    from .core.registry import Detector, RunResult
+    from .core.watch import Watcher
+
+# Orchestration shared by the Typer CLI and the typer-free fast entry point.
+# Detectors and renderers are imported where they are used, so a run only pays
+# for the modules its output actually needs.
+
+_RENDERERS = {
+    "json": "json_report",
+    "jsonl": "jsonl_report",
+    "md": "markdown_report",
+    "markdown": "markdown_report",
+    "text": "text_report",
+}
+
+
+def renderer(output_format: str):
+    """The report module for ``output_format``; unknown formats fall back to text."""
+    name = _RENDERERS.get(output_format.lower(), "text_report")
+    return importlib.import_module(f".reports.{name}", __package__)
+
+
+def write_output(output: str, out: Optional[Path]) -> None:
+    if out:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(output, encoding="utf-8")
+    else:
+        sys.stdout.write(output + "\n")
+        sys.stdout.flush()
+
+
+@contextmanager
+def stream_output(out: Optional[Path]) -> Iterator[TextIO]:
+    """A text stream for incremental output: the ``out`` file, or stdout."""
+    if not out:
+        yield sys.stdout
+        return
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        yield f
+
+
+def plan_detectors(
+    target_python: Optional[str] = None,
+    detector_timeout: Optional[float] = None,
+    plugins: bool = True,
+    level: str = "standard",
+    pip_probe: str = "static",
+) -> Tuple[List["Detector"], List["Detector"], Dict[str, str]]:
+    """Built-in and extra (registered and entry-point) detectors allowed at ``level``, and plugin load errors."""
+    from .core import registry
+    from .core.detectors import builtin_detectors, for_level
+
+    detectors = builtin_detectors(
+        target_python=bool(target_python), timeout=detector_timeout, level=level, pip_probe=pip_probe
+    )
+    extra = registry.registered_detectors()
+    load_errors: Dict[str, str] = {}
+    if plugins:
+        found, load_errors = registry.load_entry_point_detectors()
+        extra += found
+    extra = for_level(extra, level)
+    if detector_timeout:
+        extra = [d if d.timeout is not None else replace(d, timeout=detector_timeout) for d in extra]
+    return detectors, extra, load_errors
+
+
+def fit_time_budget(
+    detectors: List["Detector"], extra: List["Detector"], budget: float
+) -> Tuple[List["Detector"], List["Detector"], List["Detector"]]:
+    """Built-in and extra detectors that fit ``budget`` seconds, plus the ones left out.
+
+    Selection uses the estimated critical path (see ``registry.select_within_budget``);
+    the interpreter detector is always kept.
+    """
+    from .core import registry
+    from .core.detectors import REQUIRED
+
+    kept, left_out = registry.select_within_budget(detectors + extra, budget * 1000, REQUIRED)
+    names = {d.name for d in kept}
+    return [d for d in detectors if d.name in names], [d for d in extra if d.name in names], left_out
+
+
+def assemble_report(
+    project_path: Path,
+    result: "RunResult",
+    detectors: List["Detector"],
+    extra: List["Detector"],
+    load_errors: Dict[str, str],
+    diagnostics_only: bool = False,
+    started_ns: Optional[int] = None,
+    detector_timeout: Optional[float] = None,
+    over_budget: Sequence["Detector"] = (),
+    time_budget: Optional[float] = None,
+    deadline: Optional[float] = None,
+    target_python: Optional[str] = None,
+    count_io: bool = False,
+) -> "Report":
+    """Turn detector facts into a Report; raises when the interpreter facts are missing.
+
+    ``over_budget`` detectors were left out to fit ``time_budget``: they are
+    listed as skipped steps and in a ``DETECTORS_SKIPPED`` issue. Detectors cut
+    off by the run's ``deadline`` go into a ``DEADLINE_EXCEEDED`` issue, and if
+    the interpreter detector was among them, the report carries the facts that
+    cost nothing to read instead. ``count_io`` says whether the detectors ran
+    with I/O counting, and counts the evaluation step the same way.
+    """
+    from .core import advice, registry
+    from .core.installed import summarize_installed
+    from .core.model import Issue, PipInfo, ProjectInfo, Report, TimingEntry, Timings, now_iso
+    from .core.timing import measure
+
+    facts = result.facts
+    # without interpreter facts there is nothing to report on
+    if "python" in result.errors:
+        raise result.errors["python"]
+    if "python" in facts:
+        py_info = facts["python"]
+    elif "python" in result.unfinished:
+        from .core.detect_python import fallback_python_info
+
+        py_info = fallback_python_info(target_python)
+    else:
+        from .core.probe import ProbeError
+
+        raise ProbeError(f"timed out after {detector_timeout}s", timed_out=True)
+    pip_info = facts.get("pip") or PipInfo()
+    proj_info = facts.get("project")
+    if proj_info is None:
+        proj_info = ProjectInfo(path=str(Path(project_path).resolve()), pyproject=False)
+    else:
+        proj_info = replace(proj_info)  # facts may be reused by a later partial run
+    proj_info.shadowing = facts.get("shadowing") or []
+    proj_info.dependencies = facts.get("dependencies")
+    proj_info.imports = facts.get("imports")
+    index = facts.get("installed_index")
+    installed = summarize_installed(index) if index is not None else None
+    if installed is not None:
+        installed.verify = facts.get("verify")
+
+    steps = [
+        result.timings.get(d.name) or TimingEntry(name=d.name, ms=0.0, status=result.status.get(d.name, registry.SKIPPED))
+        for d in detectors + extra
+    ] + [TimingEntry(name=d.name, ms=0.0, status=registry.SKIPPED) for d in over_budget]
+    with measure("evaluate", steps, count_io):
+        issues = advice.evaluate_issues(py_info, pip_info, proj_info, installed, facts.get("startup"))
+        for d in extra:
+            if d.produces_issues and d.outputs and isinstance(facts.get(d.outputs[0]), list):
+                issues.extend(i for i in facts[d.outputs[0]] if isinstance(i, Issue))
+        failed = [f"{name}: could not load ({err})" for name, err in sorted(load_errors.items())]
+        for name, status in result.status.items():
+            if name in result.unfinished:
+                continue
+            if status == registry.ERROR:
+                exc = result.errors[name]
+                failed.append(f"{name}: {type(exc).__name__}: {exc}")
+            elif status == registry.TIMED_OUT:
+                failed.append(f"{name}: timed out")
+            elif status == registry.SKIPPED:
+                failed.append(f"{name}: skipped, an input is missing")
+        if failed:
+            issues.append(Issue(code="DETECTOR_FAILED", severity="warning", details="; ".join(failed)))
+        if result.unfinished:
+            names = ", ".join(d.name for d in detectors + extra if d.name in result.unfinished)
+            issues.append(
+                Issue(code="DEADLINE_EXCEEDED", severity="warning", details=f"{names} (unfinished after the {deadline:g}s deadline)")
+            )
+        if over_budget:
+            names = ", ".join(d.name for d in over_budget)
+            issues.append(
+                Issue(code="DETECTORS_SKIPPED", severity="info", details=f"{names} (over the {time_budget:g}s time budget)")
+            )
+        adv = [] if diagnostics_only else advice.make_advice(py_info, pip_info, proj_info, issues)
+
+    if started_ns is not None:
+        total_ms = round((time.perf_counter_ns() - started_ns) / 1_000_000, 3)
+    else:
+        total_ms = round(sum(t.ms for t in steps), 3)
+    return Report(
+        type="py_env_doctor_report",
+        generated_at=now_iso(),
+        python=py_info,
+        pip=pip_info,
+        project=proj_info,
+        issues=issues,
+        advice=adv,
+        installed=installed,
+        startup=facts.get("startup"),
+        timings=Timings(total_ms=total_ms, steps=steps, counted=count_io),
+    )
+
+
+def build_report(
+    project_path: Path,
+    level: str = "standard",
+    diagnostics_only: bool = False,
+    probe_timeout: float = PIP_PROBE_TIMEOUT,
+    probe_workers: int = PIP_PROBE_WORKERS,
+    pip_probe: str = "static",
+    cache: Optional["DiskCache"] = None,
+    target_python: Optional[str] = None,
+    detector_timeout: Optional[float] = None,
+    plugins: bool = True,
+    incremental: bool = False,
+    state_path: Optional[Path] = None,
+    time_budget: Optional[float] = None,
+    deadline: Optional[float] = None,
+    count_io: bool = False,
+) -> "Report":
+    """Run the detectors ``level`` allows and assemble the report.
+
+    ``level="basic"`` runs no tree walks and no subprocesses besides a
+    ``--python`` probe, within ``BASIC_TIME_BUDGET`` unless ``time_budget``
+    says otherwise. With a time budget, detectors whose estimated cost does
+    not fit are skipped. ``deadline`` (seconds) bounds the run itself: what
+    has not finished by then is reported as timed out. At ``basic`` the
+    budget doubles as the deadline unless one is given, so the estimate is
+    also enforced. ``count_io`` adds per-step subprocess and file counts
+    (see ``registry.run_detectors``).
+    """
+    from .core import registry
+    from .core.detectors import CheckOptions
+
+    start = time.perf_counter_ns()
+    level = level.lower()
+    if level == "basic":
+        if time_budget is None:
+            time_budget = BASIC_TIME_BUDGET
+        if deadline is None:
+            deadline = time_budget
+    ends_at = time.monotonic() + deadline if deadline else None
+    detectors, extra, load_errors = plan_detectors(target_python, detector_timeout, plugins, level, pip_probe)
+    over_budget: List["Detector"] = []
+    if time_budget:
+        detectors, extra, over_budget = fit_time_budget(detectors, extra, time_budget)
+    options = CheckOptions(
+        probe_timeout=probe_timeout,
+        probe_workers=probe_workers,
+        pip_probe=pip_probe,
+        cache=cache,
+        target_python=target_python,
+        allow_subprocess=level != "basic",
+    )
+    facts = {"project_path": project_path, "options": options}
+    reused: Dict[str, str] = {}
+    if incremental:
+        from .core import incremental as inc
+
+        key = inc.state_key(project_path, options)
+        state_path = state_path or inc.default_state_path(key)
+        saved, reused = inc.reusable(inc.load_state(state_path, key), detectors, project_path, options)
+        facts.update(saved)
+    todo = [d for d in detectors if d.name not in reused] + extra
+    result = registry.run_detectors(todo, facts, deadline=ends_at, count_io=count_io)
+    for name in reused:
+        result.status[name] = registry.REUSED
+    report = assemble_report(
+        project_path,
+        result,
+        detectors,
+        extra,
+        load_errors,
+        diagnostics_only,
+        start,
+        detector_timeout,
+        over_budget,
+        time_budget,
+        deadline,
+        target_python,
+        count_io,
+    )
+    if incremental:
+        inc.save_state(state_path, key, detectors, result.status, result.facts, reused, project_path, options)
+    return report
+
+
+def build_watcher(
+    project_path: Path,
+    diagnostics_only: bool = False,
+    probe_timeout: float = PIP_PROBE_TIMEOUT,
+    probe_workers: int = PIP_PROBE_WORKERS,
+    pip_probe: str = "static",
+    cache: Optional["DiskCache"] = None,
+    target_python: Optional[str] = None,
+    detector_timeout: Optional[float] = None,
+    plugins: bool = True,
+) -> "Watcher":
+    from .core.detectors import CheckOptions
+    from .core.watch import Watcher
+
+    detectors, extra, load_errors = plan_detectors(target_python, detector_timeout, plugins, pip_probe=pip_probe)
+    options = CheckOptions(
+        probe_timeout=probe_timeout,
+        probe_workers=probe_workers,
+        pip_probe=pip_probe,
+        cache=cache,
+        target_python=target_python,
+    )
+
+    def assemble(result: "RunResult") -> "Report":
+        return assemble_report(
+            project_path, result, detectors, extra, load_errors, diagnostics_only, detector_timeout=detector_timeout
+        )
+
+    return Watcher(project_path, options, detectors, extra, assemble)
+
+
+def render_with(func, obj, output_format: str, compact: bool = False) -> str:
+    """Call a renderer function, asking for compact output when the format is JSON."""
+    if compact and output_format.lower() == "json":
+        return func(obj, compact=True)
+    return func(obj)
+
+
+def render_report(report: "Report", output_format: str, compact: bool = False) -> str:
+    """Render ``report``, recording the render step in its timings for later consumers.
+
+    ``compact`` drops indentation from JSON output; other formats ignore it.
+    """
+    from .core.timing import measure
+
+    mod = renderer(output_format)
+    if report.timings is None:
+        return render_with(mod.render, report, output_format, compact)
+    with measure("render", report.timings.steps, report.timings.counted):
+        output = render_with(mod.render, report, output_format, compact)
+    report.timings.total_ms = round(report.timings.total_ms + report.timings.steps[-1].ms, 3)
+    return output
+
+
+def compare_to_baseline(
+    report: "Report", baseline: Optional[Path], fail_on: Sequence[str] = ()
+) -> Tuple[Optional["ReportDiff"], List["Issue"]]:
+    """The diff against ``baseline`` (None without one) and the new issues whose severity is in ``fail_on``.
+
+    Without a baseline every issue in ``report`` counts as new.
+    """
+    if baseline is None:
+        return None, [i for i in report.issues if i.severity in fail_on]
+    from .core import diff
+
+    delta = diff.diff_reports(diff.load(baseline), report)
+    return delta, delta.introduces(fail_on)
+
+
+def gate_message(failing: Sequence["Issue"]) -> str:
+    codes = ", ".join(dict.fromkeys(f"{i.code} ({i.severity})" for i in failing))
+    return f"py-env-doctor: {len(failing)} new issue(s) at a --fail-on severity: {codes}"
+
+
+def record_report(report: "Report", path: Optional[Path] = None) -> Optional[str]:
+    """Append ``report`` to the history database; returns an error message instead of raising."""
+    import sqlite3
+
+    from .core import history
+
+    try:
+        conn = history.connect(path)
+        try:
+            history.record(conn, report)
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as exc:
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+@contextmanager
+def profiled(path: Optional[Path]) -> Iterator[None]:
+    """Run the block under cProfile and write a pstats dump to ``path`` (no-op without a path)."""
+    if not path:
+        yield
+        return
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+
+
+def run_check(
+    project_path: Path,
+    output_format: str = "text",
+    out: Optional[Path] = None,
+    compact: bool = False,
+    level: str = "standard",
+    diagnostics_only: bool = False,
+    probe_timeout: float = PIP_PROBE_TIMEOUT,
+    probe_workers: int = PIP_PROBE_WORKERS,
+    pip_probe: str = "static",
+    cache: Optional["DiskCache"] = None,
+    target_python: Optional[str] = None,
+    detector_timeout: Optional[float] = None,
+    plugins: bool = True,
+    incremental: bool = False,
+    state_path: Optional[Path] = None,
+    time_budget: Optional[float] = None,
+    deadline: Optional[float] = None,
+    profile: Optional[Path] = None,
+    baseline: Optional[Path] = None,
+    fail_on: Sequence[str] = (),
+    record: bool = False,
+    history_db: Optional[Path] = None,
+) -> int:
+    """The whole `check` command on already validated options; returns the exit status.
+
+    Messages go to stderr: 2 when the interpreter or the baseline cannot be
+    read, 1 when an issue at a ``fail_on`` severity is new. With ``profile``
+    the timings also count subprocesses and file activity.
+    """
+    from .core.probe import ProbeError
+
+    with profiled(profile):
+        try:
+            report = build_report(
+                project_path,
+                level,
+                diagnostics_only,
+                probe_timeout,
+                probe_workers,
+                pip_probe,
+                cache,
+                target_python,
+                detector_timeout=detector_timeout,
+                plugins=plugins,
+                incremental=incremental,
+                state_path=state_path,
+                time_budget=time_budget,
+                deadline=deadline,
+                count_io=profile is not None,
+            )
+        except ProbeError as exc:
+            sys.stderr.write(f"Could not probe {target_python or sys.executable}: {exc}\n")
+            return 2
+        output = render_report(report, output_format, compact)
+        try:
+            delta, failing = compare_to_baseline(report, baseline, fail_on)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            sys.stderr.write(f"Could not read baseline {baseline}: {exc}\n")
+            return 2
+        if delta is not None:
+            output = render_with(renderer(output_format).render_diff, delta, output_format, compact)
+    write_output(output, out)
+    if record:
+        error = record_report(report, history_db)
+        if error:
+            sys.stderr.write(f"Could not record report: {error}\n")
+    if failing:
+        sys.stderr.write(gate_message(failing) + "\n")
+        return 1
+    return 0
+
+
+def build_scan_context(
+    project_paths: List[Path],
+    diagnostics_only: bool = False,
+    probe_timeout: float = PIP_PROBE_TIMEOUT,
+    pip_probe: str = "static",
+    cache: Optional["DiskCache"] = None,
+    target_python: Optional[str] = None,
+) -> "ScanContext":
+    """Interpreter-wide facts for a scan, gathered once and shared by every project."""
+    from .core import detect_layout, detect_python, fleet
+    from .core.detect_shadowing import module_index
+    from .core.installed import build_installed_index, summarize_installed
+
+    find_spec = None
+    marker_env = None
+    if target_python:
+        from .core.probe import run_probe
+
+        # every project's import name goes into the same single probe
+        names = sorted({n for n in (detect_layout.project_import_name(p) for p in project_paths) if n})
+        data = run_probe(target_python, payload={"modules": names}, isolated=False)
+        py_info = detect_python.python_info_from_probe(data)
+        find_spec = data.get("find_spec") or {}
+        marker_env = data.get("marker_environment")
+    else:
+        py_info = detect_python.gather_python_info(cache=cache)
+    pip_info = detect_python.gather_pip_info(py_info, timeout=probe_timeout, mode=pip_probe, cache=cache)
+    index = build_installed_index(py_info.site_dirs)
+    return fleet.ScanContext(
+        python=py_info,
+        pip=pip_info,
+        diagnostics_only=diagnostics_only,
+        find_spec=find_spec,
+        installed=summarize_installed(index),
+        versions=index.versions(),
+        marker_environment=marker_env,
+        known_modules=module_index(index),
+    )
+
+
+def build_fleet_report(
+    project_paths: List[Path],
+    diagnostics_only: bool = False,
+    workers: Optional[int] = None,
+    probe_timeout: float = PIP_PROBE_TIMEOUT,
+    pip_probe: str = "static",
+    cache: Optional["DiskCache"] = None,
+    target_python: Optional[str] = None,
+) -> "FleetReport":
+    from .core import fleet
+
+    ctx = build_scan_context(project_paths, diagnostics_only, probe_timeout, pip_probe, cache, target_python)
+    return fleet.scan_projects(project_paths, ctx, workers)
+
+
+def stream_fleet(
+    project_paths: List[Path],
+    stream: TextIO,
+    diagnostics_only: bool = False,
+    workers: Optional[int] = None,
+    probe_timeout: float = PIP_PROBE_TIMEOUT,
+    pip_probe: str = "static",
+    cache: Optional["DiskCache"] = None,
+    target_python: Optional[str] = None,
+) -> None:
+    """Write a scan as JSON Lines, one project per line in completion order."""
+    from .core import fleet
+    from .reports import jsonl_report
+
+    ctx = build_scan_context(project_paths, diagnostics_only, probe_timeout, pip_probe, cache, target_python)
+    projects = fleet.iter_project_reports(project_paths, ctx, workers, ordered=False)
+    jsonl_report.write_records(jsonl_report.fleet_records(ctx.python, ctx.pip, ctx.installed, projects), stream)
+
+
+def stream_interpreters(paths: List[str], stream: TextIO, timeout: Optional[float], workers: int) -> None:
+    """Write interpreter probes as JSON Lines as each one finishes."""
+    from .core import interpreters
+    from .reports import jsonl_report
+
+    entries = (entry for _, entry in interpreters.iter_interpreter_entries(paths, timeout, workers))
+    jsonl_report.write_records(jsonl_report.interpreter_records(interpreters.mark_duplicates(entries)), stream)
@@ -2,8 +2,16 @@ import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure src/ is on sys.path for tests without requiring installation
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path_factory, monkeypatch):
+    # keep the on-disk probe cache out of the developer's home directory
+    monkeypatch.setenv("PY_ENV_DOCTOR_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import time
+from pathlib import Path
+
+from py_env_doctor.core import detect_python
+from py_env_doctor.core.cache import DiskCache, file_identity
+
+
+def test_cache_roundtrip_and_identity_key(tmp_path: Path):
+    cache = DiskCache(tmp_path / "cache")
+    target = tmp_path / "python"
+    target.write_text("a")
+
+    key = ["probe", file_identity(str(target))]
+    assert cache.get(key) is None
+    cache.set(key, {"version": "3.12"})
+    assert cache.get(key) == {"version": "3.12"}
+
+    target.write_text("changed contents")
+    assert cache.get(["probe", file_identity(str(target))]) is None
+
+    assert cache.clear() == 1
+    assert cache.get(key) is None
+
+
+def test_cache_lru_eviction(tmp_path: Path):
+    cache = DiskCache(tmp_path / "cache", max_entries=2)
+    cache.set(["a"], 1)
+    cache.set(["b"], 2)
+    old = time.time() - 100
+    os.utime(cache._entry_path(["a"]), (old, old))
+    os.utime(cache._entry_path(["b"]), (old - 10, old - 10))
+    # reading "a" refreshes it, leaving "b" as the least recently used entry
+    assert cache.get(["a"]) == 1
+    cache.set(["c"], 3)
+
+    assert cache.get(["b"]) is None
+    assert cache.get(["a"]) == 1
+    assert cache.get(["c"]) == 3
+
+
+def test_warm_run_does_not_spawn_processes(tmp_path: Path, monkeypatch):
+    cache = DiskCache(tmp_path / "cache")
+    py_info = detect_python.gather_python_info(cache=cache)
+    cold = detect_python.gather_pip_info(py_info, mode="subprocess", cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("subprocess spawned on a warm run")
+
+    monkeypatch.setattr(subprocess, "run", fail)
+    assert detect_python.gather_python_info(cache=cache) == py_info
+    warm = detect_python.gather_pip_info(py_info, mode="subprocess", cache=cache)
+    complete = [b for b in cold.binaries if b.pip_version and b.python_version]
+    assert [b for b in warm.binaries if b.pip_version] == complete
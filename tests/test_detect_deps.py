@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from py_env_doctor.core import detect_deps
+
+PYPROJECT = """
+[project]
+name = "demo"
+dependencies = [
+  "requests>=2.30",
+  "Typing_Extensions",
+  "numpy<2",
+  "pywin32; sys_platform == 'win32'",
+  "not a valid requirement !!",
+]
+
+[project.optional-dependencies]
+dev = ["pytest>=8", "tomli; python_version < '3.11'"]
+"""
+
+
+def test_dependencies_checked_against_installed_versions(tmp_path: Path):
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT)
+    versions = {"requests": "2.31.0", "typing-extensions": "4.9.0", "numpy": "2.0.1"}
+    env = {"sys_platform": "linux", "python_version": "3.12"}
+
+    info = detect_deps.detect_dependencies(tmp_path, versions, env)
+
+    assert info.checked == 7
+    assert info.missing == []
+    assert info.mismatched == ["numpy<2 (installed 2.0.1)"]
+    assert info.skipped == ['pywin32; sys_platform == "win32"', 'tomli; python_version < "3.11" [dev]']
+    assert info.missing_optional == ["pytest>=8 [dev]"]
+    assert info.invalid == ["not a valid requirement !!"]
+
+
+def test_dependencies_missing_and_no_pyproject(tmp_path: Path):
+    assert detect_deps.detect_dependencies(tmp_path, {}) is None
+
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\ndependencies = ["attrs"]\n')
+    info = detect_deps.detect_dependencies(tmp_path, {})
+    assert info.missing == ["attrs"]
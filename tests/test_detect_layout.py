@@ -17,3 +17,11 @@ name = "py-env-doctor"
     assert info.project_name == "py-env-doctor"
     # since our src/ is on sys.path in tests, the package should be importable
     assert info.package_importable is True
+
+
+def test_inspect_project_uses_probe_find_spec(tmp_path: Path):
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "py-env-doctor"\n')
+
+    info = detect_layout.inspect_project(tmp_path, find_spec={"py_env_doctor": False})
+    assert info.package_importable is False
+    assert detect_layout.project_import_name(tmp_path) == "py_env_doctor"
@@ -1,5 +1,9 @@
+import sys
+import time
 from pathlib import Path
 
+import pytest
+
 from py_env_doctor.core import detect_python
 from py_env_doctor.core.model import PythonInfo, PipInfo
 
@@ -22,3 +26,37 @@ def test_gather_pip_info_basic():
     for b in pip_info.binaries:
         assert b.name
         assert b.path
+
+
+def _write_script(path: Path, body: str) -> str:
+    path.write_text("#!/bin/sh\n" + body + "\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX shell scripts as fake pip binaries")
+def test_pip_probes_run_concurrently_with_timeout(tmp_path: Path):
+    good = _write_script(tmp_path / "pip", 'echo "pip 24.0 from /x/pip (python 3.12)"')
+    hung = _write_script(tmp_path / "pip3", "exec sleep 5")
+
+    start = time.monotonic()
+    binaries = detect_python._probe_pip_binaries([("pip", good), ("pip3", hung)], timeout=0.5, max_workers=2)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 4
+    assert [b.name for b in binaries] == ["pip", "pip3"]
+    assert binaries[0].pip_version == "24.0"
+    assert binaries[0].python_version == "3.12"
+    assert binaries[0].timed_out is False
+    assert binaries[1].timed_out is True
+    assert binaries[1].python_version is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX shell scripts as fake pip binaries")
+def test_static_pip_probe_falls_back_to_subprocess(tmp_path: Path):
+    shim = _write_script(tmp_path / "pip", 'echo "pip 23.1 from /y/pip (python 3.9)"')
+
+    (binary,) = detect_python._probe_pip_binaries([("pip", shim)], timeout=5, max_workers=1, mode="static")
+    assert binary.pip_version == "23.1"
+    assert binary.python_version == "3.9"
+    assert binary.shebang_python and binary.shebang_python.endswith("sh")
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from py_env_doctor.core.detect_shadowing import module_index, parse_gitignore, scan_shadowing
+
+
+def _touch(root: Path, *rels: str) -> None:
+    for rel in rels:
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("")
+
+
+def test_recursive_scan_finds_stdlib_and_installed_names(tmp_path: Path):
+    _touch(
+        tmp_path,
+        "requests.py",
+        "scripts/random.py",
+        "scripts/tools/typing.py",
+        "src/demo/__init__.py",
+        "src/demo/json.py",  # a submodule inside a package shadows nothing
+        "src/email/__init__.py",
+        "src/demo_helpers.py",
+        "tests/conftest.py",
+        "generated/os.py",
+        "generated/keep/sys.py",
+        ".venv/lib/enum.py",
+        "env/pyvenv.cfg",
+        "env/lib/abc.py",
+        "node_modules/pkg/re.py",
+        "build/lib/io.py",
+        "notes/logging.py",
+    )
+    (tmp_path / ".gitignore").write_text("# generated code\ngenerated/\n!generated/keep/\n")
+    (tmp_path / "notes" / ".gitignore").write_text("*.py\n")
+
+    scan = scan_shadowing(tmp_path, "demo", module_index())
+
+    assert scan.found == ["requests", "scripts/random", "scripts/tools/typing", "src/email"]
+    assert str(tmp_path / ".gitignore") in scan.paths
+    assert str(tmp_path / "src" / "demo") not in scan.paths
+
+
+def test_gitignore_rules():
+    rules = parse_gitignore("*.log\n/build/\ndocs/**/tmp\n!keep.log\n")
+
+    def ignored(rel, is_dir=False):
+        result = False
+        for regex, negated, dir_only in rules:
+            if (is_dir or not dir_only) and regex.match(rel):
+                result = not negated
+        return result
+
+    assert ignored("a/b/c.log") and not ignored("a/keep.log")
+    assert ignored("build", is_dir=True) and not ignored("build") and not ignored("x/build", is_dir=True)
+    assert ignored("docs/tmp", is_dir=True) and ignored("docs/a/b/tmp", is_dir=True)
@@ -0,0 +1,86 @@
+import json
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from py_env_doctor import cli as cli_mod
+from py_env_doctor.core import detect_python
+from py_env_doctor.core.diff import diff_reports
+from py_env_doctor.core.model import FleetReport, Issue, PipBinary, PipInfo, ProjectInfo, ProjectReport, Report, now_iso
+
+
+def _fleet(projects, pip_version="24.0"):
+    return FleetReport(
+        type="py_env_doctor_fleet_report",
+        generated_at=now_iso(),
+        python=detect_python.gather_python_info(),
+        pip=PipInfo(binaries=[PipBinary("pip", "/usr/bin/pip", pip_version, "3.12")]),
+        projects=projects,
+    )
+
+
+def _project(n, *issues, shadowing=()):
+    return ProjectReport(ProjectInfo(path=f"/src/p{n}", pyproject=True, shadowing=list(shadowing)), issues=list(issues))
+
+
+def test_fleet_diff_matches_by_path_and_code():
+    warn = Issue("PATH_SHADOWING_PACKAGE", "warning", "requests")
+    old = _fleet([_project(n, warn, shadowing=["requests"]) for n in range(5000)])
+    new_projects = [_project(n, warn, shadowing=["requests"]) for n in range(1, 5001)]
+    new_projects[10] = _project(11, Issue("PROJECT_NOT_IMPORTABLE", "error"))
+    new_projects[20] = _project(21, replace(warn, details="requests, yaml"), shadowing=["requests", "yaml"])
+    new = _fleet(new_projects, pip_version="24.1")
+
+    start = time.perf_counter()
+    delta = diff_reports(old, new)
+    assert time.perf_counter() - start < 1.0
+
+    assert delta.added_projects == ["/src/p5000"] and delta.removed_projects == ["/src/p0"]
+    assert [(i.code, i.severity) for i in delta.introduces(["error"])] == [("PROJECT_NOT_IMPORTABLE", "error")]
+    changed = {t.target: t for t in delta.targets if t.changes}
+    assert [c.field for c in changed["/src/p21"].changes] == ["issue.PATH_SHADOWING_PACKAGE", "project.shadowing"]
+    assert changed["/src/p21"].changes[1].new == ["yaml"]
+    assert changed["environment"].changes[0].field == "pip.pip.pip_version"
+
+
+def test_grown_or_swapped_issue_counts_as_introduced():
+    def report(*issues):
+        return Report(
+            type="py_env_doctor_report",
+            generated_at=now_iso(),
+            python=detect_python.gather_python_info(),
+            pip=PipInfo(),
+            project=ProjectInfo(path="/src/p", pyproject=True),
+            issues=list(issues),
+        )
+
+    base = report(Issue("DEPENDENCY_MISSING", "error", "requests"), Issue("PATH_SHADOWING_PACKAGE", "warning", "a, b"))
+    grown = report(Issue("DEPENDENCY_MISSING", "error", "requests, numpy"), Issue("PATH_SHADOWING_PACKAGE", "warning", "a"))
+    swapped = report(Issue("DEPENDENCY_MISSING", "error", "numpy"))
+
+    delta = diff_reports(base, grown)
+    assert delta.added_issues == []
+    assert [i.details for i in delta.introduces(["error", "warning"])] == ["requests, numpy"]
+    assert [i.details for i in diff_reports(base, swapped).introduces(["error"])] == ["numpy"]
+    assert diff_reports(grown, base).introduces(["error"]) == []
+
+
+def test_cli_diff_exit_code(tmp_path: Path):
+    old, new = tmp_path / "old.json", tmp_path / "new.json"
+    old.write_text(json.dumps(_fleet([_project(1)]).to_dict()))
+    new.write_text(json.dumps(_fleet([_project(1, Issue("PIP_PYTHON_MISMATCH", "warning"))]).to_dict()))
+    runner = CliRunner()
+
+    result = runner.invoke(cli_mod.app, ["diff", str(old), str(new), "--fail-on", "error"])
+    assert result.exit_code == 0
+    assert "+ PIP_PYTHON_MISMATCH (warning)" in result.stdout
+
+    # older click mixes stderr (the gate message) into result.stdout, so read the JSON from a file
+    out = tmp_path / "diff.json"
+    result = runner.invoke(
+        cli_mod.app, ["diff", str(old), str(new), "--fail-on", "warning", "--format", "json", "--out", str(out)]
+    )
+    assert result.exit_code == 1
+    assert json.loads(out.read_text())["targets"][0]["added"][0]["code"] == "PIP_PYTHON_MISMATCH"
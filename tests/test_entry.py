@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from py_env_doctor import entry
+from py_env_doctor.core.startup import parse_importtime
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+# Modules a fast-path `check` imports before it starts detecting. They take a
+# few tens of ms, mostly stdlib (dataclasses, pathlib, typing, threading); the
+# budget is generous enough for cold CI runners.
+FAST_PATH_MODULES = (
+    "py_env_doctor.entry",
+    "py_env_doctor.runner",
+    "py_env_doctor.core.registry",
+    "py_env_doctor.core.detectors",
+    "py_env_doctor.reports.text_report",
+)
+IMPORT_BUDGET_MS = 150
+
+
+def run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    return subprocess.run([sys.executable, *args, "-c", code], capture_output=True, text=True, env=env, check=True)
+
+
+def test_fast_path_import_time_budget():
+    # best of three to ride out a cold filesystem cache
+    timings = []
+    for _ in range(3):
+        proc = run_python("import " + ", ".join(FAST_PATH_MODULES), "-X", "importtime")
+        entries = parse_importtime(proc.stderr)
+        assert not [n for n, *_ in entries if n.split(".")[0] in ("typer", "click", "rich")]
+        # top-level entries are what the import statement loaded, dependencies included
+        timings.append(sum(cum for name, depth, _, cum in entries if depth == 0 and name.startswith("py_env_doctor")))
+    assert min(timings) / 1000 < IMPORT_BUDGET_MS
+
+
+def test_fast_path_check_skips_typer_and_unused_renderers(tmp_path: Path):
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='tmp-proj'\n")
+    code = (
+        "import sys, json\n"
+        "from py_env_doctor.entry import run\n"
+        f"code = run(['check', '--project-path', {str(tmp_path)!r}, '--format', 'json', '--no-cache'])\n"
+        "loaded = sorted(m for m in sys.modules if m.startswith(('typer', 'py_env_doctor.reports.')))\n"
+        "sys.stderr.write(json.dumps({'code': code, 'loaded': loaded}))\n"
+    )
+    proc = run_python(code)
+    result = json.loads(proc.stderr)
+    assert result["code"] == 0
+    assert result["loaded"] == ["py_env_doctor.reports.json_report"]
+    assert json.loads(proc.stdout)["type"] == "py_env_doctor_report"
+
+
+def test_fast_path_defers_unknown_arguments():
+    assert entry.run(["check", "--help"]) is None
+    assert entry.run(["check", "--probe-workers", "zero"]) is None
+    assert entry.run(["check", "--level", "deep"]) is None
+    assert entry.run(["check", "--baseline", "old.json"]) is None
+    assert entry.run(["check", "."]) is None
+    assert entry.run(["scan", "."]) is None
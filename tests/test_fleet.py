@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from py_env_doctor import cli as cli_mod
+from py_env_doctor.core import detect_python, fleet
+from py_env_doctor.core.model import PipInfo
+
+
+def make_projects(root: Path, count: int):
+    paths = []
+    for i in range(count):
+        p = root / f"pkg{i}"
+        p.mkdir()
+        (p / "pyproject.toml").write_text(f"[project]\nname='pkg{i}'\n")
+        paths.append(p)
+    return paths
+
+
+def test_scan_projects_process_pool_keeps_order(tmp_path: Path):
+    paths = make_projects(tmp_path, 9)
+    (paths[2] / "requests.py").write_text("")
+    py_info = detect_python.gather_python_info()
+
+    report = fleet.scan_projects(paths, fleet.ScanContext(python=py_info, pip=PipInfo()), workers=2)
+
+    assert [r.project.project_name for r in report.projects] == [f"pkg{i}" for i in range(9)]
+    assert report.projects[2].project.shadowing == ["requests"]
+    assert report.summary.projects == 9
+    assert report.summary.issue_counts["PATH_SHADOWING_PACKAGE"] == 1
+
+
+def test_streaming_scan_keeps_chunks_small_and_pending_bounded(tmp_path: Path, monkeypatch):
+    from concurrent.futures import Future
+
+    chunks, yielded = [], []
+
+    class InlinePool:
+        def __init__(self, max_workers=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, jobs):
+            chunks.append((len(jobs), sum(n for n, _ in chunks) + len(jobs) - len(yielded)))
+            fut = Future()
+            fut.set_result(fn(jobs))
+            return fut
+
+    monkeypatch.setattr(fleet, "ProcessPoolExecutor", InlinePool)
+    monkeypatch.setattr(fleet, "diagnose_project", lambda job: job[0])
+    paths = [tmp_path / f"p{i}" for i in range(1000)]
+
+    for r in fleet.iter_project_reports(paths, ctx=None, workers=2, ordered=False):
+        yielded.append(r)
+
+    assert sorted(yielded) == sorted(str(p) for p in paths)
+    assert max(size for size, _ in chunks) == fleet._STREAM_CHUNK
+    # reports produced but not yet handed to the consumer stay bounded whatever the fleet size
+    assert max(pending for _, pending in chunks) <= 2 * 2 * fleet._STREAM_CHUNK
+
+
+def test_expand_project_paths_glob_and_dedup(tmp_path: Path):
+    make_projects(tmp_path, 3)
+    found = fleet.expand_project_paths([str(tmp_path / "pkg0")], [str(tmp_path / "*" / "pyproject.toml")])
+    assert [p.name for p in found] == ["pkg0", "pkg1", "pkg2"]
+
+
+def test_cli_scan_json(tmp_path: Path):
+    make_projects(tmp_path, 2)
+    runner = CliRunner()
+    result = runner.invoke(cli_mod.app, ["scan", "--glob", str(tmp_path / "pkg*"), "--format", "json"])
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    assert data["type"] == "py_env_doctor_fleet_report"
+    assert data["summary"]["projects"] == 2
+    assert len(data["projects"]) == 2
+
+
+def test_cli_scan_jsonl_streams_one_line_per_project(tmp_path: Path):
+    paths = make_projects(tmp_path, 10)
+    (paths[4] / "requests.py").write_text("")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_mod.app, ["scan", *[str(p) for p in paths], "--format", "jsonl", "--workers", "2", "--no-cache"]
+    )
+    assert result.exit_code == 0, result.output
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+
+    assert lines[0]["type"] == "py_env_doctor_fleet_report"
+    assert [r["type"] for r in lines[1:-1]] == ["project"] * 10
+    assert sorted(r["project"]["project_name"] for r in lines[1:-1]) == sorted(f"pkg{i}" for i in range(10))
+    assert lines[-1]["type"] == "summary"
+    assert lines[-1]["projects"] == 10
+    assert lines[-1]["issue_counts"]["PATH_SHADOWING_PACKAGE"] == 1
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from py_env_doctor.core import history
+from py_env_doctor.core.model import Issue, TimingEntry, Timings
+from py_env_doctor.runner import build_report
+
+
+def test_record_and_trend_queries(tmp_path: Path):
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='demo'\n")
+    report = build_report(tmp_path, plugins=False)
+    conn = history.connect(tmp_path / "history.db")
+    now = 1_000_000.0
+    for n in range(20):
+        report.issues = [Issue("PIP_PYTHON_MISMATCH", "warning")] if n % 4 == 0 else []
+        report.timings = Timings(total_ms=float(n + 1), steps=[TimingEntry("pip", ms=0.5)])
+        history.record(conn, report, host=f"host{n % 2}", now=now - n * 3600)
+
+    hosts = history.issue_hosts(conn, "PIP_PYTHON_MISMATCH", since=history.parse_since("9h", now=now))
+    assert [(h["host"], h["reports"]) for h in hosts] == [("host0", 3)]
+
+    by_host = {d["host"]: d for d in history.durations(conn)}
+    assert by_host["host0"]["runs"] == 10
+    assert (by_host["host0"]["p50_ms"], by_host["host0"]["p95_ms"]) == (9.0, 19.0)
+    assert history.durations(conn, step="pip", host="host1")[0]["p95_ms"] == 0.5
+
+    latest = history.recent(conn, limit=1)[0]
+    assert latest["total_ms"] == 1.0
+    stored = history.load_report(conn, latest["id"])
+    assert [i.code for i in stored.issues] == ["PIP_PYTHON_MISMATCH"]
+    assert stored.timings.total_ms == 1.0
+    assert stored.python == report.python
+
+    plan = " ".join(
+        row[-1]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT host FROM issues WHERE code = ? AND recorded_at >= ?", ("X", 0)
+        )
+    )
+    assert "USING COVERING INDEX issues_code_recorded" in plan
@@ -0,0 +1,127 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from py_env_doctor.core.imports import PathResolver, interpreter_context, parse_all, parse_imports, resolve_imports
+from py_env_doctor.core.probe import run_probe
+
+
+def _write(root: Path, rel: str, text: str = "") -> Path:
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text)
+    return p
+
+
+def test_parse_imports_marks_guarded_imports(tmp_path: Path):
+    src = _write(
+        tmp_path,
+        "mod.py",
+        "import os, json.decoder\n"
+        "from . import sibling\n"
+        "from collections import abc\n"
+        "try:\n    import tomllib\nexcept ImportError:\n    import tomli as tomllib\n"
+        "if TYPE_CHECKING:\n    from typing_extensions import Self\n"
+        "def f():\n    import csv\n",
+    )
+
+    path, refs, error = parse_imports(str(src))
+
+    assert error is None
+    assert refs == [
+        ("os", 1, False),
+        ("json", 1, False),
+        ("collections", 3, False),
+        ("tomllib", 5, True),
+        ("tomli", 7, True),
+        ("typing_extensions", 9, True),
+        ("csv", 11, False),
+    ]
+    assert parse_imports(str(_write(tmp_path, "bad.py", "def (")))[2].startswith("SyntaxError")
+
+
+def test_parse_all_pool_matches_serial_parse(tmp_path: Path):
+    paths = [str(_write(tmp_path, f"m{i:03}.py", f"import os\nimport mod{i}\n")) for i in range(80)]
+
+    # run from a thread, as the scheduler does: the pool must not fork it
+    with ThreadPoolExecutor(1) as threads:
+        pooled = threads.submit(parse_all, paths, 2).result()
+
+    assert pooled == parse_all(paths, workers=1)
+
+
+def test_resolver_prefers_packages_then_modules_then_namespaces(tmp_path: Path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    _write(first, "ns/readme.txt")
+    _write(first, "mod.py")
+    _write(second, "ns/__init__.py")
+    _write(second, "mod/__init__.py")
+    _write(second, "onlyns/x.py")
+
+    resolver = PathResolver([str(first), str(second)], builtins=["sys"])
+
+    assert resolver.resolve("sys") == ("builtin", None)
+    assert resolver.resolve("ns") == ("package", str(second / "ns" / "__init__.py"))
+    assert resolver.resolve("mod") == ("module", str(first / "mod.py"))
+    assert resolver.resolve("onlyns") == ("namespace", str(second / "onlyns"))
+    assert resolver.resolve("nothing") == ("missing", None)
+
+
+def test_resolve_imports_reports_unresolved_and_shadowed(tmp_path: Path):
+    _write(tmp_path, "random.py")
+    _write(tmp_path, "main.py", "import random\nimport not_installed_anywhere\nimport demo\n")
+    _write(tmp_path, "src/demo/__init__.py", "from demo import util\nimport random\n")
+    _write(tmp_path, "src/demo/util.py", "try:\n    import also_missing\nexcept ImportError:\n    pass\n")
+    _write(tmp_path, "scripts/tool.py", "import not_installed_anywhere\n")
+
+    context = interpreter_context()
+    info, paths = resolve_imports(tmp_path, "demo", **context)
+
+    assert info.files == 5
+    assert info.unresolved == ["not_installed_anywhere (main.py:2, scripts/tool.py:1)"]
+    assert len(info.shadowed) == 1
+    assert info.shadowed[0].startswith("random -> random.py, expected the standard library (main.py:1)")
+    assert str(tmp_path / "src" / "demo" / "util.py") in paths
+    assert str(tmp_path / "src") in paths
+
+
+def test_interpreter_context_from_probe():
+    probe = {
+        "sys_path": ["/x/lib/python3.12", "/x/site-packages"],
+        "builtin_module_names": ["sys"],
+        "stdlib_module_names": ["os", "sys"],
+        "sysconfig_paths": {"stdlib": "/x/lib/python3.12"},
+    }
+
+    context = interpreter_context(probe)
+
+    assert context["sys_path"] == ["/x/lib/python3.12", "/x/site-packages"]
+    assert context["stdlib"] == frozenset({"os", "sys"})
+    assert context["stdlib_dirs"] == ["/x/lib/python3.12"]
+    assert interpreter_context()["builtins"] == sys.builtin_module_names
+
+
+def test_stdlib_dirs_include_entries_under_base_prefix_before_site_packages():
+    # the Windows layout: extension modules such as select or _ssl live in DLLs, outside Lib
+    probe = {
+        "sys_path": ["/proj/extra", "/x/python312.zip", "/x/DLLs", "/x/Lib", "/venv/Lib/site-packages", "/x/Lib/later"],
+        "sysconfig_paths": {"stdlib": "/x/Lib"},
+        "base_prefix": "/x",
+        "site_dirs": ["/venv/Lib/site-packages"],
+    }
+
+    assert interpreter_context(probe)["stdlib_dirs"] == ["/x/Lib", "/x/python312.zip", "/x/DLLs"]
+
+
+def test_probed_pythonpath_entries_resolve(tmp_path: Path, monkeypatch):
+    extra = tmp_path / "extra"
+    _write(extra, "extramod.py")
+    project = tmp_path / "proj"
+    _write(project, "main.py", "import extramod\n")
+    monkeypatch.setenv("PYTHONPATH", str(extra))
+
+    context = interpreter_context(run_probe(sys.executable, isolated=False))
+    info, _ = resolve_imports(project, None, **context)
+
+    assert context["sys_path"][0] == str(extra)
+    assert info.unresolved == []
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from py_env_doctor.runner import build_report
+
+
+def _statuses(report):
+    return {s.name: s.status for s in report.timings.steps if s.name != "evaluate"}
+
+
+def test_second_run_reuses_and_edit_reruns_downstream(tmp_path: Path):
+    project = tmp_path / "proj"
+    project.mkdir()
+    (project / "pyproject.toml").write_text("[project]\nname='demo'\n")
+    state = tmp_path / "state.json"
+
+    def check():
+        return build_report(project, plugins=False, incremental=True, state_path=state)
+
+    first = check()
+    assert set(_statuses(first).values()) == {"ok"}
+    second = check()
+    assert set(_statuses(second).values()) == {"reused"}
+    assert second.to_dict()["python"] == first.to_dict()["python"]
+    assert second.issues == first.issues
+
+    (project / "pyproject.toml").write_text("[project]\nname='demo'\ndependencies=['surely-not-installed-dist']\n")
+    third = check()
+    rerun = {name for name, status in _statuses(third).items() if status != "reused"}
+    assert rerun == {"project_name", "project", "shadowing", "dependencies"}
+    assert "DEPENDENCY_MISSING" in {i.code for i in third.issues}
+
@@ -0,0 +1,101 @@
+import site
+import sys
+import sysconfig
+from pathlib import Path
+
+import pytest
+
+from py_env_doctor.core import advice
+from py_env_doctor.core.installed import build_installed_index, summarize_installed
+from py_env_doctor.core.model import PipInfo, PlatformInfo, ProjectInfo, PythonInfo
+from py_env_doctor.core.probe import run_probe
+
+
+def add_dist(site: Path, name: str, version: str, top_level=None, record=None) -> Path:
+    d = site / f"{name.replace('-', '_')}-{version}.dist-info"
+    d.mkdir(parents=True)
+    (d / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n\nBody\nName: bogus\n")
+    if top_level is not None:
+        (d / "top_level.txt").write_text("\n".join(top_level) + "\n")
+    if record is not None:
+        (d / "RECORD").write_text("\n".join(f"{r},," for r in record) + "\n")
+    return d
+
+
+def test_index_lookups_by_name_and_module(tmp_path: Path):
+    site = tmp_path / "site"
+    add_dist(site, "PyYAML", "6.0.1", top_level=["_yaml", "yaml"])
+    add_dist(site, "typing_extensions", "4.9.0", record=["typing_extensions.py", "typing_extensions-4.9.0.dist-info/RECORD"])
+    add_dist(site, "zope.interface", "6.1", record=["zope/interface/__init__.py", "zope.interface-6.1-py3.12-nspkg.pth"])
+
+    index = build_installed_index([str(site)])
+
+    assert len(index) == 3
+    assert index.version("pyyaml") == "6.0.1"
+    assert index.get("Typing-Extensions").version == "4.9.0"
+    assert "zope-interface" in index
+    assert [d.name for d in index.providers("yaml")] == ["PyYAML"]
+    assert [d.name for d in index.providers("typing_extensions")] == ["typing_extensions"]
+    assert [d.name for d in index.providers("zope.interface")] == ["zope.interface"]
+    assert index.conflicts() == {}
+
+
+def test_user_site_wins_over_site_packages_only_when_enabled(tmp_path: Path, monkeypatch):
+    user, system = tmp_path / "user", tmp_path / "site-packages"
+    add_dist(user, "requests", "2.31.0")
+    add_dist(system, "requests", "2.28.1")
+    monkeypatch.setattr(site, "getusersitepackages", lambda: str(user))
+    monkeypatch.setattr(site, "getsitepackages", lambda: [str(system)])
+    monkeypatch.setattr(sysconfig, "get_paths", lambda: {"purelib": str(system), "platlib": str(system)})
+
+    monkeypatch.setattr(site, "ENABLE_USER_SITE", True)
+    index = build_installed_index()
+    assert index.site_dirs == [str(user), str(system)]
+    assert index.version("requests") == "2.31.0"
+
+    monkeypatch.setattr(site, "ENABLE_USER_SITE", False)  # e.g. a venv without system site-packages
+    index = build_installed_index()
+    assert index.site_dirs == [str(system)]
+    assert index.version("requests") == "2.28.1"
+
+
+@pytest.mark.skipif(not site.ENABLE_USER_SITE, reason="the running interpreter has no user site")
+def test_probed_site_dirs_put_the_user_site_first(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("PYTHONUSERBASE", str(tmp_path))
+
+    site_dirs = run_probe(sys.executable, isolated=False)["site_dirs"]
+
+    assert site_dirs[0].startswith(str(tmp_path))
+    assert not any(d.startswith(str(tmp_path)) for d in site_dirs[1:])
+
+
+def test_index_flags_conflicting_and_shadowed_dists(tmp_path: Path):
+    user, system = tmp_path / "user", tmp_path / "system"
+    add_dist(user, "requests", "2.31.0")
+    add_dist(system, "requests", "2.28.1")
+    add_dist(system, "six", "1.15.0")
+    add_dist(system, "six", "1.16.0")
+
+    index = build_installed_index([str(user), str(system)])
+
+    assert index.version("requests") == "2.31.0"  # first site dir wins
+    assert set(index.conflicts()) == {"six"}
+    assert set(index.shadowed()) == {"requests"}
+
+    info = summarize_installed(index)
+    assert info.distributions == 2
+    assert len(info.conflicts) == 1 and info.conflicts[0].startswith("six (")
+
+    py = PythonInfo(
+        executable="/usr/bin/python3",
+        version="3.12.1",
+        implementation="CPython",
+        environment_type="venv",
+        is_venv=True,
+        is_conda=False,
+        is_pyenv=False,
+        pep668_externally_managed=False,
+        platform=PlatformInfo(system="Linux", release="6.0"),
+    )
+    issues = advice.evaluate_issues(py, PipInfo(), ProjectInfo(path="/p", pyproject=False), info)
+    assert {i.code: i.severity for i in issues} == {"DUPLICATE_DIST_INFO": "warning", "SHADOWED_DISTRIBUTION": "info"}
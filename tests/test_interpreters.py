@@ -0,0 +1,60 @@
+import os
+import platform
+import sys
+from pathlib import Path
+
+import pytest
+
+from py_env_doctor.core import interpreters, probe
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="builds a POSIX venv layout with symlinks")
+def test_discover_and_probe_root_environment(tmp_path: Path, monkeypatch):
+    env = tmp_path / "envs" / "demo"
+    (env / "bin").mkdir(parents=True)
+    os.symlink(sys.executable, env / "bin" / "python")
+    monkeypatch.setenv("PATH", "")
+    monkeypatch.setenv("PYENV_ROOT", str(tmp_path / "no-pyenv"))
+
+    found = interpreters.discover_interpreters([str(tmp_path / "envs")], include_path=False)
+    assert str(env / "bin" / "python") in found
+
+    report = interpreters.diagnose_interpreters([str(tmp_path / "envs")], include_path=False)
+    entry = next(e for e in report.interpreters if e.path == str(env / "bin" / "python"))
+    assert entry.error is None
+    assert entry.python.version == platform.python_version()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell script as a fake interpreter")
+def test_probe_timeout_is_recorded(tmp_path: Path):
+    fake = tmp_path / "python"
+    fake.write_text("#!/bin/sh\nexec sleep 5\n")
+    fake.chmod(0o755)
+
+    results = dict(interpreters.iter_interpreter_entries([str(fake)], timeout=0.5))
+    assert results[0].timed_out is True
+    assert results[0].python is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell script as a fake interpreter")
+def test_probe_falls_back_when_isolated_mode_is_rejected(tmp_path: Path):
+    fake = tmp_path / "python"
+    fake.write_text(
+        "#!/bin/sh\n"
+        'if [ "$1" = "-I" ]; then echo "Unknown option: -I" >&2; exit 2; fi\n'
+        f'exec "{sys.executable}" "$@"\n'
+    )
+    fake.chmod(0o755)
+
+    results = dict(interpreters.iter_interpreter_entries([str(fake)]))
+    assert results[0].error is None
+    assert results[0].python.version == platform.python_version()
+
+
+def test_batched_probe_reports_find_spec_and_sys_path():
+    data = probe.run_probe(sys.executable, payload={"modules": ["json", "no_such_module_xyz"]}, isolated=False)
+
+    assert data["version"] == platform.python_version()
+    assert data["find_spec"] == {"json": True, "no_such_module_xyz": False}
+    assert "" not in data["sys_path"]
+    assert data["sysconfig_paths"]["stdlib"]
@@ -0,0 +1,71 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from py_env_doctor.core import detect_python, pathindex
+from py_env_doctor.core.pathindex import PIP_NAME_RE, PYTHON_NAME_RE, build_path_index
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX executable bits and symlinks")
+
+
+def _exe(path: Path, body: str = "") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("#!/bin/sh\n" + body + "\n")
+    path.chmod(0o755)
+    return path
+
+
+def test_index_keeps_path_order_and_reports_shadowed(tmp_path: Path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    alias, second_alias = tmp_path / "alias", tmp_path / "b-alias"
+    _exe(first / "pip")
+    _exe(first / "python3")
+    _exe(second / "pip")
+    _exe(second / "pip3.11")
+    (second / "pip3").write_text("not executable")
+    (second / "pipx-helper").mkdir()
+    alias.symlink_to(first)  # same files under another name: not shadowing
+    second_alias.symlink_to(second)  # a loser listed twice is still one file
+
+    index = build_path_index(
+        path_env=os.pathsep.join([str(first), str(alias), str(second), str(second_alias), str(first)])
+    )
+
+    assert index.dirs == [str(first), str(alias), str(second), str(second_alias)]
+    assert [e.name for e in index.winners(PIP_NAME_RE)] == ["pip", "pip3.11"]
+    assert index.which("pip") == str(first / "pip")
+    assert index.which("pip3") is None
+    assert [e.path for e in index.matching(PYTHON_NAME_RE)] == [str(first / "python3"), str(alias / "python3")]
+    assert index.shadowed() == {"pip": [str(first / "pip"), str(second / "pip")]}
+
+
+def test_versioned_pip_is_compared_with_its_own_version(tmp_path: Path, monkeypatch):
+    bindir = tmp_path / "bin"
+    _exe(bindir / "pip", 'echo "pip 24.0 from /x (python 3.12)"')
+    _exe(bindir / "pip3.11", 'echo "pip 23.0 from /y (python 3.11)"')
+    _exe(bindir / "pip3.10", 'echo "pip 23.0 from /z (python 3.11)"')
+    monkeypatch.setenv("PATH", str(bindir))
+    py_info = detect_python.gather_python_info()
+    py_info.version = "3.12.1"
+
+    pip = detect_python.gather_pip_info(py_info, mode="subprocess")
+
+    assert [b.name for b in pip.binaries] == ["pip", "pip3.10", "pip3.11"]
+    assert pip.mismatches == ["pip3.10 -> Python 3.11 (expected 3.10)"]
+
+
+def test_pyenv_shims_resolve_to_active_version(tmp_path: Path, monkeypatch):
+    root = tmp_path / "pyenv"
+    shim = _exe(root / "shims" / "pip3.11")
+    other = _exe(root / "shims" / "pip3.9")
+    target = _exe(root / "versions" / "3.11.7" / "bin" / "pip3.11")
+    monkeypatch.setenv("PYENV_ROOT", str(root))
+    monkeypatch.setenv("PYENV_VERSION", "3.11.7")
+
+    assert pathindex.resolve_pyenv_shim(str(shim)) == str(target)
+    assert pathindex.resolve_pyenv_shim(str(other)) == ""
+    assert pathindex.resolve_pyenv_shim(str(target)) == str(target)
+    monkeypatch.setenv("PYENV_VERSION", "system")
+    assert pathindex.resolve_pyenv_shim(str(shim)) == str(shim)
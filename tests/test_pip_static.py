@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from py_env_doctor.core import pip_static
+
+
+def make_venv(root: Path, pyver: str = "3.12", pip_version: str = "24.0") -> Path:
+    bindir = root / "bin"
+    bindir.mkdir(parents=True)
+    (bindir / "python").write_text("")
+    (root / "pyvenv.cfg").write_text(f"home = /usr/bin\ninclude-system-site-packages = false\nversion = {pyver}.1\n")
+    dist = root / "lib" / f"python{pyver}" / "site-packages" / f"pip-{pip_version}.dist-info"
+    dist.mkdir(parents=True)
+    (dist / "METADATA").write_text(f"Metadata-Version: 2.1\nName: pip\nVersion: {pip_version}\n\nLong description\nVersion: 0\n")
+    return bindir / "python"
+
+
+def test_static_probe_reads_shebang_and_metadata(tmp_path: Path):
+    python = make_venv(tmp_path / "venv")
+    pip = tmp_path / "venv" / "bin" / "pip"
+    pip.write_text(f"#!{python}\nimport sys\n")
+
+    shebang, pip_version, python_version = pip_static.static_pip_probe(str(pip))
+    assert shebang == str(python)
+    assert pip_version == "24.0"
+    assert python_version == "3.12"
+
+
+def test_static_probe_long_shebang_and_init_version(tmp_path: Path):
+    python = make_venv(tmp_path / "venv", pyver="3.10", pip_version="23.0")
+    site = tmp_path / "venv" / "lib" / "python3.10" / "site-packages"
+    for d in site.glob("pip-*.dist-info"):
+        (d / "METADATA").unlink()
+        d.rmdir()
+    (site / "pip").mkdir()
+    (site / "pip" / "__init__.py").write_text('__version__ = "23.0.1"\n')
+    pip = tmp_path / "venv" / "bin" / "pip"
+    pip.write_text(f"#!/bin/sh\n'''exec' \"{python}\" \"$0\" \"$@\"\n' '''\nimport sys\n")
+
+    shebang, pip_version, python_version = pip_static.static_pip_probe(str(pip))
+    assert shebang == str(python)
+    assert pip_version == "23.0.1"
+    assert python_version == "3.10"
+
+
+def test_static_probe_gives_up_on_non_python_shebang(tmp_path: Path):
+    shim = tmp_path / "pip"
+    shim.write_text("#!/usr/bin/env bash\nexec pyenv exec pip \"$@\"\n")
+
+    _, pip_version, python_version = pip_static.static_pip_probe(str(shim))
+    assert pip_version is None
+    assert python_version is None
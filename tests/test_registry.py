@@ -0,0 +1,189 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from py_env_doctor.core import registry
+from py_env_doctor.core.model import Issue
+from py_env_doctor.core.registry import Detector, run_detectors
+from py_env_doctor.runner import build_report
+
+
+def _sleep(value, seconds=0.3):
+    def func(**_):
+        time.sleep(seconds)
+        return value
+
+    return func
+
+
+def test_independent_detectors_run_concurrently():
+    detectors = [
+        Detector("a", _sleep(1), ("seed",), ("a",)),
+        Detector("b", _sleep(2), ("seed",), ("b",)),
+        Detector("sum", lambda a, b: a + b, ("a", "b"), ("sum",)),
+    ]
+    start = time.perf_counter()
+    result = run_detectors(detectors, {"seed": None})
+    elapsed = time.perf_counter() - start
+
+    assert result.facts["sum"] == 3
+    assert result.status == {"a": "ok", "b": "ok", "sum": "ok"}
+    assert elapsed < 0.55  # critical path (0.3s), not the sum (0.6s)
+
+
+def test_io_is_counted_only_when_asked():
+    def spawn():
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+    detectors = [Detector("spawn", spawn, (), ("spawned",))]
+
+    assert run_detectors(detectors, {}).timings["spawn"].subprocesses == 0
+    assert run_detectors(detectors, {}, count_io=True).timings["spawn"].subprocesses == 1
+
+
+def test_timeout_and_errors_skip_dependents():
+    def boom():
+        raise RuntimeError("nope")
+
+    detectors = [
+        Detector("slow", _sleep(1, 5), (), ("slow",), timeout=0.1),
+        Detector("after_slow", lambda slow: slow, ("slow",), ("x",)),
+        Detector("broken", boom, (), ("y",)),
+        Detector("after_broken", lambda y: y, ("y",), ("z",)),
+        Detector("fine", lambda: "ok", (), ("w",)),
+    ]
+    start = time.perf_counter()
+    result = run_detectors(detectors, {})
+
+    assert time.perf_counter() - start < 2
+    assert result.status["slow"] == registry.TIMED_OUT
+    assert result.status["after_slow"] == registry.SKIPPED
+    assert result.status["broken"] == registry.ERROR
+    assert isinstance(result.errors["broken"], RuntimeError)
+    assert result.status["after_broken"] == registry.SKIPPED
+    assert result.facts["w"] == "ok"
+
+
+def test_registered_detectors_feed_the_report(tmp_path: Path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='demo'\n")
+
+    def custom(project_name):
+        return [Issue(code="CUSTOM_CHECK", severity="info", details=project_name)]
+
+    def failing(python):
+        raise ValueError("bad plugin")
+
+    monkeypatch.setattr(
+        registry,
+        "_REGISTERED",
+        [
+            Detector("custom", custom, ("project_name",), ("custom_issues",), produces_issues=True),
+            Detector("failing", failing, ("python",), ("failing",)),
+        ],
+    )
+    report = build_report(tmp_path, plugins=False)
+
+    codes = {i.code: i for i in report.issues}
+    assert codes["CUSTOM_CHECK"].details == "demo"
+    assert "failing: ValueError: bad plugin" in codes["DETECTOR_FAILED"].details
+    assert report.project.project_name == "demo"
+
+
+def test_entry_points_are_read_from_dist_info(tmp_path: Path, monkeypatch):
+    site = tmp_path / "site"
+    (site / "demo_plugin-1.0.dist-info").mkdir(parents=True)
+    (site / "demo_plugin-1.0.dist-info" / "entry_points.txt").write_text(
+        "[console_scripts]\nx = demo_plugin:main\n\n[py_env_doctor.detectors]\ndemo = demo_plugin:detector\nbroken = demo_plugin:missing\n"
+    )
+    (site / "demo_plugin.py").write_text(
+        "from py_env_doctor.core.registry import Detector\n"
+        "detector = Detector('demo', lambda: 1, (), ('demo',))\n"
+    )
+    monkeypatch.syspath_prepend(str(site))
+
+    found, errors = registry.load_entry_point_detectors([str(site)])
+
+    assert [d.name for d in found] == ["demo"]
+    assert list(errors) == ["broken"]
+
+
+def test_time_budget_keeps_required_and_most_valuable_detectors():
+    detectors = [
+        Detector("base", _sleep(1), (), ("base",), estimate_ms=10, value=100),
+        Detector("cheap", _sleep(1), ("base",), ("cheap",), cost=registry.COST_STAT, value=10),
+        Detector("valuable", _sleep(1), ("base",), ("valuable",), estimate_ms=30, value=90),
+        Detector("walk", _sleep(1), ("valuable",), ("walk",), cost=registry.COST_WALK, value=95),
+        Detector("plugin", _sleep(1), (), ("plugin",)),  # no cost: estimated like a subprocess
+    ]
+
+    assert registry.critical_path_ms(detectors, ["base", "valuable", "walk"]) == 100
+    kept, left_out = registry.select_within_budget(detectors, 45, required=["base"])
+
+    assert [d.name for d in kept] == ["base", "cheap", "valuable"]
+    assert [d.name for d in left_out] == ["walk", "plugin"]
+
+
+def test_levels_pick_detectors_by_cost(tmp_path: Path):
+    from py_env_doctor.core.detectors import builtin_detectors
+
+    names = {level: [d.name for d in builtin_detectors(level=level)] for level in ("basic", "standard", "full")}
+    assert "shadowing" not in names["basic"] and "imports" not in names["basic"]
+    assert "shadowing" in names["standard"] and "imports" not in names["standard"]
+    assert "imports" in names["full"]
+    assert "pip" not in [d.name for d in builtin_detectors(level="basic", pip_probe="subprocess")]
+
+    report = build_report(tmp_path, "standard", plugins=False, time_budget=0.001)
+    skipped = [s.name for s in report.timings.steps if s.status == registry.SKIPPED]
+    assert "python" not in skipped and "shadowing" in skipped
+    assert any(i.code == "DETECTORS_SKIPPED" for i in report.issues)
+
+
+def test_deadline_returns_partial_facts_and_cancels_workers():
+    seen = []
+
+    def cooperative():
+        try:
+            while True:
+                registry.check_cancelled()
+                time.sleep(0.01)
+        except registry.Cancelled:
+            seen.append("cancelled")
+            raise
+
+    detectors = [
+        Detector("fast", lambda: 1, (), ("fast",)),
+        Detector("loop", cooperative, (), ("loop",)),
+        Detector("after", lambda loop: loop, ("loop",), ("after",)),
+    ]
+    start = time.perf_counter()
+    result = run_detectors(detectors, {}, deadline=time.monotonic() + 0.2)
+
+    assert time.perf_counter() - start < 0.4
+    assert result.facts["fast"] == 1
+    assert result.status == {"fast": "ok", "loop": "timed_out", "after": "timed_out"}
+    assert result.unfinished == ["loop", "after"]
+    time.sleep(0.05)
+    assert seen == ["cancelled"]
+
+
+def test_deadline_report_names_unfinished_detectors(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(registry, "_REGISTERED", [Detector("stuck", _sleep([], 5), ("python",), ("stuck",))])
+    report = build_report(tmp_path, plugins=False, deadline=1.0)
+
+    codes = {i.code: i for i in report.issues}
+    assert codes["DEADLINE_EXCEEDED"].details.startswith("stuck")
+    assert "DETECTOR_FAILED" not in codes
+    assert {s.name: s.status for s in report.timings.steps}["stuck"] == "timed_out"
+
+
+def test_basic_level_enforces_its_budget_as_a_deadline(tmp_path: Path, monkeypatch):
+    # estimated as cheap, so the budget keeps it; the deadline is what stops it
+    stuck = Detector("stuck", _sleep([], 5), ("python",), ("stuck",), cost=registry.COST_STAT, estimate_ms=1.0)
+    monkeypatch.setattr(registry, "_REGISTERED", [stuck])
+    start = time.monotonic()
+    report = build_report(tmp_path, level="basic", plugins=False, time_budget=0.5)
+
+    assert time.monotonic() - start < 2.0
+    codes = {i.code: i for i in report.issues}
+    assert codes["DEADLINE_EXCEEDED"].details == "stuck (unfinished after the 0.5s deadline)"
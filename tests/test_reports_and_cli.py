@@ -1,5 +1,6 @@
 from pathlib import Path
 import json
+import sys
 
 from py_env_doctor.core import detect_python, detect_layout, detect_shadowing, advice
 from py_env_doctor.core.model import Report, now_iso
@@ -53,3 +54,63 @@ def test_cli_check_json(tmp_path: Path):
     assert result.exit_code == 0
     data = json.loads(result.stdout)
     assert data["type"] == "py_env_doctor_report"
+    assert data["timings"]["counted"] is False
+
+
+def test_cli_version_option_matches_fast_path():
+    from py_env_doctor import __version__
+
+    runner = CliRunner()
+    for args in (["--version"], ["--version", "--help"], ["version"]):
+        result = runner.invoke(cli_mod.app, args)
+        assert result.exit_code == 0
+        assert result.stdout == __version__ + "\n"
+
+
+def test_cli_check_target_python(tmp_path: Path):
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='json'\n")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_mod.app, ["check", "--project-path", str(tmp_path), "--format", "json", "--python", sys.executable]
+    )
+    assert result.exit_code == 0
+    data = json.loads(result.stdout)
+    assert data["python"]["site_dirs"]
+    assert data["project"]["package_importable"] is True
+
+
+def test_cli_check_timings_and_profile(tmp_path: Path):
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='tmp-proj'\n")
+    prof = tmp_path / "out" / "check.prof"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_mod.app,
+        ["check", "--project-path", str(tmp_path), "--format", "json", "--python", sys.executable, "--profile", str(prof)],
+    )
+    assert result.exit_code == 0
+    timings = json.loads(result.stdout)["timings"]
+    assert timings["counted"] is True
+    steps = {t["name"]: t for t in timings["steps"]}
+    assert {"python", "pip", "project", "shadowing", "installed", "dependencies", "evaluate"} <= set(steps)
+    assert steps["python"]["subprocesses"] == 1
+    assert steps["installed"]["dirs_scanned"] >= 1
+    assert timings["total_ms"] >= max(t["ms"] for t in timings["steps"])
+
+    import pstats
+
+    assert pstats.Stats(str(prof)).total_calls > 0
+
+
+def test_json_round_trip_and_compact(tmp_path: Path):
+    from py_env_doctor.runner import build_report as run_check
+
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='tmp-proj'\n")
+    rep = run_check(tmp_path, plugins=False)
+
+    compact = json_report.render(rep, compact=True)
+    assert compact == json.dumps(json.loads(compact), separators=(",", ":"))
+    loaded = json_report.load(compact)
+    assert loaded == rep
+    assert json_report.render(loaded) == json_report.render(rep)
+    if sys.version_info >= (3, 10):
+        assert not hasattr(rep.python, "__dict__")
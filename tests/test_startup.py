@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+from py_env_doctor.core import advice
+from py_env_doctor.core.model import PipInfo, PlatformInfo, ProjectInfo, PythonInfo
+from py_env_doctor.core.startup import audit_pth, measure_startup, parse_importtime
+
+PY = PythonInfo(
+    executable=sys.executable, version="3.12.1", implementation="CPython", environment_type="venv",
+    is_venv=True, is_conda=False, is_pyenv=False, pep668_externally_managed=False,
+    platform=PlatformInfo(system="Linux", release="6"),
+)
+
+
+def test_pth_audit_and_importtime_parsing(tmp_path: Path):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "paths.pth").write_text("# comment\n/opt/extra\n")
+    (site / "hook.pth").write_text("/opt/other\nimport hook; hook.install()\nimportant/path\n")
+
+    count, found = audit_pth([str(site), str(tmp_path / "missing")])
+    assert count == 2
+    assert found == [f"{site / 'hook.pth'}:2: import hook; hook.install()"]
+
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _abc\n"
+        "import time:       300 |        420 | abc\n"
+        "import time:      5000 |       5000 |     demo.heavy\n"
+        "import time:       100 |       5100 |   demo.core\n"
+        "import time:        50 |       5150 | demo\n"
+    )
+    assert parse_importtime(stderr) == [
+        ("_abc", 1, 120, 120),
+        ("abc", 0, 300, 420),
+        ("demo.heavy", 2, 5000, 5000),
+        ("demo.core", 1, 100, 5100),
+        ("demo", 0, 50, 5150),
+    ]
+
+
+def test_slow_and_failing_project_imports(tmp_path: Path):
+    (tmp_path / "slowpkg").mkdir()
+    (tmp_path / "slowpkg" / "__init__.py").write_text("import time\ntime.sleep(0.6)\n")
+    (tmp_path / "badpkg.py").write_text("raise RuntimeError('no config')\n")
+    proj = ProjectInfo(path=str(tmp_path), pyproject=True, project_name="slowpkg", package_importable=True)
+
+    slow = measure_startup(sys.executable, [], "slowpkg", cwd=tmp_path)
+    assert slow.error is None
+    assert slow.project_ms >= 600 and slow.overhead_ms >= 500
+    assert slow.slowest[0].startswith("slowpkg ")
+    issues = advice.evaluate_issues(PY, PipInfo(), proj, startup=slow)
+    assert [i.code for i in issues] == ["SLOW_STARTUP"]
+
+    bad = measure_startup(sys.executable, [], "badpkg", cwd=tmp_path)
+    assert bad.error == "RuntimeError: no config"
+    assert (bad.imports_ms, bad.project_ms, bad.slowest) == (0.0, None, [])
+    issues = advice.evaluate_issues(PY, PipInfo(), proj, startup=bad)
+    assert [(i.code, i.details) for i in issues] == [("PROJECT_IMPORT_FAILED", "import badpkg: RuntimeError: no config")]
+
+    marker = tmp_path / "ran"
+    injected = measure_startup(sys.executable, [], f"os; open({str(marker)!r}, 'w')", cwd=tmp_path)
+    assert injected.error.startswith("not a valid import name") and injected.total_ms == 0.0
+    assert not marker.exists()
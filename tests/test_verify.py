@@ -0,0 +1,77 @@
+import base64
+import hashlib
+import os
+from pathlib import Path
+
+from py_env_doctor.core import advice
+from py_env_doctor.core.installed import build_installed_index
+from py_env_doctor.core.model import InstalledInfo, PipInfo, PlatformInfo, ProjectInfo, PythonInfo
+from py_env_doctor.core.verify import verify_installed
+
+
+def _digest(data: bytes) -> str:
+    return base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+
+
+def install(site: Path, name: str, files: dict) -> Path:
+    """A wheel-style install of ``files`` (relative path -> bytes) with a RECORD of their hashes."""
+    meta = site / f"{name}-1.0.dist-info"
+    meta.mkdir(parents=True)
+    (meta / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n\n")
+    rows = []
+    for rel, data in files.items():
+        path = site / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        rows.append(f"{rel},sha256={_digest(data)},{len(data)}")
+    rows += [f"{name}/__pycache__/__init__.cpython-312.pyc,,", f"{meta.name}/METADATA,,", f"{meta.name}/RECORD,,"]
+    (meta / "RECORD").write_text("\n".join(rows) + "\n")
+    return meta
+
+
+def test_verify_reports_missing_modified_and_extra_files(tmp_path: Path):
+    site = tmp_path / "site"
+    install(site, "good", {"good/__init__.py": b"x = 1\n", "good/data.bin": os.urandom(100_000)})
+    install(site, "broken", {"broken/__init__.py": b"", "broken/core.py": b"def f(): pass\n", "broken/util.py": b"y = 2\n"})
+    (site / "broken" / "core.py").write_bytes(b"def f(): return 1  # hand edit\n")
+    (site / "broken" / "util.py").unlink()
+    (site / "broken" / "leftover.py").write_text("old = True\n")
+    (site / "broken" / "__pycache__").mkdir()
+    (site / "broken" / "__pycache__" / "leftover.cpython-312.pyc").write_bytes(b"\0")
+
+    info = verify_installed(build_installed_index([str(site)]), workers=2)
+
+    assert (info.dists, info.files, info.hashed) == (2, 9, 4)
+    assert info.missing == [f"broken 1.0: {os.path.join('broken', 'util.py')}"]
+    assert info.modified == [f"broken 1.0: {os.path.join('broken', 'core.py')}"]
+    assert info.extra == [f"broken 1.0: {os.path.join('broken', 'leftover.py')}"]
+
+    py = PythonInfo(
+        executable="/v/bin/python", version="3.12.1", implementation="CPython", environment_type="venv",
+        is_venv=True, is_conda=False, is_pyenv=False, pep668_externally_managed=False,
+        platform=PlatformInfo(system="Linux", release="6"),
+    )
+    issues = advice.evaluate_issues(py, PipInfo(), ProjectInfo(path="/p", pyproject=False), InstalledInfo(verify=info))
+    assert [(i.code, i.severity) for i in issues] == [
+        ("RECORD_FILE_MISSING", "warning"),
+        ("RECORD_FILE_MODIFIED", "warning"),
+        ("RECORD_FILE_EXTRA", "info"),
+    ]
+
+
+def test_verify_cache_skips_unchanged_files(tmp_path: Path):
+    site, cache = tmp_path / "site", tmp_path / "cache"
+    install(site, "pkg", {f"pkg/m{i}.py": f"v = {i}\n".encode() for i in range(200)})
+    index = build_installed_index([str(site)])
+
+    first = verify_installed(index, cache_dir=cache)
+    second = verify_installed(index, cache_dir=cache)
+    target = site / "pkg" / "m7.py"
+    target.write_text("v = 'changed'\n")
+    st = target.stat()
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    third = verify_installed(index, cache_dir=cache)
+
+    assert (first.hashed, second.hashed, third.hashed) == (200, 0, 1)
+    assert second.modified == []
+    assert third.modified == [f"pkg 1.0: {os.path.join('pkg', 'm7.py')}"]
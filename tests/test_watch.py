@@ -0,0 +1,98 @@
+import json
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from py_env_doctor.core.watch import serve_queries
+from py_env_doctor.runner import build_watcher
+
+
+def _watcher(project: Path):
+    (project / "pyproject.toml").write_text("[project]\nname='demo'\n")
+    watcher = build_watcher(project, plugins=False)
+    watcher.start()
+    return watcher
+
+
+def test_poll_reruns_only_affected_detectors(tmp_path: Path):
+    watcher = _watcher(tmp_path)
+    assert watcher.poll() is None
+
+    (tmp_path / "requests.py").write_text("")
+    update = watcher.poll()
+    assert update.rerun == ["shadowing"]
+    assert [i.code for i in update.added] == ["PATH_SHADOWING_PACKAGE"]
+    assert watcher.generation == 2
+
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='demo'\ndependencies=['surely-not-installed-dist']\n")
+    update = watcher.poll()
+    assert set(update.rerun) == {"project_name", "project", "shadowing", "dependencies"}
+    assert "DEPENDENCY_MISSING" in {i.code for i in update.added}
+    assert watcher.report.project.shadowing == ["requests"]
+    assert watcher.poll() is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs Unix domain sockets")
+def test_socket_queries_answer_from_memory(tmp_path: Path):
+    watcher = _watcher(tmp_path)
+    path = tmp_path / "doctor.sock"
+    server = serve_queries(watcher, str(path))
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))
+            reader = client.makefile("rb")
+            client.sendall(b"report\n")
+            assert json.loads(reader.readline())["project"]["project_name"] == "demo"
+            samples = []
+            for _ in range(50):
+                start = time.perf_counter()
+                client.sendall(b"status\n")
+                line = reader.readline()
+                samples.append(time.perf_counter() - start)
+            assert json.loads(line)["generation"] == 1
+            assert statistics.median(samples) < 0.001
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs Unix domain sockets")
+def test_socket_path_replaces_only_stale_sockets(tmp_path: Path):
+    from py_env_doctor.core.watch import remove_socket
+
+    watcher = _watcher(tmp_path)
+    regular = tmp_path / "notes.txt"
+    regular.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        serve_queries(watcher, str(regular))
+    remove_socket(str(regular))
+    assert regular.read_text() == "keep me"
+
+    path = tmp_path / "doctor.sock"
+    for _ in range(2):  # the second start finds the first one's stale socket
+        server = serve_queries(watcher, str(path))
+        server.shutdown()
+        server.server_close()
+    remove_socket(str(path))
+    assert not path.exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs Unix domain sockets")
+def test_socket_path_of_a_live_watcher_is_not_taken(tmp_path: Path):
+    watcher = _watcher(tmp_path)
+    path = tmp_path / "doctor.sock"
+    server = serve_queries(watcher, str(path))
+    try:
+        with pytest.raises(FileExistsError, match="another watcher"):
+            serve_queries(watcher, str(path))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))  # the first watcher still owns the path
+            client.sendall(b"ping\n")
+            assert client.makefile("rb").readline()
+    finally:
+        server.shutdown()
+        server.server_close()